@@ -0,0 +1,203 @@
+"""
+評価の処理の速さを測るベンチマーク
+
+乱数の種から作った決まった手牌の集まり(コーパス)について、シャンテン数、和了判定、役、点数、ロンできるかどうか、
+卓の作成、1局の自己対戦にかかる時間を測り、JSONで書き出す。
+別のコミットで書き出したJSONを --compare に渡すと、ベンチマークごとの時間の比を表示する。
+
+    python benchmarks/bench.py --output result.json
+    python benchmarks/bench.py --compare result.json
+    python benchmarks/bench.py --filter score --repeat 10
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mahjongpy
+from mahjongpy import mahjongcache
+from mahjongpy import mahjongsimulate
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """
+    ベンチマークを登録するデコレータ。
+    登録する関数は(件数, 乱数の種)を受け取り、(prepare, run)を返す。
+    prepare()は測る前に毎回呼ばれ(時間に含めない)、その返り値を引数にしてrunの時間を測る
+    """
+    def register(function):
+        BENCHMARKS[name] = function
+        return(function)
+    return(register)
+
+
+def random_hands(n, size, seed):
+    """
+    Returns
+    -------
+    hands : list
+        牌山からsize枚を取った手牌(MahjongTileのリスト)をn個並べたリスト
+    """
+    rng = random.Random(seed)
+    wall = [mahjongpy.MahjongTile.from_index(i) for i in range(34) for _ in range(4)]
+    return([rng.sample(wall, size) for _ in range(n)])
+
+
+def winning_players(n, seed):
+    """
+    Returns
+    -------
+    players : list of MahjongPlayer
+        役のある和了形の手牌を持つプレイヤー(ツモとロンが半々)のリスト
+    """
+    rng = random.Random(seed)
+    players = []
+    while len(players) < n:
+        indices = [rng.randrange(34)] * 2
+        for _ in range(4):
+            if rng.random() < 0.4:
+                indices += [rng.randrange(34)] * 3
+            else:
+                start = rng.choice([0, 9, 18]) + rng.randrange(7)
+                indices += [start, start+1, start+2]
+        if any([indices.count(i) > 4 for i in indices]): continue
+        tiles = [mahjongpy.MahjongTile.from_index(i) for i in indices]
+        is_tumo = rng.random() < 0.5
+        player = mahjongpy.MahjongPlayer(hands=tiles, latest_tile=rng.choice(tiles), turn=1, is_tumo=is_tumo)
+        player.is_ron = not is_tumo
+        if len(player.yakus()) > 0: players.append(player)
+    return(players)
+
+
+def _reset(players):
+    for i in players:
+        i.clear_cache()
+        i.decompositions_cache = (None, [])
+    return(players)
+
+
+@benchmark('shanten')
+def bench_shanten(n, seed):
+    counts = [mahjongpy.MahjongHands(i).counts for i in random_hands(n, 14, seed)]
+    return(lambda: counts, lambda counts: [mahjongpy.shanten(i) for i in counts])
+
+
+@benchmark('is_hora')
+def bench_is_hora(n, seed):
+    players = winning_players(n // 2, seed)
+    players += [mahjongpy.MahjongPlayer(hands=i) for i in random_hands(n - len(players), 14, seed)]
+    return(lambda: players, lambda players: [i.is_hora() for i in players])
+
+
+@benchmark('yakus')
+def bench_yakus(n, seed):
+    players = winning_players(n, seed)
+    return(lambda: _reset(players), lambda players: [i.yakus() for i in players])
+
+
+@benchmark('score')
+def bench_score(n, seed):
+    players = winning_players(n, seed)
+    return(lambda: _reset(players), lambda players: [i.score() for i in players])
+
+
+@benchmark('can_ron')
+def bench_can_ron(n, seed):
+    players = []
+    for i in winning_players(n, seed):
+        tiles = i.hands[:]
+        tiles.remove(i.latest_tile)
+        players.append(mahjongpy.MahjongPlayer(hands=tiles))
+    tiles = [mahjongpy.MahjongTile.from_index(i) for i in range(34)]
+    return(lambda: players, lambda players: [i.can_ron(j) for i in players for j in tiles])
+
+
+@benchmark('table')
+def bench_table(n, seed):
+    return(lambda: None, lambda _: [mahjongpy.MahjongTable(seed=seed+i) for i in range(n)])
+
+
+@benchmark('round')
+def bench_round(n, seed):
+    tables = [mahjongpy.MahjongTable(seed=seed+i) for i in range(n)]
+    states = [i.snapshot() for i in tables]
+    policies = [mahjongsimulate.Policy()] * 4
+
+    def prepare():
+        for i, j in zip(tables, states):
+            i.restore(j)
+        return(tables)
+
+    def run(tables):
+        return([mahjongsimulate.play_round(tables[i], policies, random.Random(seed+i)) for i in range(len(tables))])
+    return(prepare, run)
+
+
+def run_benchmarks(names, n, repeat, seed):
+    """
+    Returns
+    -------
+    results : dict
+        ベンチマークの名前をキーとし、件数(n)、回数(repeat)、最短と平均の時間(秒)、1件あたりの最短の時間(マイクロ秒)を
+        値とする辞書
+    """
+    results = {}
+    for name in names:
+        prepare, run = BENCHMARKS[name](n, seed)
+        run(prepare())
+        times = []
+        for _ in range(repeat):
+            args = prepare()
+            start = time.perf_counter()
+            run(args)
+            times.append(time.perf_counter() - start)
+        results[name] = {'n': n, 'repeat': repeat, 'best': min(times), 'mean': sum(times) / len(times),
+                         'per_item_us': min(times) / n * 1e6}
+    return(results)
+
+
+def compare(results, baseline):
+    """
+    ベンチマークごとに、今回の最短の時間と基準の最短の時間の比を表示する
+    """
+    for name in results['benchmarks']:
+        if name not in baseline['benchmarks']: continue
+        now = results['benchmarks'][name]['per_item_us']
+        before = baseline['benchmarks'][name]['per_item_us']
+        print('{:10s} {:12.2f}us {:12.2f}us {:7.2f}x'.format(name, before, now, now / before))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='mahjongpy benchmarks')
+    parser.add_argument('--n', type=int, default=200, help='number of hands (tables, rounds) per benchmark')
+    parser.add_argument('--repeat', type=int, default=5, help='number of timed runs per benchmark')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the hand corpora')
+    parser.add_argument('--filter', default='', help='run only benchmarks whose name contains this')
+    parser.add_argument('--no-cache', action='store_true', help='disable the process-wide hand cache')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--compare', help='JSON written by an earlier run to compare against')
+    args = parser.parse_args(argv)
+
+    if args.no_cache: mahjongcache.set_capacity(0)
+    names = [i for i in BENCHMARKS if args.filter in i]
+    results = {'python': platform.python_version(), 'platform': platform.platform(), 'seed': args.seed,
+               'cache': not args.no_cache, 'benchmarks': run_benchmarks(names, args.n, args.repeat, args.seed)}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+    elif not args.output:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,7 @@
 from .mahjongtable import MahjongTable
 from .mahjongtile import MahjongTile
+from .mahjonghands import MahjongHands
+from .mahjongshanten import shanten
+from .mahjongdecompose import decompose
+from .mahjongagari import is_agari
 from .mahjongplayer import MahjongPlayer
@@ -0,0 +1,164 @@
+"""
+和了形の判定表
+
+手牌(鳴いた面子を除く)を、枚数が0でない牌の連続した並び(ブロック)の集まりとみなし、
+ブロックの並びを整列して1つの整数(キー)にまとめる。ブロックの順番や、どの色のどの位置にあるかは
+和了形かどうかに関係しないため、4面子1雀頭の形になる手牌のキーはすべて表に入れておける。
+表は mahjongpy/data/agari.bin に64bit整数の並びとして保存され、初めて使うときに読み込まれる。
+"""
+import array
+import os
+import sys
+
+from .mahjongdecompose import _mentus
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'agari.bin')
+AGARI_TABLE = None  # 和了形のキーの集合(読み込み前はNone)
+DIGITS = bytes.maketrans(bytes(range(5)), b'01234')
+
+
+def agari_key(counts):
+    """
+    手牌のキーを求める
+
+    Parameters
+    ----------
+    counts : list of int
+        34種の牌の枚数(手牌のみ)
+
+    Returns
+    -------
+    key : int
+        ブロックごとの枚数の並びを5進数の各桁とし、ブロックの間を0で区切った整数。ブロックは整列して並べる
+    """
+    tiles = bytes(counts)
+    blocks = [i for i in (tiles[0:9] + b'\x00' + tiles[9:18] + b'\x00' + tiles[18:27]).split(b'\x00') if i]
+    blocks += [tiles[i:i+1] for i in range(27, 34) if tiles[i]]
+    blocks.sort()
+    return(int((b'\x00'.join(blocks) + b'\x00').translate(DIGITS), 5))
+
+
+def _pack(blocks):
+    key = 0
+    for i in sorted(blocks):
+        for j in i:
+            key = key*5 + j
+        key *= 5
+    return(key)
+
+
+def _blocks():
+    results = []
+    stack = [(i,) for i in range(1, 5)]
+    while stack:
+        block = stack.pop()
+        tiles = sum(block)
+        if tiles % 3 == 0 and len(_mentus(block, True)) > 0:
+            results.append((block, tiles))
+        if tiles % 3 == 2:
+            for i in range(len(block)):
+                if block[i] < 2: continue
+                if len(_mentus(block[:i] + (block[i]-2,) + block[i+1:], True)) > 0:
+                    results.append((block, tiles))
+                    break
+        if len(block) < 9:
+            for i in range(1, 5):
+                if tiles + i <= 14: stack.append(block + (i,))
+    return(results)
+
+
+def build_table():
+    """
+    和了形のキーをすべて求める
+
+    Returns
+    -------
+    table : list of int
+        2, 5, 8, 11, 14枚の和了形のキーを昇順に並べたリスト
+    """
+    blocks = _blocks()
+    mentus = [i for i in blocks if i[1] % 3 == 0]
+    keys = set()
+
+    def add(selected, start, tiles):
+        for i in blocks:
+            if i[1] % 3 == 2 and tiles + i[1] <= 14:
+                keys.add(_pack([j[0] for j in selected] + [i[0]]))
+        for i in range(start, len(mentus)):
+            if tiles + mentus[i][1] <= 12:
+                add(selected + [mentus[i]], i, tiles + mentus[i][1])
+
+    add([], 0, 0)
+    return(sorted(keys))
+
+
+def write_table(path=TABLE_PATH):
+    """
+    和了形の表を求めてファイルに書き出す
+
+    Parameters
+    ----------
+    path : str
+        書き出すファイルのパス。省略した場合はパッケージ内の mahjongpy/data/agari.bin
+    """
+    table = array.array('Q', build_table())
+    if sys.byteorder != 'little': table.byteswap()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        table.tofile(f)
+
+
+def load_table(path=TABLE_PATH):
+    """
+    和了形の表を読み込む。ファイルがない場合はその場で求める
+
+    Parameters
+    ----------
+    path : str
+        読み込むファイルのパス。省略した場合はパッケージ内の mahjongpy/data/agari.bin
+
+    Returns
+    -------
+    table : frozenset
+        和了形のキーの集合
+    """
+    global AGARI_TABLE
+    if not os.path.exists(path):
+        AGARI_TABLE = frozenset(build_table())
+        return(AGARI_TABLE)
+    table = array.array('Q')
+    with open(path, 'rb') as f:
+        table.frombytes(f.read())
+    if sys.byteorder != 'little': table.byteswap()
+    AGARI_TABLE = frozenset(table)
+    return(AGARI_TABLE)
+
+
+def is_agari(counts):
+    """
+    手牌が4面子1雀頭の和了形かどうか(七対子、国士無双は含まない)
+
+    Parameters
+    ----------
+    counts : list of int
+        34種の牌の枚数(手牌のみ)。鳴いている場合は手牌のみの枚数を渡す
+
+    Returns
+    -------
+    is_agari : bool
+        和了形かどうか
+
+    Examples
+    --------
+    >>> mahjongpy.is_agari(mahjongpy.MahjongHands(mahjongpy.MahjongTile.make_hands_set('22345', '567', '123567')).counts)
+    True
+    """
+    table = AGARI_TABLE if AGARI_TABLE is not None else load_table()
+    try:
+        return(agari_key(counts) in table)
+    except ValueError:  # 5枚以上ある牌
+        return(False)
+
+
+if __name__ == '__main__':
+    write_table()
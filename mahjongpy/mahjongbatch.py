@@ -0,0 +1,162 @@
+"""
+大量の手牌の一括評価
+
+(N, 34)の牌の枚数の配列(MahjongTile.indexを添字とする手牌の枚数の行をN個並べたもの)を受け取り、
+シャンテン数、和了形かどうか、和了形の翻数、符数、点数をまとめて求める。
+NumPyがある場合はグループごとのキーを配列で求め、重複を除いたキーだけ表を引いて結果を配り直す。
+NumPyがない場合は1行ずつ mahjongpy.mahjongshanten で計算し、結果をリストで返す。
+"""
+import mahjongpy
+from . import mahjongshanten
+
+try:
+    import numpy as np
+except ImportError:  # NumPyがない場合は純Pythonで計算する
+    np = None
+
+GROUPS = [(0, 9, True), (9, 9, True), (18, 9, True), (27, 7, False)]  # (通し番号の先頭, 種類数, 順子を作れるか)
+UNSUPPORTED = (-1, -1, -1)  # 14枚でない(鳴いた)和了形の翻数、符数、点数
+
+
+def _rows_numpy(counts):
+    powers = 5 ** np.arange(9, dtype=np.int64)
+    rows = []
+    for offset, size, runs in GROUPS:
+        block = counts[:, offset:offset+size]
+        keys = block.astype(np.int64) @ powers[:size]
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        table = np.array([mahjongshanten._group(tuple(block[i].tolist()), runs) for i in first], dtype=np.int64)
+        rows.append(table.reshape(-1, 6)[inverse.reshape(-1)])
+    return(rows)
+
+
+def _shanten_numpy(counts):
+    a, b, c, d = _rows_numpy(counts)
+    tiles = a[:, 1] + b[:, 1] + c[:, 1] + d[:, 1]
+    melds = (14 - tiles) // 3
+    keys = a[:, 0] | b[:, 0] << 12 | c[:, 0] << 24 | d[:, 0] << 36 | melds << 48
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    normal = np.array([mahjongshanten._normal(*[tuple(j[i].tolist()) for j in (a, b, c, d)], int(melds[i]))
+                       for i in first], dtype=np.int64)
+    shantens = normal.reshape(-1)[inverse.reshape(-1)] if len(first) > 0 else np.zeros(0, dtype=np.int64)
+    chitoitu = 6 - (a[:, 3] + b[:, 3] + c[:, 3] + d[:, 3]) + np.maximum(0, 7 - (a[:, 2] + b[:, 2] + c[:, 2] + d[:, 2]))
+    kokushimusou = 13 - (a[:, 4] + b[:, 4] + c[:, 4] + d[:, 4]) - (a[:, 5] + b[:, 5] + c[:, 5] + d[:, 5] > 0)
+    closed = tiles >= 13
+    shantens = np.where(closed, np.minimum(shantens, np.minimum(chitoitu, kokushimusou)), shantens)
+    return(shantens.astype(np.int8))
+
+
+def _score_hand(counts, win_tile, oya, is_tumo, melds=((), (), (), ())):
+    # meldsは鳴いた面子の(melds, ankans, minkans, minkos)で、面子は牌のIDのタプル
+    hands = sum([[mahjongpy.MahjongTile.from_index(i)] * counts[i] for i in range(34)], [])
+    latest_tile = mahjongpy.MahjongPlayer.KYOMU_TILE if win_tile is None else mahjongpy.MahjongTile.from_index(win_tile)
+    melds, ankans, minkans, minkos = [[[mahjongpy.MahjongTile.from_id(k) for k in j] for j in i] for i in melds]
+    player = mahjongpy.MahjongPlayer(hands=hands, melds=melds, oya=oya, latest_tile=latest_tile, turn=1,
+                                     is_tumo=is_tumo, ankans=ankans, minkans=minkans, minkos=minkos)
+    player.is_ron = win_tile is not None and not is_tumo
+    if len(player.yakus()) == 0: return((0, 0, 0))
+    return((player.score_han(), player.score_fu(), player.score()))
+
+
+def _scores(counts, shantens, win_tiles, oya, is_tumo):
+    memo = {}
+    results = []
+    for i in range(len(counts)):
+        row = [int(j) for j in counts[i]]
+        if shantens[i] != -1:
+            results.append((0, 0, 0))
+            continue
+        if sum(row) != 14:
+            results.append(UNSUPPORTED)
+            continue
+        win_tile = None if win_tiles is None else int(win_tiles[i])
+        key = (tuple(row), win_tile)
+        if key not in memo: memo[key] = _score_hand(row, win_tile, oya, is_tumo)
+        results.append(memo[key])
+    return(results)
+
+
+def shanten(counts):
+    """
+    手牌のシャンテン数をまとめて計算する
+
+    Parameters
+    ----------
+    counts : numpy.ndarray or list
+        (N, 34)の牌の枚数の配列(手牌のみ)。NumPyがない場合は34個の整数のリストのリスト
+
+    Returns
+    -------
+    shantens : numpy.ndarray or list
+        (N,)のシャンテン数の配列(int8)。NumPyがない場合は整数のリスト
+
+    Examples
+    --------
+    >>> mahjongpy.mahjongbatch.shanten(numpy.array([mahjongpy.MahjongHands(mahjongpy.MahjongTile.make_hands_set('22345', '567', '123567')).counts], dtype=numpy.uint8))
+    array([-1], dtype=int8)
+    """
+    if np is None: return([mahjongshanten.shanten(i) for i in counts])
+    counts = np.asarray(counts, dtype=np.uint8).reshape(-1, 34)
+    return(_shanten_numpy(counts))
+
+
+def is_hora(counts):
+    """
+    手牌が和了形(一般形、七対子、国士無双)かどうかをまとめて判定する
+
+    Parameters
+    ----------
+    counts : numpy.ndarray or list
+        (N, 34)の牌の枚数の配列(手牌のみ)
+
+    Returns
+    -------
+    is_hora : numpy.ndarray or list
+        (N,)の真偽値の配列。NumPyがない場合は真偽値のリスト
+    """
+    shantens = shanten(counts)
+    if np is None: return([i == -1 for i in shantens])
+    return(shantens == -1)
+
+
+def evaluate(counts, win_tiles=None, oya=False, is_tumo=False):
+    """
+    手牌のシャンテン数、和了形かどうか、和了形の翻数、符数、点数をまとめて求める
+
+    Parameters
+    ----------
+    counts : numpy.ndarray or list
+        (N, 34)の牌の枚数の配列(手牌のみ、鳴きなし)
+    win_tiles : numpy.ndarray or list
+        (N,)の和了牌の通し番号の配列。省略した場合は和了牌なし(待ちの形による符や平和は付かない)として計算する
+    oya : bool
+        親かどうか
+    is_tumo : bool
+        ツモ和了かどうか。Falseで和了牌がある場合はロン和了として計算する
+
+    Returns
+    -------
+    results : dict
+        'shanten', 'is_hora', 'han', 'fu', 'score' をキーとし、(N,)の配列(NumPyがない場合はリスト)を値とする辞書。
+        和了形でない手牌と役のない手牌の翻数、符数、点数は0。
+        鳴いた面子が分からないため点数を求められない14枚でない和了形(11枚など)の翻数、符数、点数は-1
+
+    Notes
+    -----
+    翻数、符数、点数は重複を除いた和了形ごとに MahjongPlayer で計算し、結果を配り直す。
+    ドラ表示牌、場風、積み棒はないものとし、天和、地和の付かない巡目として計算する
+    """
+    shantens = shanten(counts)
+    if np is None:
+        scores = _scores(counts, shantens, win_tiles, oya, is_tumo)
+        return({'shanten': shantens, 'is_hora': [i == -1 for i in shantens], 'han': [i[0] for i in scores],
+                'fu': [i[1] for i in scores], 'score': [i[2] for i in scores]})
+    counts = np.asarray(counts, dtype=np.uint8).reshape(-1, 34)
+    scores = np.zeros((len(counts), 3), dtype=np.int32)
+    scores[(shantens == -1) & (counts.sum(axis=1) != 14)] = UNSUPPORTED
+    hora = np.flatnonzero((shantens == -1) & (counts.sum(axis=1) == 14))
+    if len(hora) > 0:
+        tiles = None if win_tiles is None else np.asarray(win_tiles)[hora]
+        scores[hora] = _scores(counts[hora], shantens[hora], tiles, oya, is_tumo)
+    return({'shanten': shantens, 'is_hora': shantens == -1, 'han': scores[:, 0], 'fu': scores[:, 1],
+            'score': scores[:, 2]})
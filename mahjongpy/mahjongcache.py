@@ -0,0 +1,141 @@
+"""
+手牌の計算結果のキャッシュ
+
+面子分解、シャンテン数、受け入れのように34種の牌の枚数だけで決まる値を、プロセス全体で共有するキャッシュに保存する。
+プレイヤーや卓が違っても同じ形の手牌なら計算し直さない。
+大きさには上限があり、上限を超えると最も長く使われていない値から捨てる(LRU)。
+"""
+import collections
+
+DEFAULT_CAPACITY = 1 << 16
+
+
+class LRUCache:
+    """
+    大きさに上限のあるLRUキャッシュ。キーは(値の種類, 34種の牌の枚数のタプル)
+
+    Attributes
+    ----------
+    capacity : int
+        保存する値の数の上限。0ならキャッシュを使わない
+    hits : int
+        キャッシュにあった回数
+    misses : int
+        キャッシュになく計算した回数
+    evictions : int
+        上限を超えて捨てた回数
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return(len(self.entries))
+
+    def get(self, kind, counts, compute):
+        """
+        キャッシュにあればその値を、なければcomputeを呼んで保存した値を返す
+
+        Parameters
+        ----------
+        kind : str
+            値の種類('decompose', 'shanten'など)
+        counts : list of int
+            34種の牌の枚数
+        compute : callable
+            引数なしで値を計算する関数
+
+        Returns
+        -------
+        value : object
+            計算した値。他の手牌と共有されるので変更しないこと
+        """
+        if self.capacity <= 0: return(compute())
+        key = (kind, tuple(counts))
+        entries = self.entries
+        if key in entries:
+            entries.move_to_end(key)
+            self.hits += 1
+            return(entries[key])
+        self.misses += 1
+        value = entries[key] = compute()
+        if len(entries) > self.capacity:
+            entries.popitem(last=False)
+            self.evictions += 1
+        return(value)
+
+    def resize(self, capacity):
+        """
+        上限を変える。今の数が新しい上限を超えていれば古いものから捨てる
+
+        Parameters
+        ----------
+        capacity : int
+            保存する値の数の上限。0ならキャッシュを使わない
+        """
+        self.capacity = max(0, capacity)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """
+        保存した値と回数をすべて消す
+        """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        """
+        Returns
+        -------
+        stats : dict
+            hits, misses, evictions, size(保存している値の数), capacity
+        """
+        return({'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self.entries),
+                'capacity': self.capacity})
+
+
+CACHE = LRUCache()
+
+
+def get(kind, counts, compute):
+    """
+    プロセス全体のキャッシュ(CACHE)から値を取り出す。LRUCache.get を参照
+    """
+    return(CACHE.get(kind, counts, compute))
+
+
+def set_capacity(capacity):
+    """
+    プロセス全体のキャッシュの上限を変える。0にするとキャッシュを使わない
+
+    Parameters
+    ----------
+    capacity : int
+        保存する値の数の上限
+    """
+    CACHE.resize(capacity)
+
+
+def stats():
+    """
+    Returns
+    -------
+    stats : dict
+        プロセス全体のキャッシュの hits, misses, evictions, size, capacity
+    """
+    return(CACHE.stats())
+
+
+def clear():
+    """
+    プロセス全体のキャッシュを空にし、回数を0に戻す
+    """
+    CACHE.clear()
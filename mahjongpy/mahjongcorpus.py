@@ -0,0 +1,261 @@
+"""
+牌譜ファイルのランダムアクセス
+
+mahjongpy.mahjongrecord で書き出した牌譜ファイルについて、各出来事の先頭の位置(オフセット)と
+各局の最初の出来事の番号を索引ファイルに保存し、牌譜ファイルと索引ファイルを mmap で開く。
+i番目の出来事や、その時点の卓の状態を、ファイル全体を読み込んだり先頭から解析したりせずに取り出せる。
+
+索引ファイルは 32バイトのヘッダ(INDEX_MAGIC, 版, 牌譜ファイルの大きさ, 出来事の数, 局の数)に続けて、
+出来事のオフセットと局の最初の出来事の番号を8バイトの整数(このマシンのバイト順)で並べたもの。
+"""
+import array
+import bisect
+import mmap
+import os
+import struct
+
+import mahjongpy
+from . import mahjongrecord
+
+INDEX_MAGIC = b'MJI\x01'
+INDEX_HEADER = struct.Struct('=4sIQQQ')  # (INDEX_MAGIC, 版, 牌譜ファイルの大きさ, 出来事の数, 局の数)
+INDEX_VERSION = 1
+
+
+def build_index(path, index_path=None):
+    """
+    牌譜ファイルの索引を作ってファイルに保存する
+
+    Parameters
+    ----------
+    path : str
+        牌譜ファイルのパス
+    index_path : str
+        索引ファイルのパス。省略した場合は牌譜ファイルのパスに'.idx'を付けたもの
+
+    Returns
+    -------
+    index_path : str
+        索引ファイルのパス
+
+    Raises
+    ------
+    ValueError
+        牌譜のファイルでない、またはファイルが途中で切れている
+    """
+    index_path = path + '.idx' if index_path is None else index_path
+    offsets = array.array('Q')
+    rounds = array.array('Q')
+    start = mahjongrecord.EVENT_IDS['start']
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < len(mahjongrecord.MAGIC): raise ValueError('not a mahjongpy record file')
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data[:len(mahjongrecord.MAGIC)] != mahjongrecord.MAGIC: raise ValueError('not a mahjongpy record file')
+            offset = len(mahjongrecord.MAGIC)
+            while offset + 2 < size:
+                if data[offset+2] == start: rounds.append(len(offsets))
+                offsets.append(offset)
+                offset += 2 + (data[offset] | data[offset+1] << 8)
+            if offset != size: raise ValueError('truncated record file')
+    with open(index_path, 'wb') as f:
+        f.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, size, len(offsets), len(rounds)))
+        offsets.tofile(f)
+        rounds.tofile(f)
+    return(index_path)
+
+
+class MahjongCorpus:
+    """
+    牌譜ファイルを出来事の列としてランダムアクセスするクラス。corpus[i]でi番目の出来事を返す
+
+    Attributes
+    ----------
+    path : str
+        牌譜ファイルのパス
+    index_path : str
+        索引ファイルのパス
+    offsets : memoryview
+        各出来事の牌譜ファイルでの先頭の位置(索引ファイルをmmapしたもの)
+    round_starts : memoryview
+        各局の最初の出来事('start')の番号
+
+    Notes
+    -----
+    索引ファイルがない、または牌譜ファイルの大きさと合わない場合は開くときに作り直す。
+    使い終わったらclose()するか、with文で使う
+    """
+
+    def __init__(self, path, index_path=None):
+        self.path = path
+        self.index_path = path + '.idx' if index_path is None else index_path
+        self._data = self._index_file = self._index = self.offsets = self.round_starts = None
+        self._file = open(path, 'rb')
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if not self._is_valid_index(): build_index(path, self.index_path)
+            self._index_file = open(self.index_path, 'rb')
+            self._index = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+            _, _, _, events, rounds = INDEX_HEADER.unpack_from(self._index)
+            view = memoryview(self._index)
+            self.offsets = view[INDEX_HEADER.size:INDEX_HEADER.size+events*8].cast('Q')
+            self.round_starts = view[INDEX_HEADER.size+events*8:INDEX_HEADER.size+(events+rounds)*8].cast('Q')
+            view.release()
+        except BaseException:
+            self.close()
+            raise
+
+    def _is_valid_index(self):
+        if not os.path.exists(self.index_path): return(False)
+        with open(self.index_path, 'rb') as f:
+            header = f.read(INDEX_HEADER.size)
+        if len(header) != INDEX_HEADER.size: return(False)
+        magic, version, size, events, rounds = INDEX_HEADER.unpack(header)
+        return(magic == INDEX_MAGIC and version == INDEX_VERSION and size == len(self._data) and
+               os.path.getsize(self.index_path) == INDEX_HEADER.size + (events+rounds)*8)
+
+    def close(self):
+        """
+        牌譜ファイルと索引ファイルを閉じる。開いている途中で失敗した場合も、開いたものだけを閉じる
+        """
+        for i in [self.offsets, self.round_starts]:
+            if i is not None: i.release()
+        for i in [self._index, self._index_file, self._data, self._file]:
+            if i is not None: i.close()
+
+    def __enter__(self):
+        return(self)
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return(len(self.offsets))
+
+    def __getitem__(self, i):
+        return(mahjongrecord.decode(self._data, self.offsets[i]))
+
+    def round_count(self):
+        """
+        Returns
+        -------
+        count : int
+            牌譜ファイルに記録された局の数
+        """
+        return(len(self.round_starts))
+
+    def round_of(self, i):
+        """
+        Parameters
+        ----------
+        i : int
+            出来事の番号
+
+        Returns
+        -------
+        round : int
+            i番目の出来事が含まれる局の番号
+        """
+        if i < 0: i += len(self)
+        return(bisect.bisect_right(self.round_starts, i) - 1)
+
+    def round_events(self, r):
+        """
+        Parameters
+        ----------
+        r : int
+            局の番号
+
+        Returns
+        -------
+        events : list of tuple
+            r番目の局の出来事のリスト
+        """
+        start = self.round_starts[r]
+        end = self.round_starts[r+1] if r+1 < len(self.round_starts) else len(self)
+        return([self[i] for i in range(start, end)])
+
+    def state(self, i):
+        """
+        i番目の出来事が起こる直前の卓の状態を、局の最初から出来事をたどって求める。
+        i番目の出来事が局の最初('start')のときは、その出来事を反映した状態を返す
+
+        Parameters
+        ----------
+        i : int
+            出来事の番号
+
+        Returns
+        -------
+        state : dict
+            event : i番目の出来事(この状態で選ばれた行動)
+            wind, kyoku, honba, ri_bou : 場の風('ton'など)、局数、本場、リー棒の数
+            oya : 親の席(0～3)
+            points : 4人の持ち点のリスト
+            hands, discards, melds : 4人それぞれの手牌、河、鳴いた面子(MahjongTileのリスト)のリスト
+            riichi : 4人それぞれがリーチしているかどうかのリスト
+            dora_showing_tiles : ドラ表示牌のリスト
+            tiles_left : 残りの牌の枚数(MahjongTable.tiles_left と同じ)
+        """
+        if i < 0: i += len(self)
+        start = self.round_starts[self.round_of(i)]
+        state = None
+        for j in range(start, max(i, start+1)):
+            state = apply_event(state, self[j])
+        state['event'] = self[i]
+        return(state)
+
+
+def apply_event(state, event):
+    """
+    出来事を1つ卓の状態に反映する
+
+    Parameters
+    ----------
+    state : dict
+        MahjongCorpus.state と同じ形の状態。'start'の出来事のときはNoneでよい
+    event : tuple
+        (出来事の名前, 席, 牌のIDのタプル, 整数のタプル)
+
+    Returns
+    -------
+    state : dict
+        反映した後の状態(渡した状態そのものを更新して返す)
+    """
+    name, seat, ids, values = event
+    tiles = [mahjongpy.MahjongTile.from_id(i) for i in ids]
+    if name == 'start':
+        return({'wind': list(mahjongpy.MahjongTable.WIND_NAME_JP)[values[0]], 'kyoku': values[1], 'honba': values[2],
+                'ri_bou': values[3], 'oya': values[4], 'points': list(values[5:9]), 'hands': [[], [], [], []],
+                'discards': [[], [], [], []], 'melds': [[], [], [], []], 'riichi': [False]*4,
+                'dora_showing_tiles': [], 'tiles_left': 136 - 14})
+    if name == 'deal':
+        state['hands'][seat] = tiles
+        state['tiles_left'] -= len(tiles)
+    elif name in ['draw', 'dora']:
+        state['tiles_left'] -= 1
+        if name == 'draw': state['hands'][seat].append(tiles[0])
+        elif len(values) == 0: state['dora_showing_tiles'].append(tiles[0])
+    elif name == 'discard':
+        state['hands'][seat].remove(tiles[0])
+        state['discards'][seat].append(tiles[0])
+    elif name == 'riichi':
+        state['riichi'][seat] = True
+        state['ri_bou'] += 1
+    elif name in ['pon', 'chi', 'kan']:
+        called = state['discards'][values[0]].pop() if len(values) > 0 else None
+        for i in tiles:
+            if called is not None and i == called:
+                called = None
+            else:
+                state['hands'][seat].remove(i)
+        state['melds'][seat].append(tiles)
+    elif name == 'kakan':
+        state['hands'][seat].remove(tiles[0])
+        for i in state['melds'][seat]:
+            if len(i) == 3 and i[0].index == tiles[0].index: i.append(tiles[0])
+    elif name == 'ron':
+        state['hands'][seat].append(tiles[0])
+    elif name == 'score':
+        state['points'] = [state['points'][i] + values[i] for i in range(4)]
+    return(state)
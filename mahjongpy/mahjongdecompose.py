@@ -0,0 +1,73 @@
+"""
+手牌の面子分解
+
+34種の牌の枚数(MahjongTile.indexを添字とするリスト)から、雀頭1つと面子への分解をすべて列挙する。
+萬子、索子、筒子、字牌の各グループごとに、枚数の並びをキーとして面子の組み合わせを表に持ち、
+雀頭を抜いた残りをグループごとの組み合わせの直積として求める。
+"""
+import itertools
+
+GROUPS = [(0, 9, True), (9, 9, True), (18, 9, True), (27, 7, False)]  # (通し番号の先頭, 種類数, 順子を作れるか)
+MENTU_TABLE = {}  # (グループ内の枚数の並び, 順子を作れるか) -> 面子の組み合わせのタプル
+
+
+def _mentus(key, runs):
+    if (key, runs) in MENTU_TABLE: return(MENTU_TABLE[(key, runs)])
+    i = 0
+    while i < len(key) and key[i] == 0:
+        i += 1
+    if i == len(key): return(((),))
+    results = []
+    c = list(key)
+    if c[i] >= 3:
+        c[i] -= 3
+        for j in _mentus(tuple(c), runs):
+            results.append(((i, i, i),) + j)
+        c[i] += 3
+    if runs and i < len(c)-2 and c[i+1] > 0 and c[i+2] > 0:
+        c[i] -= 1
+        c[i+1] -= 1
+        c[i+2] -= 1
+        for j in _mentus(tuple(c), runs):
+            results.append(((i, i+1, i+2),) + j)
+    MENTU_TABLE[(key, runs)] = tuple(results)
+    return(MENTU_TABLE[(key, runs)])
+
+
+def decompose(counts):
+    """
+    手牌を雀頭1つと面子に分解する方法をすべて返す
+
+    Parameters
+    ----------
+    counts : list of int
+        34種の牌の枚数(手牌のみ)。鳴いている場合は手牌のみの枚数を渡す
+
+    Returns
+    -------
+    decompositions : list
+        (雀頭の通し番号, 面子のタプル)のリスト。面子は牌の通し番号3つのタプル(順子なら連番、刻子なら同じ番号)。
+        和了形でなければ空のリスト
+
+    Examples
+    --------
+    >>> mahjongpy.decompose(mahjongpy.MahjongHands(mahjongpy.MahjongTile.make_hands_set('111222333', '789', '', '', '11')).counts)
+    [(31, ((0, 0, 0), (1, 1, 1), (2, 2, 2), (15, 16, 17))), (31, ((0, 1, 2), (0, 1, 2), (0, 1, 2), (15, 16, 17)))]
+    """
+    decompositions = []
+    if sum(counts) % 3 != 2: return(decompositions)
+    for i in range(34):
+        if counts[i] < 2: continue
+        c = list(counts)
+        c[i] -= 2
+        groups = []
+        for offset, size, runs in GROUPS:
+            key = tuple(c[offset:offset+size])
+            if sum(key) % 3 != 0: break
+            mentus = _mentus(key, runs)
+            if len(mentus) == 0: break
+            groups.append([tuple([tuple([k+offset for k in l]) for l in j]) for j in mentus])
+        else:
+            for j in itertools.product(*groups):
+                decompositions.append((i, sum(j, ())))
+    return(decompositions)
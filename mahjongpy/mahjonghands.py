@@ -0,0 +1,181 @@
+import mahjongpy
+from . import mahjongcache
+
+
+class MahjongHands(list):
+    """
+    手牌を表すクラス。MahjongTileのリストとしてそのまま使えるが、
+    牌の出し入れのたびに34種の牌の枚数と赤ドラのマスクを差分で更新して保持する
+
+    Attributes
+    ----------
+    counts : list of int
+        34種の牌それぞれの枚数。添字はMahjongTile.indexに対応
+    aka_mask : int
+        手牌にある赤ドラのビットマスク。萬子:1　索子:2　筒子:4
+
+    Notes
+    -----
+    シャンテン数の計算に使う萬子、索子、筒子、字牌の4グループ分の表の行を保持し、
+    牌が出し入れされたグループの行だけを次に使うときに引き直す。
+    shanten、ukeire、discardsの結果は手牌が変わるまでキャッシュされ、
+    同じ枚数の並びの手牌とは mahjongpy.mahjongcache を通して共有される。
+    共有されている値を書き換えないよう、リストと辞書はコピーを返す
+    """
+
+    def __init__(self, tiles=()):
+        super().__init__(tiles)
+        self.counts = [0]*34
+        self.aka_mask = 0
+        self._groups = [None]*4
+        self._cache = {}
+        for i in self:
+            self._add(i)
+
+    def __reduce__(self):
+        return(self.__class__, (list(self),))
+
+    def _add(self, tile):
+        self.counts[tile.index] += 1
+        self._groups[tile.index // 9] = None
+        if self._cache: self._cache = {}
+        if tile.akadora: self.aka_mask |= 1 << (tile.id-34)
+
+    def _remove(self, tile):
+        self.counts[tile.index] -= 1
+        self._groups[tile.index // 9] = None
+        if self._cache: self._cache = {}
+        if tile.akadora: self.aka_mask &= ~(1 << (tile.id-34))
+
+    def append(self, tile):
+        super().append(tile)
+        self._add(tile)
+
+    def extend(self, tiles):
+        tiles = list(tiles)
+        super().extend(tiles)
+        for i in tiles:
+            self._add(i)
+
+    def __iadd__(self, tiles):
+        self.extend(tiles)
+        return(self)
+
+    def insert(self, index, tile):
+        super().insert(index, tile)
+        self._add(tile)
+
+    def pop(self, index=-1):
+        tile = super().pop(index)
+        self._remove(tile)
+        return(tile)
+
+    def remove(self, tile):
+        self.pop(self.index(tile))
+
+    def clear(self):
+        super().clear()
+        self.counts = [0]*34
+        self.aka_mask = 0
+        self._groups = [None]*4
+        self._cache = {}
+
+    def __setitem__(self, index, value):
+        old = self[index]
+        if isinstance(index, slice):
+            value = list(value)
+        super().__setitem__(index, value)
+        for i in (old if isinstance(index, slice) else [old]):
+            self._remove(i)
+        for i in (value if isinstance(index, slice) else [value]):
+            self._add(i)
+
+    def __delitem__(self, index):
+        old = self[index]
+        super().__delitem__(index)
+        for i in (old if isinstance(index, slice) else [old]):
+            self._remove(i)
+
+    def pop_index(self, index):
+        """
+        指定した通し番号の牌を1枚取り出す
+
+        Parameters
+        ----------
+        index : int
+            取り出す牌の通し番号(MahjongTile.index)
+
+        Returns
+        -------
+        tile : MahjongTile
+            取り出した牌
+
+        Raises
+        ------
+        ValueError
+            その牌を持っていないとき
+        """
+        if self.counts[index] == 0: raise ValueError('does NOT have such tile')
+        for i in range(len(self)):
+            if self[i].index == index:
+                return(self.pop(i))
+
+    def groups(self):
+        """
+        萬子、索子、筒子、字牌の4グループ分のシャンテン数の表の行を返す。変化のあったグループだけ引き直す
+
+        Returns
+        -------
+        groups : list of tuple
+            mahjongpy.mahjongshanten.group を参照
+        """
+        for i in range(4):
+            if self._groups[i] is None:
+                self._groups[i] = mahjongpy.mahjongshanten.group(self.counts, i)
+        return(self._groups)
+
+    def _cached(self, name, compute):
+        if name not in self._cache: self._cache[name] = mahjongcache.get(name, self.counts, compute)
+        return(self._cache[name])
+
+    def shanten(self):
+        """
+        Returns
+        -------
+        shanten : int
+            手牌のシャンテン数。mahjongpy.shanten を参照
+        """
+        return(self._cached('shanten', lambda: mahjongpy.mahjongshanten.shanten_groups(self.groups())))
+
+    def ukeire(self):
+        """
+        Returns
+        -------
+        indices : list of int
+            引くとシャンテン数が下がる牌の通し番号のリスト(キャッシュのコピー)。mahjongpy.mahjongshanten.ukeire を参照
+        """
+        return(list(self._cached('ukeire', lambda: tuple(mahjongpy.mahjongshanten.ukeire(self.counts, self.groups())))))
+
+    def discards(self):
+        """
+        Returns
+        -------
+        shantens : dict
+            捨てる牌の通し番号をキー、捨てた後のシャンテン数を値とする辞書(キャッシュのコピー)。
+            mahjongpy.mahjongshanten.discards を参照
+        """
+        return(dict(self._cached('discards', lambda: mahjongpy.mahjongshanten.discards(self.counts, self.groups()))))
+
+    def evaluate_discards(self):
+        """
+        Returns
+        -------
+        evaluations : dict
+            捨てる牌の通し番号をキー、(捨てた後のシャンテン数, 受け入れの牌の通し番号のタプル)を値とする辞書(キャッシュのコピー)。
+            mahjongpy.mahjongshanten.evaluate_discards を参照
+        """
+        return(dict(self._cached('evaluate_discards', self._evaluate_discards)))
+
+    def _evaluate_discards(self):
+        evaluations = mahjongpy.mahjongshanten.evaluate_discards(self.counts, self.groups())
+        return({i: (j, tuple(k)) for i, (j, k) in evaluations.items()})
@@ -0,0 +1,146 @@
+"""
+処理時間の計測
+
+enable()を呼ぶと、MahjongPlayer の評価のメソッドと MahjongTable の操作のメソッドを計測用の関数で包み、
+呼び出し回数、合計の時間、99パーセンタイルの時間、キャッシュの当たった割合を記録する。
+disable()で元のメソッドに戻すので、無効のときは計測のための処理は一切行われない。
+snapshot()の返り値は辞書なので、そのままJSONにして外部の監視の仕組みに送れる。
+
+計測はプロセスごとに行われる。メソッドの中から呼ばれた別のメソッドの時間は、両方の時間に含まれる。
+"""
+import collections
+import functools
+import time
+
+import mahjongpy
+from . import mahjongcache
+
+PLAYER_METHODS = ['shanten', 'is_tenpai', 'ukeire', 'evaluate_discards', 'waits', 'is_hora', 'decompositions',
+                  'yakus', 'evaluate', 'score_fu', 'score_han', 'score', 'payout', 'payed_score', 'can_pon',
+                  'can_chi', 'can_ankan', 'can_minkan', 'can_kakan', 'can_ron', 'discard', 'riichi', 'kan',
+                  'kakan', 'pon', 'chi', 'ron', 'tumo']
+TABLE_METHODS = ['deal_tiles', 'draw', 'add_kandora', 'calculate_score', 'next_round', 'snapshot', 'restore',
+                 'ryukyoku']
+SAMPLE_SIZE = 10000  # 99パーセンタイルを求めるために残す直近の時間の数
+
+_originals = {}  # (クラス, メソッドの名前) -> 元の関数
+_timers = {}  # 'クラス名.メソッド名' -> _Timer
+_caches = collections.defaultdict(lambda: [0, 0])  # 'クラス名.cache:値の種類' -> [当たった回数, 外れた回数]
+
+
+class _Timer:
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = collections.deque(maxlen=SAMPLE_SIZE)
+
+    def add(self, elapsed):
+        self.calls += 1
+        self.total += elapsed
+        if elapsed > self.max: self.max = elapsed
+        self.samples.append(elapsed)
+
+    def percentile(self, p):
+        if len(self.samples) == 0: return(0.0)
+        samples = sorted(self.samples)
+        return(samples[min(len(samples)-1, int(len(samples) * p))])
+
+
+def _timed(name, function):
+    timer = _timers.setdefault(name, _Timer())
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return(function(*args, **kwargs))
+        finally:
+            timer.add(time.perf_counter() - start)
+    return(wrapper)
+
+
+def _counted(prefix, function):
+    @functools.wraps(function)
+    def wrapper(self, name, compute):
+        missed = []
+
+        def counted_compute():
+            missed.append(True)
+            return(compute())
+        value = function(self, name, counted_compute)
+        _caches[prefix + name][1 if missed else 0] += 1
+        return(value)
+    return(wrapper)
+
+
+def _patch(cls, name, wrapper):
+    _originals[(cls, name)] = cls.__dict__[name]
+    setattr(cls, name, wrapper)
+
+
+def enable():
+    """
+    計測を始める。すでに有効なら何もしない
+    """
+    if is_enabled(): return
+    for cls, names in [(mahjongpy.MahjongPlayer, PLAYER_METHODS), (mahjongpy.MahjongTable, TABLE_METHODS)]:
+        for i in names:
+            _patch(cls, i, _timed('{}.{}'.format(cls.__name__, i), cls.__dict__[i]))
+    for cls in [mahjongpy.MahjongPlayer, mahjongpy.MahjongHands]:
+        _patch(cls, '_cached', _counted(cls.__name__ + '.cache:', cls.__dict__['_cached']))
+
+
+def disable():
+    """
+    計測をやめて元のメソッドに戻す。記録した値は残る
+    """
+    for (cls, name), function in _originals.items():
+        setattr(cls, name, function)
+    _originals.clear()
+
+
+def is_enabled():
+    """
+    Returns
+    -------
+    is_enabled : bool
+        計測しているかどうか
+    """
+    return(len(_originals) > 0)
+
+
+def reset():
+    """
+    記録した値をすべて消す
+    """
+    _timers.clear()
+    _caches.clear()
+    if is_enabled():
+        disable()
+        enable()
+
+
+def snapshot():
+    """
+    記録した値を辞書として返す
+
+    Returns
+    -------
+    snapshot : dict
+        enabled : 計測しているかどうか
+        methods : 'MahjongPlayer.yakus'などをキーとし、calls(呼び出し回数), total, mean, p99, max(秒)を値とする辞書。
+                  一度も呼ばれていないメソッドは含まない
+        caches : 'MahjongPlayer.cache:yakus'などをキーとし、hits, misses, hit_rateを値とする辞書
+        lru : プロセス全体のキャッシュの値(mahjongpy.mahjongcache.stats を参照)
+    """
+    methods = {}
+    for name, timer in _timers.items():
+        if timer.calls == 0: continue
+        methods[name] = {'calls': timer.calls, 'total': timer.total, 'mean': timer.total / timer.calls,
+                         'p99': timer.percentile(0.99), 'max': timer.max}
+    caches = {}
+    for name, (hits, misses) in _caches.items():
+        caches[name] = {'hits': hits, 'misses': misses, 'hit_rate': hits / max(1, hits + misses)}
+    return({'enabled': is_enabled(), 'methods': methods, 'caches': caches, 'lru': mahjongcache.stats()})
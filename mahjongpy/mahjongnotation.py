@@ -0,0 +1,211 @@
+"""
+手牌の短い表記
+
+'123m456p789s11z'のように、数字を並べた後に種類の文字(萬子:m　筒子:p　索子:s　字牌:z)を書く表記を読み書きする。
+字牌は1～7が東南西北白發中。赤ドラの5は0と書く。
+鳴いた面子は手牌の後に[]で囲んで続け、他家から鳴いた牌は数字の後に'を付ける('123m11z[5'55p][78'9s]')。
+"""
+import re
+
+import mahjongpy
+
+SUIT_OFFSETS = {'m': 0, 's': 9, 'p': 18, 'z': 27}  # 種類の文字 -> 通し番号の先頭
+SUIT_ORDER = 'mpsz'
+INDEX_SUITS = 'm'*9 + 's'*9 + 'p'*9 + 'z'*7  # 通し番号 -> 種類の文字
+DIGITS = {str(i): i for i in range(10)}
+_MELD = re.compile(r'\[([^\[\]]*)\]')
+
+
+def _error(text):
+    return(ValueError('invalid hand notation: {!r}'.format(text)))
+
+
+def _split(text):
+    text = text.strip()
+    start = text.find('[')
+    if start == -1: return(text, [])
+    melds = _MELD.findall(text[start:])
+    if ''.join(['[{}]'.format(i) for i in melds]) != text[start:].replace(' ', ''): raise _error(text)
+    return(text[:start].strip(), melds)
+
+
+def _scan(text):
+    # 後ろから読み、種類の文字のあとに続く(前にある)数字を(通し番号, 赤ドラか, 他家からの牌か)にする
+    results = []
+    suit = None
+    digits = 1
+    tacha = False
+    for i in reversed(text):
+        number = DIGITS.get(i)
+        if number is None:
+            if i in SUIT_OFFSETS:
+                if digits == 0 or tacha: raise _error(text)
+                suit = i
+                offset = SUIT_OFFSETS[i]
+                digits = 0
+            elif i == "'" and suit is not None and not tacha:
+                tacha = True
+            else:
+                raise _error(text)
+            continue
+        if suit is None or (suit == 'z' and not 1 <= number <= 7): raise _error(text)
+        results.append((offset + (number or 5) - 1, number == 0, tacha))
+        digits += 1
+        tacha = False
+    if digits == 0 or tacha: raise _error(text)
+    results.reverse()
+    return(results)
+
+
+def _tiles(text):
+    tiles = []
+    for index, akadora, tacha in _scan(text):
+        tile = mahjongpy.MahjongTile.from_index(index, akadora)
+        tiles.append(tile.as_from_tacha() if tacha else tile)
+    return(tiles)
+
+
+def parse(text):
+    """
+    短い表記から手牌と鳴いた面子を作る
+
+    Parameters
+    ----------
+    text : str
+        '123m456p789s11z'のような表記。鳴いた面子は後ろに[]で囲んで続ける
+
+    Returns
+    -------
+    tiles : list
+        手牌(MahjongTileのリスト)
+    melds : list
+        鳴いた面子(MahjongTileのリスト)のリスト
+
+    Raises
+    ------
+    ValueError
+        表記が正しくない
+
+    Examples
+    --------
+    >>> mahjongpy.mahjongnotation.parse("11z[5'55p]")
+    ([MahjongTile('ton', None, akadora=False), MahjongTile('ton', None, akadora=False)], [[MahjongTile('pinzu', 5, akadora=False), MahjongTile('pinzu', 5, akadora=False), MahjongTile('pinzu', 5, akadora=False)]])
+    """
+    hands, melds = _split(text)
+    return(_tiles(hands), [_tiles(i) for i in melds])
+
+
+def parse_counts(text):
+    """
+    短い表記から手牌の34種の牌の枚数を求める。牌のオブジェクトは作らない
+
+    Parameters
+    ----------
+    text : str
+        '123m456p789s11z'のような表記。鳴いた面子([]の部分)は数えない
+
+    Returns
+    -------
+    counts : list of int
+        34種の牌それぞれの枚数。赤ドラ(0)は5として数える
+
+    Raises
+    ------
+    ValueError
+        表記が正しくない
+    """
+    counts = [0]*34
+    for index, _, _ in _scan(_split(text)[0]):
+        counts[index] += 1
+    return(counts)
+
+
+def _format(tiles):
+    text = ''
+    suit = None
+    for i in tiles:
+        if i.index is None: raise ValueError('cannot write a tile without a type')
+        if suit is not None and INDEX_SUITS[i.index] != suit: text += suit
+        suit = INDEX_SUITS[i.index]
+        text += ('0' if i.akadora else str(i.index - SUIT_OFFSETS[suit] + 1)) + ("'" if i.from_tacha else '')
+    return(text + ('' if suit is None else suit))
+
+
+def format_tiles(tiles, melds=()):
+    """
+    手牌と鳴いた面子を短い表記にする
+
+    Parameters
+    ----------
+    tiles : list
+        手牌(MahjongTileのリスト)。萬子、筒子、索子、字牌の順に、数字の小さい順に並べ直して書く
+    melds : list
+        鳴いた面子(MahjongTileのリスト)のリスト。面子の中の牌は並べ直さない
+
+    Returns
+    -------
+    text : str
+        '123m456p789s11z'のような表記
+
+    Examples
+    --------
+    >>> mahjongpy.mahjongnotation.format_tiles(mahjongpy.MahjongTile.make_hands_set('22345', '567', '123567'))
+    '22345m123567p567s'
+    """
+    if any([i.index is None for i in tiles]): raise ValueError('cannot write a tile without a type')
+    tiles = sorted(tiles, key=lambda x: (SUIT_ORDER.index(INDEX_SUITS[x.index]), x.index, not x.akadora))
+    return(_format(tiles) + ''.join(['[{}]'.format(_format(i)) for i in melds]))
+
+
+def format_counts(counts):
+    """
+    34種の牌の枚数を短い表記にする
+
+    Parameters
+    ----------
+    counts : list of int
+        34種の牌それぞれの枚数
+
+    Returns
+    -------
+    text : str
+        '123m456p789s11z'のような表記(赤ドラは区別しない)
+    """
+    text = ''
+    for suit in SUIT_ORDER:
+        offset = SUIT_OFFSETS[suit]
+        digits = ''.join([str(i+1) * counts[offset+i] for i in range(9 if suit != 'z' else 7)])
+        if digits: text += digits + suit
+    return(text)
+
+
+def iter_file(file, counts=False):
+    """
+    1行に1つの手牌が書かれたファイルを1行ずつ読んで解析する。
+    空の行と'#'で始まる行は飛ばす
+
+    Parameters
+    ----------
+    file : file object
+        テキストモードで開いたファイル(または文字列を順に返すもの)
+    counts : bool
+        Trueならparse_counts、Falseならparseの結果を返す
+
+    Yields
+    ------
+    hand : tuple or list
+        parse(counts=Falseのとき)またはparse_counts(counts=Trueのとき)の返り値
+
+    Raises
+    ------
+    ValueError
+        表記が正しくない行がある(行番号を含む)
+    """
+    function = parse_counts if counts else parse
+    for number, line in enumerate(file, 1):
+        line = line.strip()
+        if not line or line.startswith('#'): continue
+        try:
+            yield(function(line))
+        except ValueError as e:
+            raise ValueError('line {}: {}'.format(number, e)) from None
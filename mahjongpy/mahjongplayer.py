@@ -1,4 +1,6 @@
 import mahjongpy
+from . import mahjongcache
+from . import mahjongscore
 
 
 class MahjongPlayer:
@@ -7,8 +9,8 @@ class MahjongPlayer:
 
     Attributes
     ----------
-    hands : list
-        プレイヤーの手牌。MahjongTileのリスト
+    hands : MahjongHands
+        プレイヤーの手牌。MahjongTileのリスト(34種の牌の枚数を差分更新で保持する)
     discards : list
         プレイヤーの河。MahjongTileのリスト
     melds : list
@@ -44,18 +46,28 @@ class MahjongPlayer:
         和了った時にダブルリーチ(役)がつく状態かどうか
     is_rinsyankaihou : bool
         和了った時に嶺上開花(役)がつく状態かどうか
-    score_cache : int
-        プレイヤーの点数のキャッシュ
-    score_without_tsumibo_cache : int
-        プレイヤーの点数(積み棒分を除く)のキャッシュ
-    yakus_cache : list
-        プレイヤーの手牌でできる役のリストのキャッシュ
-    tilse_cache : list
-        手牌のキャッシュ
+    cache : dict
+        役、点数など手牌から求めた値のキャッシュ。cache_keyと同じ状態のときだけ使われる
+    cache_key : tuple
+        cacheの値を求めたときの状態(state_keyの返り値)
+    decomposition_cache : tuple
+        役と符の計算に使った手牌の分解(雀頭の通し番号, 面子のタプル, 和了牌を含む面子)のキャッシュ
+    decompositions_cache : tuple
+        手牌の34種の牌の枚数と、その面子分解のリストのキャッシュ
     """
 
     TILE_TYPES = ['pinzu', 'manzu', 'souzu', 'ton', 'nan', 'sha', 'pei', 'haku', 'hatu', 'tyun']
     KYOMU_TILE = mahjongpy.MahjongTile(None)
+    SUIT_INDICES = [18, 0, 9]  # TILE_TYPES[:3]の順(筒子、萬子、索子)の通し番号の先頭
+    GROUP_ORDER = sum([[18+i, i, 9+i] + (list(range(27, 34)) if i == 0 else []) for i in range(9)], [])
+    YAKU_HANS = {'riichi':1, 'ippatu':1, 'menzentumo':1, 'pinfu':1, 'tanyao':1, 'ipeikou':1, 'yakuhai':1,
+                 'rinsyankaihou':1, 'haitei':1, 'houtei':1, 'tyankan':1, 'doubleriichi':2, 'chanta':2,
+                 'ikkituukan':2, 'sansyokudouzyun':2, 'sansyokudoukou':2, 'sanankou':2, 'sankantu':2,
+                 'toitoi':2, 'chitoitu':2, 'zyuntyan':3, 'ryanpeikou':3, 'honitu':3, 'honroutou':2,
+                 'syousangen':2, 'chinitu':6}
+    YAKU_HANS_FUROED = dict(YAKU_HANS, tyankan=1, ikkituukan=1, sansyokudouzyun=1, zyuntyan=2, honitu=2, chinitu=5)
+    YAKUMANS = ['suankou', 'daisangen', 'kokushimusou', 'ryuisou', 'tuisou', 'chinroutou', 'sukantu',
+                'syoususi', 'daisusi', 'tyurenboutou', 'chihou', 'tenhou']
 
     def __init__(self, hands=[], discards=[], melds=[], oya=False, points=25000, wind='ton', latest_tile=KYOMU_TILE,
                  table=None, turn=0, is_tumo=False, ankans=[], minkans=[], minkos=[]):
@@ -78,12 +90,20 @@ class MahjongPlayer:
         self.is_doubleriichi = False
         self.is_rinsyankaihou = False
         self.table = table
-        self.score_cache = 0
-        self.score_without_tsumibo_cache = 0
-        self.yakus_cache = []
-        self.tiles_cache = []
+        self.cache = {}
+        self.cache_key = None
+        self.decomposition_cache = (None, (), None)
+        self.decompositions_cache = (None, [])
         self.sort()
 
+    @property
+    def hands(self):
+        return(self._hands)
+
+    @hands.setter
+    def hands(self, tiles):
+        self._hands = mahjongpy.MahjongHands(tiles)
+
     def sort(self):
         """
         プレイヤーの手牌を種類、番号順にソートする
@@ -93,35 +113,95 @@ class MahjongPlayer:
         self.hands を　破壊的に　ソートするので注意
 
         """
-        self.hands = sorted(self.hands)
+        self.hands.sort()
+
+    def all_counts(self):
+        """
+        手牌と鳴いた牌を合わせた34種の牌の枚数
+
+        Returns
+        -------
+        counts : list of int
+            34種の牌それぞれの枚数。添字はMahjongTile.indexに対応
+        """
+        counts = self.hands.counts[:]
+        for i in self.melds:
+            for j in i:
+                counts[j.index] += 1
+        return(counts)
+
+    def count(self, tile):
+        """
+        手牌にある指定した牌の枚数
+
+        Parameters
+        ----------
+        tile : MahjongTile
+            数える牌
+
+        Returns
+        -------
+        count : int
+            手牌にあるその牌の枚数(赤ドラも同じ牌として数える)
+        """
+        if tile.index is None: return(0)
+        return(self.hands.counts[tile.index])
+
+    def hands_string(self, name_jp=False, separator=' '):
+        """
+        Parameters
+        ----------
+        name_jp : bool
+            牌の表示(display)の代わりに名前(name_jp)を使うかどうか
+        separator : str
+            牌と牌の間に入れる文字列
+
+        Returns
+        -------
+        string : str
+            プレイヤーの手牌すべてをつないだ文字列。mahjongpy.MahjongTile.tiles_string を参照
+        """
+        return(mahjongpy.MahjongTile.tiles_string(self.hands, name_jp, separator))
+
+    def discards_string(self, name_jp=False, separator=' '):
+        """
+        Parameters
+        ----------
+        name_jp : bool
+            牌の表示(display)の代わりに名前(name_jp)を使うかどうか
+        separator : str
+            牌と牌の間に入れる文字列
+
+        Returns
+        -------
+        string : str
+            プレイヤーの河すべてをつないだ文字列。mahjongpy.MahjongTile.tiles_string を参照
+        """
+        return(mahjongpy.MahjongTile.tiles_string(self.discards, name_jp, separator))
 
     def hands_display(self):
         """
         プレイヤーの手牌すべてを実際の牌のような感じで表示
         """
-        for i in self.hands:
-            print(i.display)
+        if self.hands: print(self.hands_string(separator='\n'))
 
     def hands_name_jp(self):
         """
         プレイヤーの手牌すべての名前を表示
         """
-        for i in self.hands:
-            print(i.name_jp)
+        if self.hands: print(self.hands_string(True, '\n'))
 
     def discards_display(self):
         """
         プレイヤーの河すべてを実際の牌のような感じで表示
         """
-        for i in self.discards:
-            print(i.display)
+        if self.discards: print(self.discards_string(separator='\n'))
 
     def discards_name_jp(self):
         """
         プレイヤーの河すべての名前を表示
         """
-        for i in self.discards:
-            print(i.name_jp)
+        if self.discards: print(self.discards_string(True, '\n'))
 
     def shanten(self):
         """
@@ -130,95 +210,14 @@ class MahjongPlayer:
         Returns
         -------
         count : int
-            プレイヤーのシャンテン数
-        """
-        counts = [100]
+            プレイヤーのシャンテン数(テンパイで0、和了形で-1)
 
-        tiles = self.hands[:]
-        mentus = []
-        self.make_shuntus(tiles, mentus)
-        self.make_kotus(tiles, mentus)
-        self.make_zyantou(tiles, mentus)
-        tmp = tiles[:]
-        count = 0
-        for i in self.TILE_TYPES[:3]:
-            for j in range(1,8):
-                if mahjongpy.MahjongTile(i,j) in tmp:
-                    if mahjongpy.MahjongTile(i,j+1) in tmp:
-                        tmp.pop(tmp.index(mahjongpy.MahjongTile(i,j)))
-                        tmp.pop(tmp.index(mahjongpy.MahjongTile(i,j+1)))
-                        count += 1
-                    if mahjongpy.MahjongTile(i,j+2) in tmp:
-                        tmp.pop(tmp.index(mahjongpy.MahjongTile(i,j)))
-                        tmp.pop(tmp.index(mahjongpy.MahjongTile(i,j+2)))
-                        count += 1
-        for i in self.TILE_TYPES:
-            for j in range(1,8):
-                if tmp.count(mahjongpy.MahjongTile(i,j)) == 2:
-                    tmp.pop(tmp.index(mahjongpy.MahjongTile(i,j)))
-                    tmp.pop(tmp.index(mahjongpy.MahjongTile(i,j)))
-                    count += 1
-                if len(tmp)-count == 2:
-                    tmp.pop(0)
-                    count += 1
-        if len(tmp) == count: counts.append(count)
-
-        tiles = self.hands[:]
-        mentus = []
-        self.make_zyantou(tiles, mentus)
-        self.make_shuntus(tiles, mentus)
-        self.make_kotus(tiles, mentus)
-        tmp = tiles[:]
-        count = 0
-        for i in self.TILE_TYPES[:3]:
-            for j in range(1,8):
-                if mahjongpy.MahjongTile(i,j) in tmp:
-                    if mahjongpy.MahjongTile(i,j+1) in tmp:
-                        tmp.pop(tmp.index(mahjongpy.MahjongTile(i,j)))
-                        tmp.pop(tmp.index(mahjongpy.MahjongTile(i,j+1)))
-                        count += 1
-                    if mahjongpy.MahjongTile(i,j+2) in tmp:
-                        tmp.pop(tmp.index(mahjongpy.MahjongTile(i,j)))
-                        tmp.pop(tmp.index(mahjongpy.MahjongTile(i,j+2)))
-                        count += 1
-        for i in self.TILE_TYPES:
-            for j in range(1,8):
-                if tmp.count(mahjongpy.MahjongTile(i,j)) == 2:
-                    tmp.pop(tmp.index(mahjongpy.MahjongTile(i,j)))
-                    tmp.pop(tmp.index(mahjongpy.MahjongTile(i,j)))
-                    count += 1
-                if len(tmp)-count == 2:
-                    tmp.pop(0)
-                    count += 1
-        if len(tmp) == count: counts.append(count)
-
-        tmp = tiles[:]
-        count = 0
-        for i in self.TILE_TYPES:
-            for j in range(1,10):
-                if tmp.count(mahjongpy.MahjongTile(i,j)) == 2: count += 1
-        counts.append(7-count)  # 七対子用
-
-        tiles = self.hands[:]
-        tmp = []
-        tmp.append(tiles.count(mahjongpy.MahjongTile('pinzu',1)))
-        tmp.append(tiles.count(mahjongpy.MahjongTile('pinzu',9)))
-        tmp.append(tiles.count(mahjongpy.MahjongTile('manzu',1)))
-        tmp.append(tiles.count(mahjongpy.MahjongTile('manzu',9)))
-        tmp.append(tiles.count(mahjongpy.MahjongTile('souzu',1)))
-        tmp.append(tiles.count(mahjongpy.MahjongTile('souzu',9)))
-        tmp.append(tiles.count(mahjongpy.MahjongTile('ton')))
-        tmp.append(tiles.count(mahjongpy.MahjongTile('nan')))
-        tmp.append(tiles.count(mahjongpy.MahjongTile('sha')))
-        tmp.append(tiles.count(mahjongpy.MahjongTile('pei')))
-        tmp.append(tiles.count(mahjongpy.MahjongTile('haku')))
-        tmp.append(tiles.count(mahjongpy.MahjongTile('hatu')))
-        tmp.append(tiles.count(mahjongpy.MahjongTile('tyun')))
-        if tmp.count(1) == 13: counts.append(1)
-        elif tmp.count(2) > 1: counts.append(13-tmp.count(1))
-        else: counts.append(13-tmp.count(1)+1)
-
-        return(min(counts)-1)
+        Notes
+        -----
+        一般形、七対子、国士無双のうち最も小さいもの。mahjongpy.shanten を参照。
+        手牌(MahjongHands)が変化のあったグループだけを引き直して計算し、結果をキャッシュする
+        """
+        return(self.hands.shanten())
 
     def is_tenpai(self):
         """
@@ -229,6 +228,93 @@ class MahjongPlayer:
         """
         return(self.shanten() == 0)
 
+    def visible_counts(self):
+        """
+        プレイヤーから見えている34種の牌の枚数。
+        自分の手牌と、卓の全員の河、鳴いた牌(槓子は4枚)、ドラ表示牌を数える
+
+        Returns
+        -------
+        counts : list of int
+            34種の牌それぞれの見えている枚数。添字はMahjongTile.indexに対応
+        """
+        counts = self.hands.counts[:]
+        players = [self] if self.table is None else self.table.players
+        tiles = [] if self.table is None else self.table.dora_showing_tiles[:]
+        for i in players:
+            tiles += i.discards + sum(i.melds, []) + [j[0] for j in i.ankans + i.minkans]
+        for i in tiles:
+            if i.index is not None: counts[i.index] += 1
+        return(counts)
+
+    def unseen_counts(self):
+        """
+        プレイヤーから見えていない34種の牌の枚数(4枚から見えている枚数を引いたもの)
+
+        Returns
+        -------
+        counts : list of int
+            34種の牌それぞれの見えていない枚数。添字はMahjongTile.indexに対応
+        """
+        return([max(0, 4-i) for i in self.visible_counts()])
+
+    def ukeire(self):
+        """
+        引くとシャンテン数が下がる牌(受け入れ)と、その牌の見えていない枚数を返す
+
+        Returns
+        -------
+        ukeire : dict
+            MahjongTileをキー、その牌の見えていない枚数を値とする辞書(牌の順に並ぶ)。
+            残り枚数が0の牌も含まれる
+
+        Notes
+        -----
+        13枚(鳴いている場合は3n+1枚)の手牌を想定している。mahjongpy.mahjongshanten.ukeire を参照
+        """
+        unseen = self.unseen_counts()
+        return({mahjongpy.MahjongTile.from_index(i): unseen[i] for i in self.hands.ukeire()})
+
+    def evaluate_discards(self):
+        """
+        手牌の牌それぞれについて、捨てた後のシャンテン数と受け入れを求める
+
+        Returns
+        -------
+        evaluations : list of dict
+            捨てる牌ごとの辞書のリスト。シャンテン数が小さい順、受け入れ枚数が多い順に並ぶ。
+            tile : 捨てる牌(MahjongTile。赤ドラは別の牌として扱う)
+            shanten : 捨てた後のシャンテン数
+            ukeire : 捨てた後の受け入れの見えていない枚数の合計
+            waits : 捨てた後の受け入れの牌(MahjongTile)のリスト
+
+        Notes
+        -----
+        14枚(鳴いている場合は3n+2枚)の手牌を想定している。
+        すべての捨てる牌の計算を1回で行い、グループごとの計算を共有する
+        """
+        unseen = self.unseen_counts()
+        results = self.hands.evaluate_discards()
+        evaluations = []
+        for i in sorted(set(self.hands)):
+            count, indices = results[i.index]
+            evaluations.append({'tile': i, 'shanten': count, 'ukeire': sum([unseen[j] for j in indices]),
+                                'waits': [mahjongpy.MahjongTile.from_index(j) for j in indices]})
+        evaluations.sort(key=lambda x: (x['shanten'], -x['ukeire']))
+        return(evaluations)
+
+    def waits(self):
+        """
+        テンパイのときの待ち牌と、その牌の見えていない枚数を返す
+
+        Returns
+        -------
+        waits : dict
+            MahjongTileをキー、その牌の見えていない枚数を値とする辞書。テンパイでなければ空の辞書
+        """
+        if self.shanten() != 0: return({})
+        return(self.ukeire())
+
     def is_furiten(self):
         """
         Returns
@@ -247,9 +333,8 @@ class MahjongPlayer:
             手牌が九種九牌かどうか
         """
         count = 0
-        for i in self.hands:
-            if i.number in [1, 9, None]:
-                count += 1
+        for i in mahjongpy.MahjongTile.YAOCHU_INDICES:
+            count += self.hands.counts[i]
         return(count > 8)
 
     def is_hora(self):
@@ -259,22 +344,26 @@ class MahjongPlayer:
         is_hora : bool
             プレイヤーの手牌が和了形かどうか
         """
-        is_hora = False
+        return(mahjongpy.is_agari(self.hands.counts) or self.is_chitoitu() or self.is_kokushimusou())
 
-        tiles = self.hands[:]
-        mentus = []
-        self.make_shuntus(tiles, mentus)
-        self.make_kotus(tiles, mentus)
-        is_hora = self.is_zyantou(tiles, mentus)
+    def decompositions(self):
+        """
+        手牌を雀頭1つと面子に分解する方法をすべて返す。手牌ごとにキャッシュされる
 
-        tiles = self.hands[:]
-        mentus = []
-        self.make_zyantou(tiles, mentus)
-        self.make_shuntus(tiles, mentus)
-        self.make_kotus(tiles, mentus)
-        is_hora = is_hora or (len(tiles) == 0)
+        Returns
+        -------
+        decompositions : list
+            (雀頭の通し番号, 面子のタプル)のリスト。面子は牌の通し番号3つのタプル。鳴いた面子は含まない。
+            和了形でなければ空のリスト。共有されているキャッシュのコピーを返す
 
-        return(is_hora or self.is_chitoitu() or self.is_kokushimusou())
+        Notes
+        -----
+        mahjongpy.decompose を参照
+        """
+        key = tuple(self.hands.counts)
+        if self.decompositions_cache[0] != key:
+            self.decompositions_cache = (key, mahjongcache.get('decompose', key, lambda: mahjongpy.decompose(key)))
+        return(list(self.decompositions_cache[1]))
 
     def zyantou(self):
         """
@@ -284,25 +373,69 @@ class MahjongPlayer:
         -------
         tiles : list
             雀頭(2枚のMahjongTileのリスト)。雀頭がない場合ダミータイル(self.KYOMU_TILE)1枚のみのリストが返る
-        """
-        is_hora = False
-
-        tiles = self.hands[:]
-        mentus = []
-        self.make_shuntus(tiles, mentus)
-        self.make_kotus(tiles, mentus)
-        is_hora = self.is_zyantou(tiles, mentus)
-        if is_hora: return(mentus[-1])
-
-        tiles = self.hands[:]
-        mentus = []
-        self.make_zyantou(tiles, mentus)
-        self.make_shuntus(tiles, mentus)
-        self.make_kotus(tiles, mentus)
-        is_hora = is_hora or (len(tiles) == 0)
-        if is_hora: return(mentus[0])
 
-        return([self.KYOMU_TILE])
+        Notes
+        -----
+        分解の方法が複数あるときは、ツモかロンの状態なら最も点数が高くなる分解の雀頭を、そうでなければ最初の分解の雀頭を返す
+        """
+        zyantou = self._decomposition()[0]
+        if zyantou is None: return([self.KYOMU_TILE])
+        return(self._tiles_of([zyantou]*2))
+
+    def _meld_mentus(self):
+        return([tuple(sorted([j.index for j in i])) for i in self.melds])
+
+    def _candidates(self):
+        candidates = []
+        index = self.latest_tile.index
+        for zyantou, mentus in self.decompositions():
+            waits = sorted(set([i for i in mentus + ((zyantou, zyantou),) if index in i]))
+            for i in (waits if len(waits) > 0 else [None]):
+                candidates.append((zyantou, mentus, i))
+        if len(candidates) == 0 or self.is_chitoitu():
+            candidates.append((None, (), None))
+        return(candidates)
+
+    def _decomposition(self):
+        # ツモかロンの状態なら役の計算で選んだ最も点数の高い分解、そうでなければ役を計算せずに最初の分解を使う
+        if self.is_tumo or self.is_ron:
+            self.yakus()
+            return(self.decomposition_cache)
+        decompositions = self.decompositions()
+        if len(decompositions) == 0: return((None, (), None))
+        return(decompositions[0] + (None,))
+
+    def _tiles_of(self, indices):
+        return([mahjongpy.MahjongTile.from_index(i) for i in indices])
+
+    def _pop_tile(self, tiles, index):
+        for i in range(len(tiles)):
+            if tiles[i].index == index:
+                return(tiles.pop(i))
+
+    def _make_shuntus_counts(self, counts, mentus, passes=2):
+        for _ in range(passes):
+            for i in range(7):
+                for j in self.SUIT_INDICES:
+                    k = i + j
+                    if counts[k] > 0 and counts[k+1] > 0 and counts[k+2] > 0:
+                        counts[k] -= 1
+                        counts[k+1] -= 1
+                        counts[k+2] -= 1
+                        mentus.append([k, k+1, k+2])
+
+    def _make_kotus_counts(self, counts, mentus):
+        for i in self.GROUP_ORDER:
+            if counts[i] == 3:
+                counts[i] = 0
+                mentus.append([i]*3)
+
+    def _make_zyantou_counts(self, counts, mentus):
+        for i in self.GROUP_ORDER:
+            if counts[i] == 2:
+                counts[i] = 0
+                mentus.append([i]*2)
+                return(None)
 
     def make_shuntus(self, tiles, mentus):
         """
@@ -319,15 +452,10 @@ class MahjongPlayer:
         -----
         引数のtiles、およびmentusを　破壊的に　変更するので注意
         """
-        for _ in range(2):
-            for i in range(1,8):
-                for j in self.TILE_TYPES[:3]:
-                    if mahjongpy.MahjongTile(j,i) in tiles and mahjongpy.MahjongTile(j,i+1) in tiles and mahjongpy.MahjongTile(j,i+2) in tiles:
-                        tmp = []
-                        tmp.append(tiles.pop(tiles.index(mahjongpy.MahjongTile(j,i))))
-                        tmp.append(tiles.pop(tiles.index(mahjongpy.MahjongTile(j,i+1))))
-                        tmp.append(tiles.pop(tiles.index(mahjongpy.MahjongTile(j,i+2))))
-                        mentus.append(tmp)
+        shuntus = []
+        self._make_shuntus_counts(mahjongpy.MahjongHands(tiles).counts, shuntus)
+        for i in shuntus:
+            mentus.append([self._pop_tile(tiles, j) for j in i])
 
     def make_kotus(self, tiles, mentus):
         """
@@ -344,13 +472,10 @@ class MahjongPlayer:
         -----
         引数のtiles、およびmentusを　破壊的に　変更するので注意
         """
-        for i in range(1,10):
-            for j in self.TILE_TYPES:
-                if tiles.count(mahjongpy.MahjongTile(j,i)) == 3:
-                    tmp = []
-                    for _ in range(3):
-                        tmp.append(tiles.pop(tiles.index(mahjongpy.MahjongTile(j,i))))
-                    mentus.append(tmp)
+        kotus = []
+        self._make_kotus_counts(mahjongpy.MahjongHands(tiles).counts, kotus)
+        for i in kotus:
+            mentus.append([self._pop_tile(tiles, j) for j in i])
 
     def make_zyantou(self, tiles, mentus):
         """
@@ -367,14 +492,10 @@ class MahjongPlayer:
         -----
         引数のtiles、およびmentusを　破壊的に　変更するので注意
         """
-        for i in range(1,10):
-            for j in self.TILE_TYPES:
-                if tiles.count(mahjongpy.MahjongTile(j,i)) == 2:
-                    tmp = []
-                    for _ in range(2):
-                        tmp.append(tiles.pop(tiles.index(mahjongpy.MahjongTile(j,i))))
-                    mentus.append(tmp)
-                    return(None)
+        zyantou = []
+        self._make_zyantou_counts(mahjongpy.MahjongHands(tiles).counts, zyantou)
+        for i in zyantou:
+            mentus.append([self._pop_tile(tiles, j) for j in i])
 
     def is_zyantou(self, tiles, mentus):
         """
@@ -405,16 +526,10 @@ class MahjongPlayer:
             プレイヤーの手牌が七対子かどうか
         """
         if not self.is_menzen(): return(False)
-        mentus = []
-        tiles = self.hands[:]
-        for i in range(1,10):
-            for j in self.TILE_TYPES:
-                if tiles.count(mahjongpy.MahjongTile(j,i)) == 2:
-                    tmp = []
-                    for _ in range(2):
-                        tmp.append(tiles.pop(tiles.index(mahjongpy.MahjongTile(j,i))))
-                    mentus.append(tmp)
-        return(len(tiles) == 0)
+        return(self._is_chitoitu_counts(self.hands.counts))
+
+    def _is_chitoitu_counts(self, counts):
+        return(all([i in [0, 2] for i in counts]))
 
     def is_kokushimusou(self):
         """
@@ -424,23 +539,20 @@ class MahjongPlayer:
             プレイヤーの手牌が国士無双かどうか
         """
         if not self.is_menzen(): return(False)
-        tmp = []
-        tiles = self.hands[:]
-        tmp.append(tiles.count(mahjongpy.MahjongTile('pinzu',1)))
-        tmp.append(tiles.count(mahjongpy.MahjongTile('pinzu',9)))
-        tmp.append(tiles.count(mahjongpy.MahjongTile('manzu',1)))
-        tmp.append(tiles.count(mahjongpy.MahjongTile('manzu',9)))
-        tmp.append(tiles.count(mahjongpy.MahjongTile('souzu',1)))
-        tmp.append(tiles.count(mahjongpy.MahjongTile('souzu',9)))
-        tmp.append(tiles.count(mahjongpy.MahjongTile('ton')))
-        tmp.append(tiles.count(mahjongpy.MahjongTile('nan')))
-        tmp.append(tiles.count(mahjongpy.MahjongTile('sha')))
-        tmp.append(tiles.count(mahjongpy.MahjongTile('pei')))
-        tmp.append(tiles.count(mahjongpy.MahjongTile('haku')))
-        tmp.append(tiles.count(mahjongpy.MahjongTile('hatu')))
-        tmp.append(tiles.count(mahjongpy.MahjongTile('tyun')))
+        return(self._is_kokushimusou_counts(self.hands.counts))
+
+    def _is_kokushimusou_counts(self, counts):
+        tmp = [counts[i] for i in mahjongpy.MahjongTile.YAOCHU_INDICES]
         return(tmp.count(1) == 12 and tmp.count(2) == 1)
 
+    def _is_all_mentus_with(self, zyantou, mentus, indices):
+        if zyantou not in indices: return(False)
+        return(all([any([j in indices for j in i]) for i in list(mentus) + self._meld_mentus()]))
+
+    def _peikou_count(self, mentus):
+        shuntus = [i for i in mentus if i[0] != i[1]]
+        return(sum([shuntus.count(i) // 2 for i in set(shuntus)]))
+
     def is_chanta(self):
         """
         Returns
@@ -448,36 +560,8 @@ class MahjongPlayer:
         is_kokushimusou : bool
             プレイヤーの手牌がチャンタかどうか
         """
-        is_hora = False
-
-        tiles = self.hands[:] + sum(self.melds, [])
-        mentus = []
-        self.make_shuntus(tiles, mentus)
-        self.make_kotus(tiles, mentus)
-        is_hora = self.is_zyantou(tiles, mentus)
-        count = 0
-        for i in mentus:
-            for j in i:
-                if j.number in [1, 9, None]:
-                    count += 1
-                    break
-        if is_hora and count == 5: return(True)
-
-        count = 0
-        tiles = self.hands[:]
-        mentus = []
-        self.make_zyantou(tiles, mentus)
-        self.make_shuntus(tiles, mentus)
-        self.make_kotus(tiles, mentus)
-        is_hora = is_hora or (len(tiles) == 0)
-        for i in mentus:
-            for j in i:
-                if j.number in [1, 9, None]:
-                    count += 1
-                    break
-        if is_hora and count == 5: return(True)
-
-        return(False)
+        yaochu = mahjongpy.MahjongTile.YAOCHU_INDICES
+        return(any([self._is_all_mentus_with(i, j, yaochu) for i, j in self.decompositions()]))
 
     def is_zyuntyan(self):
         """
@@ -486,78 +570,50 @@ class MahjongPlayer:
         is_kokushimusou : bool
             プレイヤーの手牌がジュンチャンかどうか
         """
-        is_hora = False
-
-        tiles = self.hands[:] + sum(self.melds, [])
-        mentus = []
-        self.make_shuntus(tiles, mentus)
-        self.make_kotus(tiles, mentus)
-        is_hora = self.is_zyantou(tiles, mentus)
-        count = 0
-        for i in mentus:
-            for j in i:
-                if j.number in [1, 9]:
-                    count += 1
-                    break
-        if is_hora and count == 5: return(True)
-
-        count = 0
-        tiles = self.hands[:]
-        mentus = []
-        self.make_zyantou(tiles, mentus)
-        self.make_shuntus(tiles, mentus)
-        self.make_kotus(tiles, mentus)
-        is_hora = is_hora or (len(tiles) == 0)
-        for i in mentus:
-            for j in i:
-                if j.number in [1, 9]:
-                    count += 1
-                    break
-        if is_hora and count == 5: return(True)
+        routou = mahjongpy.MahjongTile.YAOCHU_INDICES[:6]
+        return(any([self._is_all_mentus_with(i, j, routou) for i, j in self.decompositions()]))
 
-        return(False)
-
-    def is_ipeikou(self, tiles, mentus):
+    def is_ipeikou(self, tiles=None, mentus=None):
         """
+        Parameters
+        ----------
+        tiles : list
+            判定するMahjongTileのリスト。省略した場合は手牌
+        mentus : list
+            一盃口と判定されたとき、その分解の順子がMahjongTile3枚のリストとして追加される
+
         Returns
         -------
         is_kokushimusou : bool
             プレイヤーの手牌が一盃口かどうか
         """
-        if not self.is_menzen(): return(False)
-        count = []
-        for _ in range(2):
-            for i in range(1,8):
-                for j in self.TILE_TYPES[:3]:
-                    if mahjongpy.MahjongTile(j,i) in tiles and mahjongpy.MahjongTile(j,i+1) in tiles and mahjongpy.MahjongTile(j,i+2) in tiles:
-                        tmp = []
-                        tmp.append(tiles.pop(tiles.index(mahjongpy.MahjongTile(j,i))))
-                        tmp.append(tiles.pop(tiles.index(mahjongpy.MahjongTile(j,i+1))))
-                        tmp.append(tiles.pop(tiles.index(mahjongpy.MahjongTile(j,i+2))))
-                        mentus.append(tmp)
-            count.append(len(tiles))
-        return(count == [5,2])
-
-    def is_ryanpeikou(self, tiles, mentus):
+        return(self._is_peikou(1, tiles, mentus))
+
+    def is_ryanpeikou(self, tiles=None, mentus=None):
         """
+        Parameters
+        ----------
+        tiles : list
+            判定するMahjongTileのリスト。省略した場合は手牌
+        mentus : list
+            二盃口と判定されたとき、その分解の順子がMahjongTile3枚のリストとして追加される
+
         Returns
         -------
         is_kokushimusou : bool
             プレイヤーの手牌が二盃口かどうか
         """
+        return(self._is_peikou(2, tiles, mentus))
+
+    def _is_peikou(self, count, tiles, mentus):
         if not self.is_menzen(): return(False)
-        count = []
-        for _ in range(2):
-            for i in range(1,8):
-                for j in self.TILE_TYPES[:3]:
-                    if mahjongpy.MahjongTile(j,i) in tiles and mahjongpy.MahjongTile(j,i+1) in tiles and mahjongpy.MahjongTile(j,i+2) in tiles:
-                        tmp = []
-                        tmp.append(tiles.pop(tiles.index(mahjongpy.MahjongTile(j,i))))
-                        tmp.append(tiles.pop(tiles.index(mahjongpy.MahjongTile(j,i+1))))
-                        tmp.append(tiles.pop(tiles.index(mahjongpy.MahjongTile(j,i+2))))
-                        mentus.append(tmp)
-            count.append(len(tiles))
-        return(count == [8,2])
+        decompositions = self.decompositions() if tiles is None else mahjongpy.decompose(mahjongpy.MahjongHands(tiles).counts)
+        for _, i in decompositions:
+            if self._peikou_count(i) == count:
+                if mentus is not None:
+                    mentus += [self._tiles_of(j) for j in i if j[0] != j[1]]
+                return(True)
+        return(False)
 
     def displayed_doras(self):
         """
@@ -569,11 +625,10 @@ class MahjongPlayer:
             手牌のドラ牌の数
         """
         count = 0
-        tiles = self.hands[:] + sum(self.melds, [])
-        doras = None if self.table is None else self.table.dora_tiles
-        for i in tiles:
-            for j in doras:
-                if i == j: count += 1
+        counts = self.all_counts()
+        doras = [] if self.table is None else self.table.dora_tiles
+        for i in doras:
+            count += counts[i.index]
         return(count)
 
     def akadoras(self):
@@ -585,10 +640,10 @@ class MahjongPlayer:
         count : int
             手牌の赤ドラの数
         """
-        count = 0
-        tiles = self.hands[:] + sum(self.melds, [])
-        for i in tiles:
-            if i.akadora: count += 1
+        count = bin(self.hands.aka_mask).count('1')
+        for i in self.melds:
+            for j in i:
+                if j.akadora: count += 1
         return(count)
 
     def doras(self):
@@ -609,10 +664,11 @@ class MahjongPlayer:
         tiles : list
             手牌の順子のリスト。順子1つごとにMahjongTile3枚のリストになっているためリストのリストが返る
         """
-        tiles = self.hands[:]
-        mentus = []
-        self.make_shuntus(tiles, mentus)
-        return(mentus)
+        zyantou, mentus, wait = self._decomposition()
+        if zyantou is None:
+            mentus = []
+            self._make_shuntus_counts(self.hands.counts[:], mentus)
+        return([self._tiles_of(i) for i in mentus if i[0] != i[1]])
 
     def ankos(self):
         """
@@ -623,14 +679,17 @@ class MahjongPlayer:
         tiles : list
             手牌の暗刻のリスト。暗刻1つごとにMahjongTile3枚のリストになっているためリストのリストが返る
         """
-        tiles = self.hands[:]
-        mentus = []
-        self.make_kotus(tiles, mentus)
-        if self.is_tumo or self.is_ron:
-            for i in mentus:
-                if self.latest_tile in i:
-                    mentus.remove(i)
-        return(mentus)
+        return([self._tiles_of(i) for i in self._ankos_of(self._decomposition())])
+
+    def _ankos_of(self, decomposition):
+        zyantou, mentus, wait = decomposition
+        if zyantou is None:
+            mentus = []
+            self._make_kotus_counts(self.hands.counts[:], mentus)
+            if self.is_tumo or self.is_ron:
+                mentus = [i for i in mentus if self.latest_tile.index not in i]
+            return(mentus)
+        return([i for i in mentus if i[0] == i[1] and not ((self.is_tumo or self.is_ron) and i == wait)])
 
     def kotus(self):
         """
@@ -650,6 +709,39 @@ class MahjongPlayer:
         """
         return(self.ankans + self.minkans)
 
+    def state_key(self):
+        """
+        役や点数の計算に関わる状態をまとめたタプルを返す。キャッシュのキーに使う
+
+        Returns
+        -------
+        key : tuple
+            手牌の34種の牌の枚数と赤ドラ、和了牌、鳴いた牌、リーチ・ツモ・ロンなどのフラグ、ターン数、親、自風と、
+            卓の場風、本場、ドラ、喰いタンのルール、鳴きの有無、最後の牌かどうか
+        """
+        table = self.table
+        return((tuple(self.hands.counts), self.hands.aka_mask, self.latest_tile.id,
+                tuple([tuple([j.id for j in i]) for i in self.melds + self.ankans + self.minkans + self.minkos]),
+                len(self.melds), len(self.ankans), len(self.minkans), self.is_riichi, self.is_doubleriichi,
+                self.is_rinsyankaihou, self.is_tumo, self.is_ron, self.turn, self.riichi_turn, self.oya, self.wind,
+                None if table is None else (table.wind, table.honba, tuple([i.id for i in table.dora_tiles]),
+                                            table.kuitan, table.is_furoed, table.tiles_left() == 0)))
+
+    def clear_cache(self):
+        """
+        役や点数のキャッシュを消す
+        """
+        self.cache = {}
+        self.cache_key = None
+
+    def _cached(self, name, compute):
+        key = self.state_key()
+        if key != self.cache_key:
+            self.cache = {}
+            self.cache_key = key
+        if name not in self.cache: self.cache[name] = compute()
+        return(self.cache[name])
+
     def yakus(self, cache=True):
         """
         プレイヤーの手牌でできる役のリストを返す
@@ -662,119 +754,111 @@ class MahjongPlayer:
         Returns
         -------
         yakus : list
-            役のリスト。役の名前(適当ローマ字表記)が入っている
+            役のリスト。役の名前(適当ローマ字表記)が入っている。キャッシュのコピーなので書き換えてもよい
+
+        Notes
+        -----
+        手牌の分解の方法(和了牌をどの面子に含めるかを含む)が複数あるときは、
+        役満の数、翻数、符数の順で最も高くなる分解の役を返す
         """
         if not self.is_hora: raise RuntimeError('Not hora')
+        if not cache: self.clear_cache()
+
+        yakus, self.decomposition_cache = self._cached('yakus', self._best_yakus)
+        return(list(yakus))
+
+    def _best_yakus(self):
+        best = None
+        hans = self.YAKU_HANS if self.is_menzen() else self.YAKU_HANS_FUROED
+        for i in self._candidates():
+            yakus = self._yakus_of(i)
+            score = (self._yakuman_count(yakus), sum([hans.get(j, 0) for j in yakus]), self._score_fu(i, yakus))
+            if best is None or score > best[0]:
+                best = (score, yakus, i)
+
+        return((tuple(best[1]), best[2]))
+
+    def _yakus_of(self, decomposition):
+        zyantou, mentus, wait = decomposition
+        blocks = list(mentus) + self._meld_mentus()
+        ankos = self._ankos_of(decomposition)
+        zyantou_tile = self.KYOMU_TILE if zyantou is None else mahjongpy.MahjongTile.from_index(zyantou)
         yakus = []
 
-        if self.tiles_cache != self.hands:
-            cache = False
-            self.tiles_cache = self.hands[:]
-
-        if self.yakus_cache != [] and cache:
-            return(self.yakus_cache)
-
         if self.is_riichi: yakus.append('riichi')
         if self.riichi_turn + 1 == self.turn: yakus.append('ippatu')
         if self.is_menzen() and self.is_tumo: yakus.append('menzentumo')
-        tiles = self.hands[:] + sum(self.melds, [])
+        counts = self.all_counts()
+        yaochu = mahjongpy.MahjongTile.YAOCHU_INDICES
         table_wind = 'ton' if self.table is None else self.table.wind
         TILE_TYPES_YAKUHAI = self.TILE_TYPES[7:] + [self.wind] + [table_wind]
         for i in TILE_TYPES_YAKUHAI:
-            if tiles.count(mahjongpy.MahjongTile(i)) == 3:
+            if counts[mahjongpy.MahjongTile.TILE_INDEX[i]] == 3:
                 yakus.append('yakuhai')
         kuitan = 'True' if self.table is None else self.table.kuitan
-        tmp = tiles[:] if kuitan else self.hands[:]
-        count = 0
-        count += tmp.count(mahjongpy.MahjongTile('pinzu',1))
-        count += tmp.count(mahjongpy.MahjongTile('pinzu',9))
-        count += tmp.count(mahjongpy.MahjongTile('manzu',1))
-        count += tmp.count(mahjongpy.MahjongTile('manzu',9))
-        count += tmp.count(mahjongpy.MahjongTile('souzu',1))
-        count += tmp.count(mahjongpy.MahjongTile('souzu',9))
-        count += tmp.count(mahjongpy.MahjongTile('ton'))
-        count += tmp.count(mahjongpy.MahjongTile('nan'))
-        count += tmp.count(mahjongpy.MahjongTile('sha'))
-        count += tmp.count(mahjongpy.MahjongTile('pei'))
-        count += tmp.count(mahjongpy.MahjongTile('haku'))
-        count += tmp.count(mahjongpy.MahjongTile('hatu'))
-        count += tmp.count(mahjongpy.MahjongTile('tyun'))
-        if count == 0: yakus.append('tanyao')
-        if self.is_menzen() and len(self.shuntus()) == 4 and self.zyantou()[0].tile_type not in TILE_TYPES_YAKUHAI and self.is_wait_ryanmen(): yakus.append('pinfu')
-        if self.is_ipeikou(self.hands[:], []): yakus.append('ipeikou')
-        table_tiles = [] if self.table is None else self.table.tiles
-        if len(table_tiles) == 14 and self.is_tumo: yakus.append('haitei')
-        if len(table_tiles) == 14 and self.is_ron: yakus.append('houtei')
+        tmp = counts if kuitan else self.hands.counts
+        if sum([tmp[i] for i in yaochu]) == 0: yakus.append('tanyao')
+        shuntus = [i for i in mentus if i[0] != i[1]]
+        if self.is_menzen() and len(shuntus) == 4 and zyantou_tile.tile_type not in TILE_TYPES_YAKUHAI and self._is_wait_ryanmen(decomposition): yakus.append('pinfu')
+        if self.is_menzen() and self._peikou_count(mentus) == 1: yakus.append('ipeikou')
+        is_last = self.table is not None and self.table.tiles_left() == 0
+        if is_last and self.is_tumo: yakus.append('haitei')
+        if is_last and self.is_ron: yakus.append('houtei')
         if self.is_rinsyankaihou: yakus.append('rinsyankaihou')
         if False: yakus.append('tyankan')
         if self.is_doubleriichi: yakus.append('doubleriichi')
-        if self.is_chitoitu(): yakus.append('chitoitu')
-        tiles = self.hands[:] + sum(self.melds, [])
+        if zyantou is None and self.is_chitoitu(): yakus.append('chitoitu')
         judge = False
-        for i in self.TILE_TYPES[:3]:
-            count = []
-            for j in range(1,10):
-                count.append(len([k for k in tiles if k.tile_type == i and k.number == j]))
-            if all([l > 0 for l in count]): judge = True
+        for i in self.SUIT_INDICES:
+            if all([(i+j, i+j+1, i+j+2) in blocks for j in [0, 3, 6]]): judge = True
         if judge: yakus.append('ikkituukan')
-        for i in range(1,8):
-            count = []
-            for j in self.TILE_TYPES[:3]:
-                count.append(len([k for k in tiles if k.tile_type == j and k.number == i]))
-                count.append(len([k for k in tiles if k.tile_type == j and k.number == i+1]))
-                count.append(len([k for k in tiles if k.tile_type == j and k.number == i+1]))
-            if count.count(1) == 9: yakus.append('sansyokudouzyun')
-        for i in range(1,10):
-            count = []
-            for j in self.TILE_TYPES[:3]:
-                count.append(len([k for k in tiles if k.tile_type == j and k.number == i]))
-            if count.count(3) == 3: yakus.append('sansyokudoukou')
-        if len(self.ankos()) == 3 or len(self.ankos())+len(self.ankans) == 3: yakus.append('sanankou')
-        #if len(self.minkos) < 2  and len(self.kotus())+len(self.kantus()) == 3: yakus.append('sanankou')
-        #if len(self.minkos) == 1  and len(self.kotus())+len(self.kantus()) == 4: yakus.append('sanankou')
-        if len(self.kotus()) == 4 or len(self.kotus())+len(self.kantus()) == 4:
+        for i in range(7):
+            if all([(i+j, i+j+1, i+j+2) in blocks for j in self.SUIT_INDICES]): yakus.append('sansyokudouzyun')
+        for i in range(9):
+            if all([(i+j,)*3 in blocks for j in self.SUIT_INDICES]): yakus.append('sansyokudoukou')
+        if len(ankos) == 3 or len(ankos)+len(self.ankans) == 3: yakus.append('sanankou')
+        kotus = len(ankos) + len(self.minkos)
+        if kotus == 4 or kotus+len(self.kantus()) == 4:
             if self.is_menzen():
-                if self.is_tumo or self.hands.count(self.latest_tile) == 2:
+                if self.is_tumo or self.count(self.latest_tile) == 2:
                     yakus.append('suankou')
             else:
                 yakus.append('toitoi')
-        if self.is_chanta(): yakus.append('chanta')
+        if zyantou is not None and self._is_all_mentus_with(zyantou, mentus, yaochu): yakus.append('chanta')
         if len(self.kantus()) == 3: yakus.append('sankantu')
-        if self.is_ryanpeikou(self.hands[:], []): yakus.append('ryanpeikou')
-        if self.is_zyuntyan():yakus.append('zyuntyan')
+        if self.is_menzen() and self._peikou_count(mentus) == 2: yakus.append('ryanpeikou')
+        if zyantou is not None and self._is_all_mentus_with(zyantou, mentus, yaochu[:6]): yakus.append('zyuntyan')
+        zihai = sum(counts[27:])
         count = 0
-        for i in self.TILE_TYPES[:3]:
-            if len([j for j in tiles if j.tile_type in [i]+self.TILE_TYPES[3:]]) == 14: count += 1
+        for i in self.SUIT_INDICES:
+            if sum(counts[i:i+9]) + zihai == 14: count += 1
         if count > 0: yakus.append('honitu')
-        if self.zyantou()[0].number is None and len([i for i in tiles if i.number is None]) > 5: yakus.append('syousangen')
-        if len([i for i in tiles if i.number in [1,9,None]]) == 14 and (not self.is_kokushimusou()): yakus.append('honroutou')
-        for i in self.TILE_TYPES[:3]:
-            if len([j for j in tiles if j.tile_type in [i]]) == 14:yakus.append('chinitu')
+        if zyantou_tile.number is None and zihai > 5: yakus.append('syousangen')
+        if sum([counts[i] for i in yaochu]) == 14 and (not self.is_kokushimusou()): yakus.append('honroutou')
+        for i in self.SUIT_INDICES:
+            if sum(counts[i:i+9]) == 14:yakus.append('chinitu')
         count = 0
-        for i in self.TILE_TYPES[7:]:
-            if len([j for j in tiles if j.tile_type == i]) > 2: count += 1
+        for i in counts[31:34]:
+            if i > 2: count += 1
         if count == 3: yakus.append('daisangen')
         if self.is_kokushimusou(): yakus.append('kokushimusou')
-        if self.zyantou()[0].tile_type in self.TILE_TYPES[3:7] and len([i for i in tiles if i.tile_type in self.TILE_TYPES[3:7]]) > 8: yakus.append('syoususi')
+        if zyantou_tile.tile_type in self.TILE_TYPES[3:7] and sum(counts[27:31]) > 8: yakus.append('syoususi')
         count = 0
-        for i in self.TILE_TYPES[3:7]:
-            if len([j for j in tiles if j.tile_type == i]) > 2: count += 1
+        for i in counts[27:31]:
+            if i > 2: count += 1
         if count == 4: yakus.append('daisusi')
-        if len([i for i in tiles if i.tile_type in ['souzu', 'hatu']]) == 14: yakus.append('ryuisou')
-        if len([i for i in tiles if i.tile_type in self.TILE_TYPES[3:]]) == 14: yakus.append('tuisou')
-        if len([i for i in tiles if i.number in [1,9]]) == 14: yakus.append('chinroutou')
+        if sum(counts[9:18]) + counts[32] == 14: yakus.append('ryuisou')
+        if zihai == 14: yakus.append('tuisou')
+        if sum([counts[i] for i in yaochu[:6]]) == 14: yakus.append('chinroutou')
         if len(self.kantus()) == 4: yakus.append('sukantu')
         if self.is_menzen:
-            for i in self.TILE_TYPES[:3]:
-                count = []
-                for j in range(1,10):
-                    count.append(self.hands.count(mahjongpy.MahjongTile(i,j)))
+            for i in self.SUIT_INDICES:
+                count = self.hands.counts[i:i+9]
                 if count.count(3) == 2 and count.count(2) == 1 and count.count(1) == 6: yakus.append('tyurenboutou')
             is_furoed = False if self.table is None else self.table.is_furoed
             if not is_furoed and (not self.oya) and self.turn == 0: yakus.append('chihou')
             if self.oya and self.turn == 0: yakus.append('tenhou')
 
-        self.yakus_cache = yakus
         return(yakus)
 
     def score_fu(self, debug=False):
@@ -789,65 +873,48 @@ class MahjongPlayer:
         score_fu : int
             手牌の符数
         """
-        yakus = self.yakus()
-        if self.is_tumo and 'pinfu' in yakus: return(20)
-        if 'chitoitu' in yakus: return(25)
+        evaluation = self.evaluate()
+        if debug:
+            for i in evaluation.fu_details:
+                print('{}:{}'.format(*i))
+            print('kiriage:{}'.format(evaluation.fu))
+        return(evaluation.fu)
 
-        score_fu = 20
-        if debug: print('Futei:20')
+    def _score_fu(self, decomposition, yakus):
+        return(self._fu_details(decomposition, yakus)[0])
 
+    def _fu_details(self, decomposition, yakus):
+        if self.is_tumo and 'pinfu' in yakus: return((20, (('Pinfu&Tumo', 20),)))
+        if 'chitoitu' in yakus: return((25, (('Chitoitu', 25),)))
+
+        details = [('Futei', 20)]
         if self.is_menzen() and self.is_ron:
-            score_fu += 10
-            if debug: print('Menzen&Ron:10')
+            details.append(('Menzen&Ron', 10))
         elif self.is_tumo:
-            score_fu += 2
-            if debug: print('Tumo:2')
+            details.append(('Tumo', 2))
 
         for i in self.minkos:
-            if i[0].number in range(2,9):
-                score_fu += 2
-                if debug: print('Tyuntyanpai Minko:2')
-            else:
-                score_fu += 4
-                if debug: print('Yaotyuhai Minko:4')
-        #ankos = []
-        #self.make_kotus(self.hands[:], ankos)
-        for i in self.ankos():
-            if i[0].number in range(2,9):
-                score_fu += 4
-                if debug: print('Tyuntyanpai Anko:4')
-            else:
-                score_fu += 8
-                if debug: print('Yaotyuhai Anko:8')
+            details.append(('Tyuntyanpai Minko', 2) if i[0].number in range(2,9) else ('Yaotyuhai Minko', 4))
+        for i in self._ankos_of(decomposition):
+            details.append(('Tyuntyanpai Anko', 4) if i[0] not in mahjongpy.MahjongTile.YAOCHU_INDICES else ('Yaotyuhai Anko', 8))
         for i in self.minkans:
-            if i[0].number in range(2,9):
-                score_fu += 8
-                if debug: print('Tyuntyanpai Minkan:8')
-            else:
-                score_fu += 16
-                if debug: print('Yaotyuhai Minkan:16')
+            details.append(('Tyuntyanpai Minkan', 8) if i[0].number in range(2,9) else ('Yaotyuhai Minkan', 16))
         for i in self.ankans:
-            if i[0].number in range(2,9):
-                score_fu += 16
-                if debug: print('Tyuntyanpai Ankan:16')
-            else:
-                score_fu += 32
-                if debug: print('Yaotyuhai Ankan:32')
+            details.append(('Tyuntyanpai Ankan', 16) if i[0].number in range(2,9) else ('Yaotyuhai Ankan', 32))
         table_wind = "" if self.table is None else self.table.wind
-        if self.zyantou()[0].tile_type in ['haku', 'hatu', 'tyun', self.wind, table_wind]:
-            score_fu += 2
-            if debug: print('Zyantou Yakuhai:2')
-        if (not self.is_wait_ryanmen()) and (not self.is_wait_syabo()):
-            score_fu += 2
-            if debug: print('Not ryanmenmachi:2')
-
-        if debug: print('sum:{}'.format(score_fu))
+        zyantou = decomposition[0]
+        zyantou_tile = self.KYOMU_TILE if zyantou is None else mahjongpy.MahjongTile.from_index(zyantou)
+        if zyantou_tile.tile_type in ['haku', 'hatu', 'tyun', self.wind, table_wind]:
+            details.append(('Zyantou Yakuhai', 2))
+        if (not self._is_wait_ryanmen(decomposition)) and (not self._is_wait_syabo(decomposition)):
+            details.append(('Not ryanmenmachi', 2))
+
+        score_fu = sum([i[1] for i in details])
+        details.append(('sum', score_fu))
         if score_fu % 10 == 0: score_fu -= 10
         score_fu = ((score_fu // 10)+1)*10
         score_fu = max(30, score_fu)
-
-        if debug: print('kiriage:{}'.format(score_fu))
-        return(score_fu)
+        return((score_fu, tuple(details)))
 
     def score_han(self, debug=False):
         """
@@ -860,44 +927,61 @@ class MahjongPlayer:
         score_fu : int
             手牌の翻数
         """
-        if self.is_yakuman():
-            if debug: print('yakuman')
-            return(13)
-        elif self.is_doubleyakuman():
-            if debug: print('doubleYakuman')
-            return(23)
-        elif self.is_tripleyakuman():
-            if debug: print('TripleYakuman')
-            return(30)
-        yaku_hans = {'riichi':1, 'ippatu':1, 'menzentumo':1, 'pinfu':1, 'tanyao':1, 'ipeikou':1, 'yakuhai':1,
-                     'rinsyankaihou':1, 'haitei':1, 'houtei':1, 'tyankan':1, 'doubleriichi':2, 'chanta':2,
-                     'ikkituukan':2, 'sansyokudouzyun':2, 'sansyokudoukou':2, 'sanankou':2, 'sankantu':2,
-                     'toitoi':2, 'chitoitu':2, 'zyuntyan':3, 'ryanpeikou':3, 'honitu':3, 'honroutou':2,
-                     'syousangen':2, 'chinitu':6}
-        yaku_hans_furoed = dict(yaku_hans.items())
-        yaku_hans_furoed['tyankan'] = 1
-        yaku_hans_furoed['ikkituukan'] = 1
-        yaku_hans_furoed['sansyokudouzyun'] = 1
-        yaku_hans_furoed['zyuntyan'] = 2
-        yaku_hans_furoed['honitu'] = 2
-        yaku_hans_furoed['chinitu'] = 5
-        score_han = 0
-        yakus = self.yakus()
-        if self.is_menzen():
-            for i in yakus:
-                score_han += yaku_hans[i]
-                if debug: print('{}:{}'.format(i,yaku_hans[i]))
-        else:
-            for i in yakus:
-                score_han += yaku_hans_furoed[i]
-                if debug: print('{}(kui):{}'.format(i,yaku_hans[i]))
+        evaluation = self.evaluate()
+        if debug:
+            if evaluation.yakuman_count in [1, 2, 3]:
+                print(['yakuman', 'doubleYakuman', 'TripleYakuman'][evaluation.yakuman_count-1])
+            else:
+                for i in evaluation.yakus:
+                    print('{}{}:{}'.format(i[0], '' if self.is_menzen() else '(kui)', i[1]))
+                print('dora:{}'.format(evaluation.doras))
+                print('akadora:{}'.format(evaluation.akadoras))
+                print('sum:{}'.format(evaluation.han))
+        return(evaluation.han)
+
+    def evaluate(self):
+        """
+        和了った手牌の役、翻、符、ドラ、点数をまとめて1回で求める。
+        結果はキャッシュされ、score_han、score_fu、score などはこの結果を参照する
+
+        Returns
+        -------
+        evaluation : mahjongpy.mahjongscore.Evaluation
+            変更できない名前付きタプル。
+            yakus : (役の名前, 翻数)のタプル(役満の役は13翻)
+            han : 翻数(ドラを含む。役満は13、ダブル役満は23、トリプル役満は30)
+            fu : 符数(切り上げ後)
+            fu_details : (符の内訳の名前, 符数)のタプル
+            doras : ドラ表示牌の次の牌の数
+            akadoras : 赤ドラの数
+            yakuman_count : 役満の役の数
+            limit : 'mangan'、'haneman'などの点数の区分。満貫未満ならNone
+            payout : mahjongpy.mahjongscore.payout の返り値(積み棒分を含む)。翻数が0ならNone
 
-        score_han += self.doras()
-        if debug: print('dora:{}'.format(self.displayed_doras()))
-        if debug: print('akadora:{}'.format(self.akadoras()))
+        Notes
+        -----
+        手牌、鳴き、リーチやツモなどの状態、場風、ドラ、本場のどれかが変わると計算し直す(state_keyを参照)
+        """
+        return(self._cached('evaluation', self._evaluate))
 
-        if debug: print('sum:{}'.format(score_han))
-        return(score_han)
+    def _evaluate(self):
+        yakus = self.yakus()
+        honba = 0 if self.table is None else self.table.honba
+        hans = self.YAKU_HANS if self.is_menzen() else self.YAKU_HANS_FUROED
+        yakuman_count = self._yakuman_count(yakus)
+        doras = self.displayed_doras()
+        akadoras = self.akadoras()
+        fu, fu_details = self._fu_details(self.decomposition_cache, yakus)
+        if yakuman_count in [1, 2, 3]:
+            han = [13, 23, 30][yakuman_count-1]
+        else:
+            han = sum([hans[i] for i in yakus]) + doras + akadoras
+        evaluation = mahjongscore.Evaluation(
+            yakus=tuple([(i, 13 if i in self.YAKUMANS else hans[i]) for i in yakus]), han=han, fu=fu,
+            fu_details=fu_details, doras=doras, akadoras=akadoras, yakuman_count=yakuman_count,
+            limit=mahjongscore.limit_name(han, fu, yakuman_count),
+            payout=mahjongscore.payout(han, fu, self.oya, self.is_tumo, honba) if han > 0 else None)
+        return(evaluation)
 
     def is_mangan(self):
         """
@@ -906,8 +990,8 @@ class MahjongPlayer:
         is_mangan : bool
             満貫かどうか
         """
-        fu = self.score_fu()
-        han = self.score_han()
+        evaluation = self.evaluate()
+        han, fu = evaluation.han, evaluation.fu
         return((han == 3 and fu > 69) or (han == 4 and fu > 39) or (han == 5))
 
     def is_haneman(self):
@@ -953,10 +1037,12 @@ class MahjongPlayer:
         count : int
             役満の役の数
         """
+        return(self.evaluate().yakuman_count)
+
+    def _yakuman_count(self, yakus):
         count = 0
-        for i in self.yakus():
-            if i in ['suankou', 'daisangen', 'kokushimusou', 'ryuisou', 'tuisou', 'chinroutou', 'sukantu',
-                     'syoususi', 'daisusi', 'tyurenboutou', 'chihou', 'tenhou']:
+        for i in yakus:
+            if i in self.YAKUMANS:
                 count += 1
         return(count)
 
@@ -994,23 +1080,8 @@ class MahjongPlayer:
         score : int
             ロンのときの獲得点数
         """
-        SCORE_OYA = [[0,0,1500,2000,2400,2900,3400,3900,4400,4800,5300],
-                     [2100,2400,2900,3900,4800,5800,6800,7700,8700,9600,10600],
-                     [3900,4800,5800,7700,9600,11600]+[12000]*5,
-                     [7800,9600,11600]+[12000]*8,
-                     [12000]]+[[18000]]*2+[[24000]]*3+[[36000]]*2+[[48000]]*9+[[96000]]*9+[[144000]]*9
-        SCORE_KO = [[0,0,1000,1300,1600,2000,2300,2600,2900,3200,3600],
-                    [1500,1600,2000,2600,3200,3900,4500,5200,5800,6400,7100],
-                    [2700,3200,3900,5200,6400,7700]+[8000]*5,
-                    [5200,6400,7700]+[8000]*8,
-                    [8000]]+[[12000]]*2+[[16000]]*3+[[24000]]*2+[[32000]]*9+[[64000]]*9+[[96000]]*9
-        fu_index = ([20,25] + [i*10 for i in range(3,12)]).index(self.score_fu())
-        if self.score_han() > 4:fu_index = 0
-        if self.oya:
-            score = SCORE_OYA[self.score_han()-1][fu_index]
-        else:
-            score = SCORE_KO[self.score_han()-1][fu_index]
-        return(score)
+        evaluation = self.evaluate()
+        return(mahjongscore.payout(evaluation.han, evaluation.fu, self.oya, False)[0])
 
     def score_without_tsumibo(self):
         """
@@ -1021,26 +1092,8 @@ class MahjongPlayer:
         """
         if not self.is_hora: raise RuntimeError('Not hora')
 
-        if self.score_without_tsumibo_cache != 0: return(self.score_without_tsumibo_cache)
-
-        score = self.score_ron()
-        if self.is_tumo:
-            if self.oya:
-                tmp = ((score//100)//3)*100
-                if (score//100) % 3 != 0:
-                    tmp += 100
-                score = tmp * 3
-            else:
-                tmp_oya = ((score//100)//2)*100
-                if (score//100) % 2 != 0:
-                    tmp_oya += 100
-                tmp_ko = ((score//100)//4)*100
-                if (score//100) % 4 != 0:
-                    tmp_ko += 100
-                score = tmp_oya + tmp_ko*2
-
-        self.score_without_tsumibo_cache = score
-        return(score)
+        evaluation = self.evaluate()
+        return(mahjongscore.payout(evaluation.han, evaluation.fu, self.oya, self.is_tumo)[3])
 
     def score(self):
         """
@@ -1049,11 +1102,19 @@ class MahjongPlayer:
         score : int
             手牌の点数(積み棒分を含む)
         """
-        if self.score_cache != 0: return(self.score_cache)
-        honba = 0 if self.table is None else self.table.honba
+        return(self.payout()[3])
 
-        self.score_cache = self.score_without_tsumibo() + honba*300
-        return(self.score_cache)
+    def payout(self):
+        """
+        Returns
+        -------
+        payout : tuple
+            (ロンのときに振り込んだ人が払う点数, ツモのときに親が払う点数, ツモのときに子1人が払う点数, 合計)。
+            すべて積み棒分を含む。evaluate().payout と同じ
+        """
+        payout = self.evaluate().payout
+        if payout is None: raise RuntimeError('No yaku')
+        return(payout)
 
     def payed_score(self):
         """
@@ -1063,26 +1124,11 @@ class MahjongPlayer:
             他家に払ってもらう手牌の点数のリスト。
             [ロンした時に振り込んだ人に払ってもらう点数, 親に払ってもらう点数, 子に払ってもらう点数]
         """
-        score = self.score_ron()
-        honba = 0 if self.table is None else self.table.honba
         if not self.is_hora: raise RuntimeError('Not hora')
         if self.is_ron: return([self.score(), 0, 0])
-        elif self.oya:
-            tmp = ((score//100)//3)*100
-            if (score//100) % 3 != 0:
-                tmp += 100
-            tmp += honba*100
-            return([0, 0, tmp])
-        else:
-            tmp_oya = ((score//100)//2)*100
-            if (score//100) % 2 != 0:
-                tmp_oya += 100
-            tmp_oya += honba*100
-            tmp_ko = ((score//100)//4)*100
-            if (score//100) % 4 != 0:
-                tmp_ko += 100
-            tmp_ko += honba*100
-            return([0, tmp_oya, tmp_ko])
+        evaluation = self.evaluate()
+        honba = 0 if self.table is None else self.table.honba
+        return([0] + list(mahjongscore.payout(evaluation.han, evaluation.fu, self.oya, True, honba)[1:3]))
 
     def is_menzen(self):
         """
@@ -1100,13 +1146,11 @@ class MahjongPlayer:
         is_wait_ryanmen : bool
             両面待ちかどうか
         """
-        tiles = []
-        if self.latest_tile.number is None: return(False)
-        if self.latest_tile.number > 2:
-            tiles.append(mahjongpy.MahjongTile(self.latest_tile.tile_type, self.latest_tile.number-2))
-        if self.latest_tile.number < 8:
-            tiles.append(mahjongpy.MahjongTile(self.latest_tile.tile_type, self.latest_tile.number+2))
-        return(any([(i in self.hands) for i in tiles]))
+        if self.latest_tile.number is None or self.latest_tile.index is None: return(False)
+        index = self.latest_tile.index
+        if self.latest_tile.number > 2 and self.hands.counts[index-2] > 0: return(True)
+        if self.latest_tile.number < 8 and self.hands.counts[index+2] > 0: return(True)
+        return(False)
 
     def is_wait_syabo(self):
         """
@@ -1115,7 +1159,22 @@ class MahjongPlayer:
         is_wait_syabo : bool
             シャボ待ちかどうか
         """
-        return(self.hands.count(self.latest_tile) == 3)
+        return(self.count(self.latest_tile) == 3)
+
+    def _is_wait_ryanmen(self, decomposition):
+        wait = decomposition[2]
+        if wait is None: return(self.is_wait_ryanmen())
+        index = self.latest_tile.index
+        if len(wait) == 2 or wait[0] == wait[1]: return(False)  # 単騎、シャボ
+        if index == wait[1]: return(False)  # 嵌張
+        if index == wait[0] and wait[0] % 9 == 6: return(False)  # 辺張(7)
+        if index == wait[2] and wait[0] % 9 == 0: return(False)  # 辺張(3)
+        return(True)
+
+    def _is_wait_syabo(self, decomposition):
+        wait = decomposition[2]
+        if wait is None: return(self.is_wait_syabo())
+        return(len(wait) == 3 and wait[0] == wait[1])
 
     def discard(self, tile):
         """
@@ -1131,7 +1190,8 @@ class MahjongPlayer:
             raise RuntimeError('does NOT have such tile')
         else:
             self.turn += 1
-            self.discards.append(self.hands.pop(self.hands.index(mahjongpy.MahjongTile(tile.tile_type,tile.number,akadora=tile.akadora))))
+            self.discards.append(self.hands.pop(self.hands.index(tile)))
+            if self.table is not None: self.table.emit('discard', self, [self.discards[-1]])
 
     def riichi(self):
         """
@@ -1144,14 +1204,16 @@ class MahjongPlayer:
             テンパイでないと鳴けない
         """
         if not self.is_menzen(): raise RuntimeError('Can Riichi ONLY when menzen')
-        if not self.is_tenpai(): raise RuntimeError('Can Riichi ONLY when tenpai')
+        if self.shanten() > 0: raise RuntimeError('Can Riichi ONLY when tenpai')
         if self.points < 1000: raise RuntimeError('Cannot Richii by lack of points')
-        if self.table is not None and len(self.table.tiles) < 4: raise RuntimeError('Cannot Riichi by lack of table tiles')
+        if self.table is not None and self.table.tiles_left() < 4: raise RuntimeError('Cannot Riichi by lack of table tiles')
         is_furoed = False if self.table is None else self.table.is_furoed
         if self.turn == 0 and not is_furoed: self.is_doubleriichi = True
         self.riichi_turn = self.turn
         self.is_riichi = True
-        if self.table is not None: self.table.ri_bou += 1
+        if self.table is not None:
+            self.table.ri_bou += 1
+            self.table.emit('riichi', self)
 
     def can_pon(self, tile):
         """
@@ -1165,7 +1227,7 @@ class MahjongPlayer:
         can_pon : bool
             ポンできるかどうか
         """
-        return(self.hands.count(tile) > 1)
+        return(self.count(tile) > 1)
 
     def can_chi(self, tile):
         """
@@ -1180,23 +1242,13 @@ class MahjongPlayer:
             チーできるかどうか
         """
         if tile.tile_type in self.TILE_TYPES[3:]: return(False)
+        counts = self.hands.counts
+        index = tile.index
         count = []
-        if tile.number > 2:
-            count.append(self.hands.count(mahjongpy.MahjongTile(tile.tile_type,tile.number-2)))
-        else:
-            count.append(0)
-        if tile.number > 1:
-            count.append(self.hands.count(mahjongpy.MahjongTile(tile.tile_type,tile.number-1)))
-        else:
-            count.append(0)
-        if tile.number < 9:
-            count.append(self.hands.count(mahjongpy.MahjongTile(tile.tile_type,tile.number+1)))
-        else:
-            count.append(0)
-        if tile.number < 8:
-            count.append(self.hands.count(mahjongpy.MahjongTile(tile.tile_type,tile.number+2)))
-        else:
-            count.append(0)
+        count.append(counts[index-2] if tile.number > 2 else 0)
+        count.append(counts[index-1] if tile.number > 1 else 0)
+        count.append(counts[index+1] if tile.number < 9 else 0)
+        count.append(counts[index+2] if tile.number < 8 else 0)
 
         judge = False
         for i in range(3):
@@ -1211,11 +1263,7 @@ class MahjongPlayer:
         can_ankan : bool
             暗槓できるかどうか
         """
-        count = []
-        for i in self.TILE_TYPES:
-            for j in range(1,10):
-                count.append(self.hands.count(mahjongpy.MahjongTile(i,j)))
-        return(count.count(4) > 0)
+        return(4 in self.hands.counts)
 
     def can_minkan(self, tile):
         """
@@ -1229,7 +1277,7 @@ class MahjongPlayer:
         can_minkan : bool
             明槓できるかどうか
         """
-        return(self.hands.count(tile) == 3)
+        return(self.count(tile) == 3)
 
     def can_kakan(self):
         """
@@ -1239,10 +1287,9 @@ class MahjongPlayer:
             加槓できるかどうか
         """
         judge = False
-        for i in self.hands:
-            for j in self.minkos:
-                if j[0] == i:
-                    judge = True
+        for i in self.minkos:
+            if self.count(i[0]) > 0:
+                judge = True
         return(judge)
 
     def can_ron(self, tile):
@@ -1257,7 +1304,12 @@ class MahjongPlayer:
         can_tumo : bool
             ツモできるかどうか
         """
-        return(mahjongpy.MahjongPlayer(hands=self.hands[:]+[tile],melds=self.melds[:]).is_hora())
+        if tile.index is None: return(False)
+        counts = self.hands.counts[:]
+        counts[tile.index] += 1
+        if mahjongpy.is_agari(counts): return(True)
+        if len(self.melds) > 0: return(False)
+        return(self._is_chitoitu_counts(counts) or self._is_kokushimusou_counts(counts))
 
     def kan(self, tile):
         """
@@ -1270,7 +1322,7 @@ class MahjongPlayer:
         """
         p = None
         players = [None] if self.table is None else self.table.players
-        count = self.hands.count(tile)
+        count = self.count(tile)
         if count != 4:
             for i in players:
                 if len(i.discards) != 0 and i.discards[-1] == tile:
@@ -1280,22 +1332,24 @@ class MahjongPlayer:
         tmp = []
         if p is None:  # 暗槓
             for _ in range(4):
-                tmp.append(self.hands.pop(self.hands.index(tile)))
+                tmp.append(self.hands.pop_index(tile.index))
             self.ankans.append(tmp)
             self.melds.append(tmp[:3])
-            self.table.draw(self)
+            self.table.emit('kan', self, tmp)
+            self.table.draw(self, rinsyan=True)
             if self.is_hora: self.is_rinsyankaihou = True
             self.table.add_kandora()
             #self.discard(SOME_TILE)
         else:
             for _ in range(3):  # 大明槓
-                tmp.append(self.hands.pop(self.hands.index(tile)))
+                tmp.append(self.hands.pop_index(tile.index))
             tmp.append(p.discards.pop(p.discards.index(tile)))
             index = 0 if self.table is None else {0:3,1:1,2:0}[self.table.players[1:].index(p)]
-            tmp[index].from_tacha = True
+            tmp[index] = tmp[index].as_from_tacha()
             self.minkans.append(tmp)
             self.melds.append(tmp[:3])
-            self.table.draw(self)
+            self.table.emit('kan', self, tmp, [self.table.players.index(p)])
+            self.table.draw(self, rinsyan=True)
             if self.is_hora:self.is_rinsyankaihou = True
             if self.table.kandora_sokumekuri:
                 self.table.add_kandora()
@@ -1314,7 +1368,7 @@ class MahjongPlayer:
         tile : MahjongTile
             カンする牌
         """
-        if tile not in self.hands: raise RuntimeError('You DON\'T have such tile')
+        if self.count(tile) == 0: raise RuntimeError('You DON\'T have such tile')
         flag = False
         index = None
         for i in range(len(self.minkos)):
@@ -1322,8 +1376,9 @@ class MahjongPlayer:
                 flag = True
                 index = i
         if not flag: raise RuntimeError('You DON\'T have such tile of minko')
-        tmp = self.hands.pop(self.hands.index(tile))
+        tmp = self.hands.pop_index(tile.index)
         self.minkans.append(self.minkos[i]+[tile])
+        if self.table is not None: self.table.emit('kakan', self, [tmp])
 
     def pon(self, tile):
         """
@@ -1340,17 +1395,18 @@ class MahjongPlayer:
             if len(i.discards) != 0:
                 if i.discards[-1] == tile:
                     p = i
-        count = self.hands.count(tile)
+        count = self.count(tile)
         if p is None: raise RuntimeError('Nobody discards such tile')
-        if count != 2: raise RuntimeError('You DON\'T have toitu of such tile')
+        if count < 2: raise RuntimeError('You DON\'T have toitu of such tile')
         tmp = []
         for _ in range(2):
-            tmp.append(self.hands.pop(self.hands.index(tile)))
+            tmp.append(self.hands.pop_index(tile.index))
         tmp.append(p.discards.pop(p.discards.index(tile)))
         index = 0 if self.table is None else {0:2,1:1,2:0}[self.table.players[1:].index(p)]
-        tmp[index].from_tacha = True
+        tmp[index] = tmp[index].as_from_tacha()
         self.melds.append(tmp)
         self.minkos.append(tmp)
+        if self.table is not None: self.table.emit('pon', self, tmp, [self.table.players.index(p)])
 
     def chi(self, tile):
         """
@@ -1381,8 +1437,9 @@ class MahjongPlayer:
             if i == tile:
                 tmp2.append(p.discards.pop(p.discards.index(i)))
             else:
-                tmp2.append(self.hands.pop(self.hands.index(i)))
+                tmp2.append(self.hands.pop_index(i.index))
         self.melds.append(tmp2)
+        if self.table is not None: self.table.emit('chi', self, tmp2, [self.table.players.index(p)])
 
     def ron(self, tile):
         """
@@ -1413,6 +1470,7 @@ class MahjongPlayer:
         if self.table is not None:
             self.table.furikomi_player = p
             self.table.win_player = self
+            self.table.emit('ron', self, [tile], [] if p is None else [self.table.players.index(p)])
             self.table.calculate_score()
 
     def tumo(self):
@@ -1427,11 +1485,83 @@ class MahjongPlayer:
             self.is_tumo = True
             if self.table is not None:
                 self.table.win_player = self
+                self.table.emit('tumo', self, [] if self.latest_tile.id is None else [self.latest_tile])
                 self.table.calculate_score()
             if self.riichi and self.table is not None:
                 for i in range(len(self.table.dora_tiles)):
                     self.table.add_kandora(ura=True)
 
+    def snapshot(self):
+        """
+        プレイヤーの状態を、牌を1枚1バイト(MahjongTile.code)にしたタプルとして保存する
+
+        Returns
+        -------
+        state : tuple
+            restoreに渡すと今の状態に戻せるタプル。手牌、河、鳴いた面子、持ち点、巡目、リーチなどのフラグを含む
+        """
+        return((bytes([i.code for i in self.hands]), bytes([i.code for i in self.discards]),
+                tuple([bytes([j.code for j in i]) for i in self.melds]),
+                tuple([bytes([j.code for j in i]) for i in self.ankans]),
+                tuple([bytes([j.code for j in i]) for i in self.minkans]),
+                tuple([bytes([j.code for j in i]) for i in self.minkos]),
+                self.latest_tile.code, self.points, self.turn, self.riichi_turn, self.oya, self.wind, self.is_riichi,
+                self.is_doubleriichi, self.is_rinsyankaihou, self.is_tumo, self.is_ron))
+
+    def restore(self, state):
+        """
+        snapshotで保存した状態に戻す
+
+        Parameters
+        ----------
+        state : tuple
+            snapshotの返り値
+        """
+        codes = mahjongpy.MahjongTile.CODES
+        (hands, discards, melds, ankans, minkans, minkos, latest_tile, self.points, self.turn, self.riichi_turn,
+         self.oya, self.wind, self.is_riichi, self.is_doubleriichi, self.is_rinsyankaihou, self.is_tumo,
+         self.is_ron) = state
+        self.hands = [codes[i] for i in hands]
+        self.discards = [codes[i] for i in discards]
+        self.melds = [[codes[j] for j in i] for i in melds]
+        self.ankans = [[codes[j] for j in i] for i in ankans]
+        self.minkans = [[codes[j] for j in i] for i in minkans]
+        self.minkos = [[codes[j] for j in i] for i in minkos]
+        self.latest_tile = codes[latest_tile]
+
+    def reset(self, hands, oya=False, wind='ton'):
+        """
+        次の局のために、持ち点と卓以外の状態を配牌直後に戻す。手牌などのリストは作り直さずに中身を入れ替える
+
+        Parameters
+        ----------
+        hands : list
+            配牌(MahjongTileのリスト)
+        oya : bool
+            親かどうか
+        wind : str
+            自風
+        """
+        self.hands.clear()
+        self.hands.extend(hands)
+        self.discards.clear()
+        self.melds.clear()
+        self.ankans.clear()
+        self.minkans.clear()
+        self.minkos.clear()
+        self.oya = oya
+        self.wind = wind
+        self.latest_tile = self.KYOMU_TILE
+        self.is_riichi = False
+        self.turn = 0
+        self.riichi_turn = 100
+        self.is_tumo = False
+        self.is_ron = False
+        self.is_doubleriichi = False
+        self.is_rinsyankaihou = False
+        self.clear_cache()
+        self.sort()
+
     def next_player(self):
         """
         Returns
@@ -0,0 +1,166 @@
+"""
+牌譜(局の出来事の記録)のバイナリ形式
+
+MahjongTable と MahjongPlayer の操作(配牌、ツモ、打牌、リーチ、鳴き、和了、流局、点数の移動)は
+(出来事の名前, 席, 牌のIDのタプル, 整数のタプル)のタプルとして MahjongTable.events に記録される。
+ツモ和了('tumo')の牌は和了牌で、引いた牌のない和了(天和など)では牌を含まない。
+この記録を1つずつ長さ付きのバイト列にして書き出し、ファイル全体を読み込まずに先頭から順に読み出す。
+
+1つの出来事のバイト列は次のとおり(整数はリトルエンディアン)。
+    長さ(2バイト、以降のバイト数) 種類(1バイト) 席(1バイト、なしは255) 牌の数(1バイト) 牌のID(1枚1バイト) 整数(1つ4バイト)
+ファイルの先頭には MAGIC が置かれる。
+"""
+import struct
+
+MAGIC = b'MJR\x01'
+EVENTS = ['start', 'deal', 'draw', 'discard', 'riichi', 'pon', 'chi', 'kan', 'kakan', 'dora', 'ron', 'tumo',
+          'ryukyoku', 'score']
+EVENT_IDS = {j: i for i, j in enumerate(EVENTS)}
+NO_SEAT = 255
+HEADER = struct.Struct('<HBBB')
+
+
+def encode(event):
+    """
+    出来事をバイト列にする
+
+    Parameters
+    ----------
+    event : tuple
+        (出来事の名前, 席(0～3またはNone), 牌のIDのタプル, 整数のタプル)
+
+    Returns
+    -------
+    data : bytes
+        長さを先頭に付けたバイト列
+    """
+    name, seat, tiles, values = event
+    body = bytes(tiles) + struct.pack('<%di' % len(values), *values)
+    return(HEADER.pack(3 + len(body), EVENT_IDS[name], NO_SEAT if seat is None else seat, len(tiles)) + body)
+
+
+def decode(data, offset=0):
+    """
+    バイト列から出来事を1つ取り出す
+
+    Parameters
+    ----------
+    data : bytes
+        encodeで作ったバイト列(を含むバイト列)
+    offset : int
+        出来事の先頭の位置
+
+    Returns
+    -------
+    event : tuple
+        (出来事の名前, 席, 牌のIDのタプル, 整数のタプル)
+    """
+    length, kind, seat, count = HEADER.unpack_from(data, offset)
+    start = offset + HEADER.size
+    values = struct.unpack_from('<%di' % ((length - 3 - count) // 4), data, start + count)
+    return((EVENTS[kind], None if seat == NO_SEAT else seat, tuple(data[start:start+count]), values))
+
+
+class RecordWriter:
+    """
+    牌譜をファイルに書き出すクラス
+
+    Attributes
+    ----------
+    file : file object
+        書き出し先(バイナリモードで開いたファイル)
+    count : int
+        書き出した出来事の数
+    """
+
+    def __init__(self, file, header=True):
+        self.file = file
+        self.count = 0
+        if header: file.write(MAGIC)
+
+    def write(self, event):
+        """
+        出来事を1つ書き出す
+
+        Parameters
+        ----------
+        event : tuple
+            (出来事の名前, 席, 牌のIDのタプル, 整数のタプル)
+        """
+        self.file.write(encode(event))
+        self.count += 1
+
+    def write_round(self, table):
+        """
+        卓に記録された1局分の出来事をまとめて書き出す
+
+        Parameters
+        ----------
+        table : MahjongTable
+            局の終わった卓
+        """
+        self.file.write(b''.join([encode(i) for i in table.events]))
+        self.count += len(table.events)
+
+
+def read_events(file, chunk_size=1 << 20):
+    """
+    牌譜のファイルから出来事を順に読み出す
+
+    Parameters
+    ----------
+    file : file object
+        RecordWriterで書き出したファイル(バイナリモード)
+    chunk_size : int
+        一度に読み込むバイト数
+
+    Yields
+    ------
+    event : tuple
+        (出来事の名前, 席, 牌のIDのタプル, 整数のタプル)
+
+    Raises
+    ------
+    ValueError
+        牌譜のファイルでない、またはファイルが途中で切れている
+    """
+    if file.read(len(MAGIC)) != MAGIC: raise ValueError('not a mahjongpy record file')
+    buffer = b''
+    offset = 0
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            if offset != len(buffer): raise ValueError('truncated record file')
+            return
+        buffer = buffer[offset:] + chunk
+        offset = 0
+        while offset + 2 <= len(buffer):
+            end = offset + 2 + (buffer[offset] | buffer[offset+1] << 8)
+            if end > len(buffer): break
+            yield(decode(buffer, offset))
+            offset = end
+
+
+def read_rounds(file, chunk_size=1 << 20):
+    """
+    牌譜のファイルから1局分ずつ出来事を読み出す
+
+    Parameters
+    ----------
+    file : file object
+        RecordWriterで書き出したファイル(バイナリモード)
+    chunk_size : int
+        一度に読み込むバイト数
+
+    Yields
+    ------
+    events : list of tuple
+        'start'から始まる1局分の出来事のリスト
+    """
+    events = []
+    for i in read_events(file, chunk_size):
+        if i[0] == 'start' and events:
+            yield(events)
+            events = []
+        events.append(i)
+    if events: yield(events)
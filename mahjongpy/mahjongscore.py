@@ -0,0 +1,120 @@
+"""
+点数の表
+
+翻数、符数、親かどうか、ツモかどうか、本場の組み合わせごとに、支払われる点数をあらかじめ求めて表にしておく。
+ロンのときの支払い、ツモのときの親と子それぞれの支払い、合計を1回の表の参照で得られる。
+"""
+import collections
+
+SCORE_OYA = [[0,0,1500,2000,2400,2900,3400,3900,4400,4800,5300],
+             [2100,2400,2900,3900,4800,5800,6800,7700,8700,9600,10600],
+             [3900,4800,5800,7700,9600,11600]+[12000]*5,
+             [7800,9600,11600]+[12000]*8,
+             [12000]]+[[18000]]*2+[[24000]]*3+[[36000]]*2+[[48000]]*9+[[96000]]*9+[[144000]]*9
+SCORE_KO = [[0,0,1000,1300,1600,2000,2300,2600,2900,3200,3600],
+            [1500,1600,2000,2600,3200,3900,4500,5200,5800,6400,7100],
+            [2700,3200,3900,5200,6400,7700]+[8000]*5,
+            [5200,6400,7700]+[8000]*8,
+            [8000]]+[[12000]]*2+[[16000]]*3+[[24000]]*2+[[32000]]*9+[[64000]]*9+[[96000]]*9
+FUS = [20, 25] + [i*10 for i in range(3, 12)]
+LIMITS = [(13, 'kazoeyakuman'), (11, 'sanbaiman'), (8, 'baiman'), (6, 'haneman'), (5, 'mangan')]
+YAKUMAN_LIMITS = ['yakuman', 'doubleyakuman', 'tripleyakuman']
+PAYOUT_TABLE = {}  # (翻数, 符数, 親かどうか, ツモかどうか, 本場) -> (ロンの支払い, 親の支払い, 子の支払い, 合計)
+
+Evaluation = collections.namedtuple('Evaluation', ['yakus', 'han', 'fu', 'fu_details', 'doras', 'akadoras',
+                                                   'yakuman_count', 'limit', 'payout'])
+
+
+def _share(score, n):
+    return(-(-score // (n*100)) * 100)
+
+
+def _payout(han, fu, oya, tumo, honba):
+    score = (SCORE_OYA if oya else SCORE_KO)[han-1][0 if han > 4 else FUS.index(fu)]
+    if not tumo: return((score + honba*300, 0, 0, score + honba*300))
+    if oya:
+        ko = _share(score, 3) + honba*100
+        return((0, 0, ko, ko*3))
+    oya_payment = _share(score, 2) + honba*100
+    ko = _share(score, 4) + honba*100
+    return((0, oya_payment, ko, oya_payment + ko*2))
+
+
+def payout(han, fu, oya, tumo, honba=0):
+    """
+    和了ったときに支払われる点数を求める
+
+    Parameters
+    ----------
+    han : int
+        翻数(1～39。役満は13、ダブル役満は23、トリプル役満は30)
+    fu : int
+        符数(20, 25, 30, ..., 110)。5翻以上では使わない
+    oya : bool
+        和了ったプレイヤーが親かどうか
+    tumo : bool
+        ツモ和了かどうか
+    honba : int
+        本場
+
+    Returns
+    -------
+    payout : tuple
+        (ロンのときに振り込んだ人が払う点数, ツモのときに親が払う点数, ツモのときに子1人が払う点数, 合計)。
+        すべて積み棒分を含む
+
+    Raises
+    ------
+    ValueError
+        翻数または符数が表にない
+
+    Examples
+    --------
+    >>> mahjongpy.mahjongscore.payout(3, 60, True, False)
+    (11600, 0, 0, 11600)
+    >>> mahjongpy.mahjongscore.payout(1, 30, False, True, 1)
+    (0, 600, 400, 1400)
+    """
+    key = (han, 0 if han > 4 else fu, oya, tumo, honba)
+    if key in PAYOUT_TABLE: return(PAYOUT_TABLE[key])
+    if not 1 <= han <= len(SCORE_KO) or (han <= 4 and fu not in FUS): raise ValueError('no such han and fu')
+    PAYOUT_TABLE[key] = _payout(key[0], key[1], oya, tumo, honba)
+    return(PAYOUT_TABLE[key])
+
+
+def limit_name(han, fu, yakuman_count=0):
+    """
+    満貫以上の点数の区分の名前を返す
+
+    Parameters
+    ----------
+    han : int
+        翻数
+    fu : int
+        符数
+    yakuman_count : int
+        役満の役の数
+
+    Returns
+    -------
+    name : str
+        'mangan', 'haneman', 'baiman', 'sanbaiman', 'kazoeyakuman', 'yakuman', 'doubleyakuman', 'tripleyakuman'
+        のいずれか。満貫未満ならNone
+    """
+    if yakuman_count > 0: return(YAKUMAN_LIMITS[min(yakuman_count, 3)-1])
+    for i, j in LIMITS:
+        if han >= i: return(j)
+    if (han == 4 and fu >= 40) or (han == 3 and fu >= 70): return('mangan')
+    return(None)
+
+
+def _build_table(honbas=9):
+    for han in range(1, len(SCORE_KO)+1):
+        for fu in (FUS if han <= 4 else [0]):
+            for oya in [False, True]:
+                for tumo in [False, True]:
+                    for honba in range(honbas):
+                        PAYOUT_TABLE[(han, fu, oya, tumo, honba)] = _payout(han, fu, oya, tumo, honba)
+
+
+_build_table()
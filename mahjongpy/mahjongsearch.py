@@ -0,0 +1,190 @@
+"""
+モンテカルロ法による打牌の評価
+
+プレイヤーから見えない牌(他家の手牌と牌山)を、見えている牌と矛盾しないように何通りも配り直し(決定化)、
+それぞれについて局の終わりまで簡単な打ち方で打って(ロールアウト)、捨てる牌ごとの得点の期待値を求める。
+ロールアウトは MahjongPlayer を使わず、4人の34種の牌の枚数と牌山の通し番号のリストだけで行う。
+
+ロールアウトでは全員がシャンテン数の最も小さくなる牌を捨て、リーチや鳴きはしない。
+和了ったときの翻数と符数は mahjongpy.mahjongbatch と同じく、ドラ表示牌と場風はないものとして求め、
+支払いは本場を含めて mahjongpy.mahjongscore.payout の表から引く。
+"""
+import concurrent.futures
+import random
+import time
+
+from . import mahjongbatch
+from . import mahjongscore
+from . import mahjongshanten
+
+
+def view(player):
+    """
+    プレイヤーから見た卓の状態を、ロールアウトに使う軽い形にする
+
+    Parameters
+    ----------
+    player : MahjongPlayer
+        打牌を選ぶプレイヤー(卓に着いていて、ツモ後の手牌を持っている)
+
+    Returns
+    -------
+    view : tuple
+        (自分の手牌の枚数, 自分の席, 親の席, 4人の手牌の枚数, 見えていない牌の枚数, 残りの牌の枚数,
+        4人の鳴いた面子, 本場)。鳴いた面子は席ごとの(melds, ankans, minkans, minkos)で、面子は牌のIDのタプル
+    """
+    table = player.table
+    melds = tuple([tuple([tuple([tuple([k.id for k in j]) for j in i])
+                          for i in (p.melds, p.ankans, p.minkans, p.minkos)]) for p in table.players])
+    return((tuple(player.hands.counts), table.players.index(player), table.oya_player - 1,
+            tuple([len(i.hands) for i in table.players]), tuple(player.unseen_counts()), table.tiles_left(), melds,
+            table.honba))
+
+
+def _payout(counts, tile, oya, is_tumo, melds, honba, memo):
+    # 和了形の支払い(mahjongscore.payoutの返り値)。役がなければNone
+    key = (tuple(counts), tile, oya, is_tumo, melds)
+    if key not in memo: memo[key] = mahjongbatch._score_hand(counts, tile, oya, is_tumo, melds)[:2]
+    han, fu = memo[key]
+    if han == 0: return(None)
+    return(mahjongscore.payout(han, fu, oya, is_tumo, honba))
+
+
+def _discard(counts, rng):
+    shantens = mahjongshanten.discards(counts)
+    best = min(shantens.values())
+    candidates = [i for i in shantens if shantens[i] == best]
+    return(candidates[rng.randrange(len(candidates))], best)
+
+
+def rollout(state, discard, rng, memo=None):
+    """
+    見えない牌を配り直し、discardを捨ててから局の終わりまで打つ
+
+    Parameters
+    ----------
+    state : tuple
+        viewの返り値
+    discard : int
+        捨てる牌の通し番号
+    rng : random.Random
+        配り直しと打牌の乱数
+    memo : dict
+        和了形ごとの翻数と符数のキャッシュ
+
+    Returns
+    -------
+    value : int
+        自分の点数の増減。和了れば+点数、放銃すれば-点数、他家のツモ和了なら自分の支払う点数を引く(本場を含む)
+    """
+    counts, seat, oya, sizes, unseen, tiles_left, melds, honba = state
+    memo = {} if memo is None else memo
+    pool = [i for i in range(34) for _ in range(unseen[i])]
+    rng.shuffle(pool)
+    hands = []
+    position = 0
+    for i in range(4):
+        if i == seat:
+            hands.append(list(counts))
+            hands[i][discard] -= 1
+        else:
+            hand = [0]*34
+            for j in pool[position:position+sizes[i]]:
+                hand[j] += 1
+            hands.append(hand)
+            position += sizes[i]
+    wall = pool[position:position+tiles_left]
+    tenpai = [mahjongshanten.shanten(i) == 0 for i in hands]
+    tile = discard
+    current = seat
+    while True:
+        for i in range(1, 4):
+            other = (current + i) % 4
+            if not tenpai[other]: continue
+            hand = hands[other]
+            hand[tile] += 1
+            payout = _payout(hand, tile, other == oya, False, melds[other], honba, memo) \
+                if mahjongshanten.shanten(hand) == -1 else None
+            hand[tile] -= 1
+            if payout is not None:
+                if other == seat: return(payout[0])
+                return(-payout[0] if current == seat else 0)
+        if len(wall) == 0: return(0)
+        current = (current + 1) % 4
+        tile = wall.pop()
+        hand = hands[current]
+        hand[tile] += 1
+        if tenpai[current] and mahjongshanten.shanten(hand) == -1:
+            payout = _payout(hand, tile, current == oya, True, melds[current], honba, memo)
+            if payout is not None:
+                if current == seat: return(payout[3])
+                return(-(payout[1] if seat == oya else payout[2]))
+        tile, count = _discard(hand, rng)
+        hand[tile] -= 1
+        tenpai[current] = count == 0
+
+
+def _search(args):
+    state, candidates, seed, rollouts, time_limit = args
+    rng = random.Random(seed)
+    memo = {}
+    totals = dict.fromkeys(candidates, 0)
+    count = 0
+    start = time.perf_counter()
+    while (rollouts is None or count < rollouts) and (time_limit is None or time.perf_counter() - start < time_limit):
+        sample = rng.getrandbits(32)
+        for i in candidates:
+            totals[i] += rollout(state, i, random.Random(sample), memo)
+        count += 1
+    return(totals, count)
+
+
+def evaluate_discards(player, rollouts=100, time_limit=None, seed=None, max_workers=1):
+    """
+    捨てる牌ごとに、ロールアウトで得点の期待値を求める
+
+    Parameters
+    ----------
+    player : MahjongPlayer
+        打牌を選ぶプレイヤー(卓に着いていて、ツモ後の手牌を持っている)
+    rollouts : int
+        捨てる牌1つあたりのロールアウトの回数。Noneなら時間の上限まで続ける
+    time_limit : float
+        計算時間の上限(秒)。Noneなら回数だけで決める
+    seed : int
+        乱数の種
+    max_workers : int
+        プロセス数。1の場合はプロセスを作らずにこのプロセスで計算する
+
+    Returns
+    -------
+    evaluations : list of dict
+        捨てる牌ごとの辞書のリスト。期待値の大きい順に並ぶ。
+        tile : 捨てる牌(MahjongTile)
+        value : 得点の増減の平均
+        rollouts : ロールアウトの回数
+
+    Notes
+    -----
+    同じ配り直しをすべての捨てる牌で共有して比べるため、回数が少なくても順位のばらつきが小さい。
+    赤ドラは区別せず、同じ種類の牌は1つの候補として扱う
+    """
+    if rollouts is None and time_limit is None: raise ValueError('rollouts or time_limit is required')
+    state = view(player)
+    candidates = [i for i in range(34) if state[0][i] > 0]
+    seeds = random.Random(seed)
+    if max_workers == 1:
+        results = [_search((state, candidates, seeds.getrandbits(32), rollouts, time_limit))]
+    else:
+        shares = [None]*max_workers if rollouts is None else \
+                 [rollouts // max_workers + (1 if i < rollouts % max_workers else 0) for i in range(max_workers)]
+        tasks = [(state, candidates, seeds.getrandbits(32), i, time_limit) for i in shares if i != 0]
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_search, tasks))
+    count = sum([i[1] for i in results])
+    evaluations = []
+    for i in candidates:
+        tile = [j for j in player.hands if j.index == i][0]
+        evaluations.append({'tile': tile, 'value': sum([j[0][i] for j in results]) / max(1, count), 'rollouts': count})
+    evaluations.sort(key=lambda x: -x['value'])
+    return(evaluations)
@@ -0,0 +1,400 @@
+"""
+シャンテン数の計算
+
+34種の牌の枚数(MahjongTile.indexを添字とするリスト)からシャンテン数を求める。
+萬子、索子、筒子、字牌の各グループごとに、9桁(字牌は7桁)の枚数の並びをキーとして
+面子数、搭子数、雀頭の有無の組み合わせ(部分解)を表に持ち、それを組み合わせて計算する。
+表は初めて出てきた並びのときに作られ、以降は使い回される。
+"""
+
+SUIT_TABLE = {}  # 数牌の枚数の並び -> (部分解のID, 枚数, 種類数, 対子数, 么九牌の種類数, 么九牌の対子数)
+ZIHAI_TABLE = {}  # 字牌の枚数の並び -> 同上
+SUFFIX_TABLE = {}
+ZIHAI_SUFFIX_TABLE = {}
+PARTIALS = []  # 部分解のID -> 部分解
+PARTIAL_IDS = {}
+NORMAL_TABLE = {}  # 4グループの部分解のIDと鳴いた面子の数 -> 一般形のシャンテン数
+NEIGHBOR_TABLE = {}  # (グループ内の枚数の並び, 順子を作れるか, 増減) -> 1枚増減させた後の(位置, 表の行)のタプル
+
+
+def _prune(results):
+    pruned = []
+    for m, t, p in results:
+        if not any([m2 >= m and t2 >= t and p2 >= p and (m2, t2, p2) != (m, t, p) for m2, t2, p2 in results]):
+            pruned.append((m, t, p))
+    return(tuple(pruned))
+
+
+def _search(key, runs, memo):
+    i = 0
+    while i < len(key) and key[i] == 0:
+        i += 1
+    if i == len(key): return(((0, 0, 0),))
+    key = key[i:]
+    if key in memo: return(memo[key])
+    results = set()
+
+    def add(rest, m, t, p):
+        for m2, t2, p2 in _search(tuple(rest), runs, memo):
+            if p + p2 < 2: results.add((m+m2, t+t2, p+p2))
+
+    c = list(key)
+    if c[0] >= 3:
+        add([c[0]-3]+c[1:], 1, 0, 0)
+    if runs and len(c) > 2 and c[1] > 0 and c[2] > 0:
+        add([c[0]-1, c[1]-1, c[2]-1]+c[3:], 1, 0, 0)
+    if c[0] >= 2:
+        add([c[0]-2]+c[1:], 0, 1, 0)
+        add([c[0]-2]+c[1:], 0, 0, 1)
+    if runs and len(c) > 1 and c[1] > 0:
+        add([c[0]-1, c[1]-1]+c[2:], 0, 1, 0)
+    if runs and len(c) > 2 and c[2] > 0:
+        add([c[0]-1, c[1], c[2]-1]+c[3:], 0, 1, 0)
+    add([c[0]-1]+c[1:], 0, 0, 0)
+    memo[key] = _prune(results)
+    return(memo[key])
+
+
+def partials(key, runs=True):
+    """
+    1グループ分の部分解を求める
+
+    Parameters
+    ----------
+    key : tuple of int
+        グループ内の牌の枚数の並び(数牌は9個、字牌は7個)
+    runs : bool
+        順子、両面、嵌張などの並びを作れるかどうか(字牌はFalse)
+
+    Returns
+    -------
+    partials : tuple
+        (面子数, 搭子数, 雀頭の有無)のタプルのうち、他に劣らないものだけを集めたタプル
+    """
+    return(PARTIALS[_group(key, runs)[0]])
+
+
+def _group(key, runs):
+    table = SUIT_TABLE if runs else ZIHAI_TABLE
+    if key in table: return(table[key])
+    results = []
+    for m, t, p in _search(key, runs, SUFFIX_TABLE if runs else ZIHAI_SUFFIX_TABLE):
+        results.append((m, min(t, 4-m) if m <= 4 else 0, p))
+    pruned = tuple(sorted(_prune(set(results))))
+    if pruned not in PARTIAL_IDS:
+        PARTIAL_IDS[pruned] = len(PARTIALS)
+        PARTIALS.append(pruned)
+    yaochu = [key[0], key[8]] if runs else key
+    table[key] = (PARTIAL_IDS[pruned], sum(key), len([i for i in key if i > 0]), len([i for i in key if i > 1]),
+                  len([i for i in yaochu if i > 0]), len([i for i in yaochu if i > 1]))
+    return(table[key])
+
+
+def _merge(groups, melds):
+    states = {(melds, 0): 0}
+    for group in groups:
+        if group == ((0, 0, 0),): continue
+        merged = {}
+        for (m, p), t in states.items():
+            for m2, t2, p2 in group:
+                if p + p2 > 1: continue
+                key = (m+m2, p+p2)
+                if merged.get(key, -1) < t+t2: merged[key] = t+t2
+        states = merged
+    best = 0
+    for (m, p), t in states.items():
+        if m > 4: m, t = 4, 0
+        value = 2*m + min(t, 4-m) + p
+        if value > best: best = value
+    return(8 - best)
+
+
+def group(counts, i):
+    """
+    1グループ分の表の行を求める
+
+    Parameters
+    ----------
+    counts : list of int
+        34種の牌の枚数(手牌のみ)
+    i : int
+        グループの番号。萬子:0　索子:1　筒子:2　字牌:3(MahjongTile.index // 9)
+
+    Returns
+    -------
+    row : tuple
+        (部分解のID, 枚数, 種類数, 対子数, 么九牌の種類数, 么九牌の対子数)
+    """
+    key = tuple(counts[i*9:i*9+(7 if i == 3 else 9)])
+    table = ZIHAI_TABLE if i == 3 else SUIT_TABLE
+    return(table[key] if key in table else _group(key, i != 3))
+
+
+def _neighbors(key, runs, delta):
+    if (key, runs, delta) in NEIGHBOR_TABLE: return(NEIGHBOR_TABLE[(key, runs, delta)])
+    results = []
+    tmp = list(key)
+    for i in range(len(tmp)):
+        if tmp[i] + delta < 0 or tmp[i] + delta > 4: continue
+        tmp[i] += delta
+        results.append((i, _group(tuple(tmp), runs)))
+        tmp[i] -= delta
+    NEIGHBOR_TABLE[(key, runs, delta)] = tuple(results)
+    return(NEIGHBOR_TABLE[(key, runs, delta)])
+
+
+def _groups(counts):
+    key = tuple(counts[0:9])
+    a = SUIT_TABLE[key] if key in SUIT_TABLE else _group(key, True)
+    key = tuple(counts[9:18])
+    b = SUIT_TABLE[key] if key in SUIT_TABLE else _group(key, True)
+    key = tuple(counts[18:27])
+    c = SUIT_TABLE[key] if key in SUIT_TABLE else _group(key, True)
+    key = tuple(counts[27:34])
+    d = ZIHAI_TABLE[key] if key in ZIHAI_TABLE else _group(key, False)
+    return(a, b, c, d)
+
+
+def _normal(a, b, c, d, melds):
+    key = a[0] | b[0] << 12 | c[0] << 24 | d[0] << 36 | melds << 48
+    if key in NORMAL_TABLE: return(NORMAL_TABLE[key])
+    NORMAL_TABLE[key] = _merge([PARTIALS[a[0]], PARTIALS[b[0]], PARTIALS[c[0]], PARTIALS[d[0]]], melds)
+    return(NORMAL_TABLE[key])
+
+
+def shanten_normal(counts, melds=None):
+    """
+    4面子1雀頭の形に対するシャンテン数
+
+    Parameters
+    ----------
+    counts : list of int
+        34種の牌の枚数(手牌のみ)
+    melds : int
+        鳴いた面子の数。省略した場合は手牌の枚数から求める
+
+    Returns
+    -------
+    shanten : int
+        シャンテン数。和了形なら-1
+    """
+    a, b, c, d = _groups(counts)
+    if melds is None: melds = (14 - a[1] - b[1] - c[1] - d[1]) // 3
+    return(_normal(a, b, c, d, melds))
+
+
+def shanten_chitoitu(counts):
+    """
+    七対子に対するシャンテン数
+
+    Parameters
+    ----------
+    counts : list of int
+        34種の牌の枚数(手牌のみ)
+
+    Returns
+    -------
+    shanten : int
+        シャンテン数
+    """
+    a, b, c, d = _groups(counts)
+    return(6 - (a[3]+b[3]+c[3]+d[3]) + max(0, 7 - (a[2]+b[2]+c[2]+d[2])))
+
+
+def shanten_kokushimusou(counts):
+    """
+    国士無双に対するシャンテン数
+
+    Parameters
+    ----------
+    counts : list of int
+        34種の牌の枚数(手牌のみ)
+
+    Returns
+    -------
+    shanten : int
+        シャンテン数
+    """
+    a, b, c, d = _groups(counts)
+    return(13 - (a[4]+b[4]+c[4]+d[4]) - (1 if a[5]+b[5]+c[5]+d[5] > 0 else 0))
+
+
+def shanten(counts):
+    """
+    手牌のシャンテン数を計算する。一般形、七対子、国士無双のうち最も小さいものを返す
+
+    Parameters
+    ----------
+    counts : list of int
+        34種の牌の枚数(MahjongTile.indexを添字とする手牌の枚数)。
+        鳴いている場合は手牌のみの枚数を渡す(鳴いた面子の数は枚数から求める)
+
+    Returns
+    -------
+    shanten : int
+        シャンテン数。テンパイで0、和了形で-1
+
+    Examples
+    --------
+    >>> mahjongpy.shanten(mahjongpy.MahjongHands(mahjongpy.MahjongTile.make_hands_set('22345', '567', '123567')).counts)
+    -1
+    """
+    return(_shanten(*_groups(counts)))
+
+
+def shanten_groups(groups):
+    """
+    4グループ分の表の行からシャンテン数を計算する
+
+    Parameters
+    ----------
+    groups : list of tuple
+        萬子、索子、筒子、字牌の順の表の行(group を参照)
+
+    Returns
+    -------
+    shanten : int
+        シャンテン数。テンパイで0、和了形で-1
+    """
+    return(_shanten(*groups))
+
+
+def _shanten(a, b, c, d):
+    tiles = a[1] + b[1] + c[1] + d[1]
+    key = a[0] | b[0] << 12 | c[0] << 24 | d[0] << 36 | (14 - tiles) // 3 << 48
+    count = NORMAL_TABLE[key] if key in NORMAL_TABLE else _normal(a, b, c, d, (14 - tiles) // 3)
+    if tiles < 13 or count < 0: return(count)
+    chitoitu = 6 - (a[3]+b[3]+c[3]+d[3])
+    kinds = a[2]+b[2]+c[2]+d[2]
+    if kinds < 7: chitoitu += 7 - kinds
+    if chitoitu < count: count = chitoitu
+    kokushimusou = 13 - (a[4]+b[4]+c[4]+d[4])
+    if kokushimusou <= count:
+        if a[5]+b[5]+c[5]+d[5] > 0: kokushimusou -= 1
+        if kokushimusou < count: count = kokushimusou
+    return(count)
+
+
+def _improving(groups, i, rows, count):
+    rest = 0
+    tiles = kinds = pairs = yaochu_kinds = yaochu_pairs = 0
+    for j in range(4):
+        if j == i: continue
+        row = groups[j]
+        rest |= row[0] << 12*j
+        tiles += row[1]
+        kinds += row[2]
+        pairs += row[3]
+        yaochu_kinds += row[4]
+        yaochu_pairs += row[5]
+    results = []
+    for j, row in rows:
+        n = tiles + row[1]
+        key = rest | row[0] << 12*i | (14 - n) // 3 << 48
+        if key not in NORMAL_TABLE:
+            tmp = list(groups)
+            tmp[i] = row
+            _normal(tmp[0], tmp[1], tmp[2], tmp[3], (14 - n) // 3)
+        if NORMAL_TABLE[key] < count:
+            results.append(j)
+        elif n >= 13:
+            chitoitu = 6 - pairs - row[3] + max(0, 7 - kinds - row[2])
+            kokushimusou = 13 - yaochu_kinds - row[4] - (1 if yaochu_pairs + row[5] > 0 else 0)
+            if chitoitu < count or kokushimusou < count: results.append(j)
+    return(results)
+
+
+def ukeire(counts, groups=None):
+    """
+    引くとシャンテン数が下がる牌を求める
+
+    Parameters
+    ----------
+    counts : list of int
+        34種の牌の枚数(手牌のみ)。13枚(鳴いている場合は3n+1枚)の手牌を想定
+    groups : list of tuple
+        countsに対応する4グループ分の表の行。省略した場合はcountsから求める
+
+    Returns
+    -------
+    indices : list of int
+        シャンテン数が下がる牌の通し番号(MahjongTile.index)のリスト。手牌に4枚ある牌は含まない
+    """
+    groups = list(_groups(counts) if groups is None else groups)
+    count = _shanten(*groups)
+    indices = []
+    for i in range(4):
+        rows = _neighbors(tuple(counts[i*9:i*9+(7 if i == 3 else 9)]), i != 3, 1)
+        indices += [i*9+j for j in _improving(groups, i, rows, count)]
+    return(indices)
+
+
+def discards(counts, groups=None):
+    """
+    手牌から1枚捨てたときのシャンテン数を、捨てる牌ごとに求める
+
+    Parameters
+    ----------
+    counts : list of int
+        34種の牌の枚数(手牌のみ)。14枚(鳴いている場合は3n+2枚)の手牌を想定
+    groups : list of tuple
+        countsに対応する4グループ分の表の行。省略した場合はcountsから求める
+
+    Returns
+    -------
+    shantens : dict
+        捨てる牌の通し番号(MahjongTile.index)をキー、捨てた後のシャンテン数を値とする辞書
+
+    Notes
+    -----
+    捨てる牌のグループの行だけを差し替え、他の3グループの行はそのまま使う。
+    グループ内で1枚増減させた後の行はグループの枚数の並びごとにキャッシュされる
+    """
+    groups = list(_groups(counts) if groups is None else groups)
+    shantens = {}
+    for i in range(4):
+        offset = i * 9
+        tmp = groups[:]
+        for j, row in _neighbors(tuple(counts[offset:offset+(7 if i == 3 else 9)]), i != 3, -1):
+            tmp[i] = row
+            shantens[offset+j] = _shanten(*tmp)
+    return(shantens)
+
+
+def evaluate_discards(counts, groups=None):
+    """
+    手牌から1枚捨てたときのシャンテン数と、その後の受け入れを捨てる牌ごとに求める
+
+    Parameters
+    ----------
+    counts : list of int
+        34種の牌の枚数(手牌のみ)。14枚(鳴いている場合は3n+2枚)の手牌を想定
+    groups : list of tuple
+        countsに対応する4グループ分の表の行。省略した場合はcountsから求める
+
+    Returns
+    -------
+    evaluations : dict
+        捨てる牌の通し番号をキー、(捨てた後のシャンテン数, 引くとシャンテン数が下がる牌の通し番号のリスト)を値とする辞書
+
+    Notes
+    -----
+    捨てる牌と違うグループの牌を引いたときの行は、すべての捨てる牌で共通のものを使う
+    """
+    groups = list(_groups(counts) if groups is None else groups)
+    keys = [tuple(counts[i*9:i*9+(7 if i == 3 else 9)]) for i in range(4)]
+    draws = [_neighbors(keys[i], i != 3, 1) for i in range(4)]
+    evaluations = {}
+    for i in range(4):
+        tmp = groups[:]
+        for j, row in _neighbors(keys[i], i != 3, -1):
+            tmp[i] = row
+            count = _shanten(*tmp)
+            key = list(keys[i])
+            key[j] -= 1
+            indices = []
+            for k in range(4):
+                rows = _neighbors(tuple(key), i != 3, 1) if k == i else draws[k]
+                indices += [k*9+l for l in _improving(tmp, k, rows, count)]
+            evaluations[i*9+j] = (count, indices)
+    return(evaluations)
@@ -0,0 +1,290 @@
+"""
+自己対戦のシミュレーション
+
+MahjongTable で半荘を最後まで打ち、和了率、放銃率、平均の持ち点などを集計する。
+打牌やリーチ、和了の判断は席ごとのポリシー(Policy)に任せる。鳴きは行わない。
+複数の半荘は ProcessPoolExecutor で並列に打ち、各半荘は乱数の種から再現できる。
+"""
+import concurrent.futures
+import random
+
+import mahjongpy
+
+WIND_ORDER = ['ton', 'nan', 'sha', 'pei']
+
+
+class Policy:
+    """
+    席ごとの判断を表すクラス。受け入れが最も多くなる牌を捨て、テンパイすればリーチし、和了れるときは必ず和了る
+
+    Notes
+    -----
+    別の判断をさせる場合はこのクラスを継承してメソッドを上書きする。
+    並列に打つ場合は子プロセスに渡すため、pickleできる(モジュールの最上位で定義された)クラスにする
+    """
+
+    def discard(self, player, rng):
+        """
+        捨てる牌を選ぶ
+
+        Parameters
+        ----------
+        player : MahjongPlayer
+            牌を捨てるプレイヤー(ツモ後の14枚の手牌)
+        rng : random.Random
+            半荘ごとの乱数
+
+        Returns
+        -------
+        tile : MahjongTile
+            捨てる牌
+        """
+        return(player.evaluate_discards()[0]['tile'])
+
+    def riichi(self, player, rng):
+        """
+        Returns
+        -------
+        riichi : bool
+            リーチするかどうか(リーチできるときだけ呼ばれる)
+        """
+        return(True)
+
+    def tumo(self, player, rng):
+        """
+        Returns
+        -------
+        tumo : bool
+            ツモ和了するかどうか(和了れるときだけ呼ばれる)
+        """
+        return(True)
+
+    def ron(self, player, tile, rng):
+        """
+        Returns
+        -------
+        ron : bool
+            tileでロン和了するかどうか(和了れるときだけ呼ばれる)
+        """
+        return(True)
+
+
+class RandomPolicy(Policy):
+    """
+    手牌からでたらめに牌を捨て、リーチはせず、和了れるときは和了る
+    """
+
+    def discard(self, player, rng):
+        return(player.hands[rng.randrange(len(player.hands))])
+
+    def riichi(self, player, rng):
+        return(False)
+
+
+def _can_riichi(player):
+    table = player.table
+    return(not player.is_riichi and player.is_menzen() and player.points >= 1000 and
+           table.tiles_left() >= 4 and player.shanten() <= 0)
+
+
+def _set_win(player, tile, is_tumo):
+    # 和了牌とツモかロンかを和了るときと同じにする。元の状態を返す
+    state = (player.latest_tile, player.is_tumo, player.is_ron)
+    player.latest_tile, player.is_tumo, player.is_ron = tile, is_tumo, not is_tumo
+    return(state)
+
+
+def _has_yakus(player, tile, is_tumo):
+    if not player.is_hora(): return(False)
+    state = _set_win(player, tile, is_tumo)
+    judge = len(player.yakus()) > 0
+    player.latest_tile, player.is_tumo, player.is_ron = state
+    return(judge)
+
+
+def _can_ron(player, tile):
+    if player.is_furiten() or not player.can_ron(tile): return(False)
+    player.hands.append(tile)
+    judge = _has_yakus(player, tile, False)
+    player.hands.pop(player.hands.index(tile))
+    return(judge)
+
+
+def play_round(table, policies, rng):
+    """
+    1局を打つ
+
+    Parameters
+    ----------
+    table : MahjongTable
+        配牌が終わった卓
+    policies : list of Policy
+        4人分のポリシー。table.playersと同じ順
+    rng : random.Random
+        ポリシーに渡す乱数
+
+    Returns
+    -------
+    result : dict
+        winner : 和了ったプレイヤーの番号(0～3)。流局ならNone
+        furikomi : 放銃したプレイヤーの番号。ツモ和了か流局ならNone
+        deltas : 4人それぞれの点数の増減のリスト
+    """
+    players = table.players
+    before = [i.points for i in players]
+    seat = table.oya_player - 1
+    while True:
+        player = players[seat]
+        policy = policies[seat]
+        if _has_yakus(player, player.latest_tile, True) and policy.tumo(player, rng):
+            _set_win(player, player.latest_tile, True)
+            player.tumo()
+            break
+        if player.is_riichi:
+            tile = player.latest_tile
+        else:
+            tile = policy.discard(player, rng)
+            if _can_riichi(player) and player.hands.discards()[tile.index] == 0 and policy.riichi(player, rng):
+                player.riichi()
+        player.discard(tile)
+        for i in range(1, 4):
+            other = (seat + i) % 4
+            if _can_ron(players[other], tile) and policies[other].ron(players[other], tile, rng):
+                _set_win(players[other], tile, False)
+                players[other].ron(tile)
+                break
+        if table.win_player is not None: break
+        if table.tiles_left() <= 0:
+            table.ryukyoku()
+            break
+        seat = (seat + 1) % 4
+        table.draw(players[seat])
+    winner = None if table.win_player is None else players.index(table.win_player)
+    furikomi = None if table.furikomi_player is None else players.index(table.furikomi_player)
+    return({'winner': winner, 'furikomi': furikomi, 'deltas': [players[i].points - before[i] for i in range(4)]})
+
+
+def _is_over(table, start):
+    if any([i.points < 0 for i in table.players]): return(True)
+    return(WIND_ORDER.index(table.wind) - WIND_ORDER.index(start) >= 2)
+
+
+def _policy_rng(seed):
+    # 牌山と同じ種を使うと打牌の乱数が牌山の並びと相関するため、種から別の系列を作る
+    return(random.Random(None if seed is None else 'policy:{}'.format(seed)))
+
+
+def play_game(seed, policies=None, max_rounds=64, writer=None):
+    """
+    半荘を1回打つ
+
+    Parameters
+    ----------
+    seed : int
+        乱数の種。同じ種からは同じ半荘が再現される
+    policies : list of Policy
+        4人分のポリシー。省略した場合は全員Policy
+    max_rounds : int
+        打つ局数の上限(連荘が続いた場合の打ち切り)
+    writer : mahjongpy.mahjongrecord.RecordWriter
+        局ごとの牌譜の書き出し先。省略した場合は書き出さない
+
+    Returns
+    -------
+    result : dict
+        seed : 乱数の種
+        points : 4人の最終的な持ち点のリスト
+        rounds : 局のリスト(play_roundの結果のリスト)
+    """
+    policies = [Policy()]*4 if policies is None else policies
+    rng = _policy_rng(seed)
+    table = mahjongpy.MahjongTable(seed=seed)
+    start = table.wind
+    rounds = []
+    while True:
+        rounds.append(play_round(table, policies, rng))
+        if writer is not None: writer.write_round(table)
+        if len(rounds) >= max_rounds: break
+        table = table.next_round(in_place=True)
+        if _is_over(table, start): break
+    return({'seed': seed, 'points': [i.points for i in table.players], 'rounds': rounds})
+
+
+def _play_games(args):
+    seeds, policies, max_rounds = args
+    return([play_game(i, policies, max_rounds) for i in seeds])
+
+
+def _warm_up():
+    mahjongpy.mahjongagari.load_table()
+    mahjongpy.shanten(mahjongpy.MahjongHands(mahjongpy.MahjongTile.make_tiles_set(use_akadora=False)[:14]).counts)
+
+
+def summarize(games):
+    """
+    半荘の結果を集計する
+
+    Parameters
+    ----------
+    games : list of dict
+        play_gameの結果のリスト
+
+    Returns
+    -------
+    stats : dict
+        games : 半荘数
+        rounds : 局数
+        win_rate : 4人それぞれの和了率(和了った局数 / 局数)のリスト
+        deal_in_rate : 4人それぞれの放銃率(放銃した局数 / 局数)のリスト
+        ryukyoku_rate : 流局率
+        average_points : 4人それぞれの最終的な持ち点の平均のリスト
+    """
+    rounds = [j for i in games for j in i['rounds']]
+    count = max(1, len(rounds))
+    return({'games': len(games), 'rounds': len(rounds),
+            'win_rate': [len([j for j in rounds if j['winner'] == i]) / count for i in range(4)],
+            'deal_in_rate': [len([j for j in rounds if j['furikomi'] == i]) / count for i in range(4)],
+            'ryukyoku_rate': len([j for j in rounds if j['winner'] is None]) / count,
+            'average_points': [sum([j['points'][i] for j in games]) / max(1, len(games)) for i in range(4)]})
+
+
+def simulate(games, policies=None, seed=0, max_workers=None, chunksize=16, max_rounds=64):
+    """
+    半荘を複数回打って結果を集計する
+
+    Parameters
+    ----------
+    games : int
+        打つ半荘の数
+    policies : list of Policy
+        4人分のポリシー。省略した場合は全員Policy
+    seed : int
+        乱数の種。各半荘の種はこの種から決まる
+    max_workers : int
+        プロセス数。1の場合はプロセスを作らずにこのプロセスで打つ。省略した場合はCPUの数
+    chunksize : int
+        1つのプロセスにまとめて渡す半荘の数
+    max_rounds : int
+        1半荘で打つ局数の上限
+
+    Returns
+    -------
+    stats : dict
+        summarizeの結果に、各半荘の結果のリスト(results)を加えた辞書
+
+    Notes
+    -----
+    子プロセスは起動時に1度だけ和了形とシャンテン数の表を読み込み、
+    chunksize個ずつまとめて半荘を受け取るため、半荘ごとの準備の時間はかからない
+    """
+    rng = random.Random(seed)
+    seeds = [rng.getrandbits(32) for _ in range(games)]
+    chunks = [(seeds[i:i+chunksize], policies, max_rounds) for i in range(0, games, chunksize)]
+    if max_workers == 1:
+        results = sum([_play_games(i) for i in chunks], [])
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, initializer=_warm_up) as executor:
+            results = sum(list(executor.map(_play_games, chunks)), [])
+    stats = summarize(results)
+    stats['results'] = results
+    return(stats)
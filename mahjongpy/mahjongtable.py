@@ -10,7 +10,18 @@ class MahjongTable:
     Attributes
     ----------
     tiles : list
-        場の牌山(MahjongTileのリスト)
+        場の牌山のうち、まだ配られていない、めくられていない牌(MahjongTileのリスト)。
+        wallとheadから読み出すたびに作り直す読み取り専用のコピーで、代入できず、書き換えても牌山は変わらない。
+        牌山を変える場合はwallとheadを使う
+    wall : list
+        洗牌した136枚の牌山(MahjongTileのリスト)。先頭から配り、最後の14枚が王牌。
+        引数tilesに136枚の牌を渡した場合は、洗牌せずにその並びを使う
+    head : int
+        次にツモる牌のwallでの位置
+    seed : int
+        牌山を作る乱数の種(Noneなら指定なし)
+    rng : random.Random
+        卓ごとの乱数。同じ種からは同じ牌山が作られる
     wind : str
         現在の場の風。東:'ton'　南:'nan'　東:'sha'　北:'pei'
     kyoku : int
@@ -49,37 +60,49 @@ class MahjongTable:
         この卓の勝者
     furikomi_player : MahjongPlayer
         ロンで和了った時に振り込んだプレイヤー
+    events : list of tuple
+        この局の出来事の記録。(出来事の名前, 席, 牌のIDのタプル, 整数のタプル)のリスト(mahjongpy.mahjongrecord を参照)
     """
 
     WIND_NAME_JP = {'ton':'東', 'nan':'南', 'sha':'西', 'pei':'北'}
+    DEAD_WALL = 122  # 王牌の先頭の位置
+    RINSYAN_POSITIONS = list(range(DEAD_WALL+13, DEAD_WALL+9, -1))  # 嶺上牌の位置(ツモる順)
+    DORA_POSITIONS = list(range(DEAD_WALL+8, DEAD_WALL-1, -2))  # ドラ表示牌の位置(めくる順)
+    URADORA_POSITIONS = list(range(DEAD_WALL+9, DEAD_WALL, -2))  # 裏ドラ表示牌の位置(めくる順)
 
     def __init__(self, tiles=[], wind="ton", kyoku=1, honba=0, dora_showing_tiles=[], dora_tiles=[],
                  ri_bou=0, players=[], oya_player=1, players_points=[25000]*4, use_akadora=True, kuitan=True,
-                 kandora_sokumekuri=False, rules={}):
-        self.tiles = mahjongpy.MahjongTile.make_tiles_set(use_akadora=rules.get('use_akadora', use_akadora))
-        random.shuffle(self.tiles)
+                 kandora_sokumekuri=False, rules={}, seed=None, rng=None):
+        self.seed = seed
+        self.rng = random.Random(seed) if rng is None else rng
+        if len(tiles) == 136:
+            self.wall = tiles[:]
+        else:
+            self.wall = list(mahjongpy.MahjongTile.tiles_set(rules.get('use_akadora', use_akadora)))
+            self.rng.shuffle(self.wall)
+        self.head = 0
+        self.used_dead_wall = []
+        self.events = []
         self.wind = wind
         self.kyoku = kyoku
         self.honba = honba
+        self.ri_bou = ri_bou
+        self.oya_player = oya_player
+        self.emit('start', None, [], [list(self.WIND_NAME_JP).index(wind), kyoku, honba, ri_bou, oya_player-1] +
+                  list(players_points))
         self.dora_showing_tiles = dora_showing_tiles[:]
         self.uradora_showing_tiles = [][:]
         self.dora_tiles = dora_tiles[:]
-        self.dora_showing_tiles.append(self.tiles.pop(random.randrange(136)))
-        self.dora_tiles.append(self.dora_showing_tiles[0].next())
-        self.ri_bou = ri_bou
-        self.oya_player = oya_player
-        h1, h2, h3, h4 = self.deal_tiles()
-        wind_rot = ['nan','sha','pei','ton','nan','sha','pei']
-        p_is_oya = []
-        p_wind = []
-        for i in range(1,5):
-            p_is_oya.append(i == self.oya_player)
-            p_wind.append(wind_rot[3-self.oya_player+i])
+        self.add_kandora()
+        h1, h2, h3, h4 = self.deal_tiles(self.oya_player)
+        p_is_oya, p_wind = self._seats()
         p1 = mahjongpy.MahjongPlayer(hands=h1, oya=p_is_oya[0], wind=p_wind[0], points=players_points[0], table=self)
         p2 = mahjongpy.MahjongPlayer(hands=h2, oya=p_is_oya[1], wind=p_wind[1], points=players_points[1], table=self)
         p3 = mahjongpy.MahjongPlayer(hands=h3, oya=p_is_oya[2], wind=p_wind[2], points=players_points[2], table=self)
         p4 = mahjongpy.MahjongPlayer(hands=h4, oya=p_is_oya[3], wind=p_wind[3], points=players_points[3], table=self)
         self.players = [p1, p2, p3, p4]
+        for i in self.players:
+            self.emit('deal', i, i.hands)
         self.use_akadora = rules.get('use_akadora', use_akadora)
         self.kuitan = rules.get('kuitan', kuitan)
         self.kandora_sokumekuri = rules.get('kandora_sokumekuri', kandora_sokumekuri)
@@ -90,6 +113,33 @@ class MahjongTable:
         self.furikomi_player = None
         self.is_ryukyoku = False
 
+    def _seats(self):
+        wind_rot = ['nan','sha','pei','ton','nan','sha','pei']
+        p_is_oya = []
+        p_wind = []
+        for i in range(1,5):
+            p_is_oya.append(i == self.oya_player)
+            p_wind.append(wind_rot[3-self.oya_player+i])
+        return(p_is_oya, p_wind)
+
+    def emit(self, event, player=None, tiles=(), values=()):
+        """
+        出来事を記録する
+
+        Parameters
+        ----------
+        event : str
+            出来事の名前(mahjongpy.mahjongrecord.EVENTS のいずれか)
+        player : MahjongPlayer
+            出来事を起こしたプレイヤー。卓全体の出来事ならNone
+        tiles : list of MahjongTile
+            出来事に関わる牌
+        values : list of int
+            出来事に関わる整数(席の番号、点数の増減など)
+        """
+        seat = None if player is None else self.players.index(player)
+        self.events.append((event, seat, tuple([i.id for i in tiles]), tuple(values)))
+
     def deal_tiles(self,oya=1):
         """
         配牌する
@@ -104,14 +154,17 @@ class MahjongTable:
         hands : list
             プレイヤーの手牌のリスト　*4人分。親のみ14枚他3人は13枚
         """
-        hands = [[], [], [], []]
-        for i in range(4):
-            for _ in range(13):
-                hands[i].append(self.tiles.pop(random.randrange(10)))
-        hands[oya-1].append(self.tiles.pop(random.randrange(10)))
+        hands = [self.wall[self.head+i*13:self.head+(i+1)*13] for i in range(4)]
+        self.head += 52
+        hands[oya-1].append(self.wall[self.head])
+        self.head += 1
         return(hands)
 
-    def draw(self, player):
+    @property
+    def tiles(self):
+        return([self.wall[i] for i in range(self.head, 136) if i not in self.used_dead_wall])
+
+    def draw(self, player, rinsyan=False):
         """
         山から牌を引き、プレイヤーに配る
 
@@ -119,72 +172,118 @@ class MahjongTable:
         ----------
         player : MahjongPlayer
             牌を配るプレイヤー
+        rinsyan : bool
+            嶺上牌を引くかどうか
+
+        Raises
+        ------
+        RuntimeError
+            引ける牌が残っていない
+
+        Notes
+        -----
+        まだ引かれていない、めくられていない牌の最後の14枚を王牌として残すため、
+        嶺上牌を引いたりカンドラをめくったりすると、その分だけ引ける牌が減る
         """
-        draw_tile = self.tiles.pop(random.randrange(5))
+        if self.tiles_left() <= 0: raise RuntimeError('No tiles left')
+        if rinsyan:
+            positions = [i for i in self.RINSYAN_POSITIONS if i not in self.used_dead_wall]
+            if len(positions) == 0: raise RuntimeError('No rinsyan tiles left')
+            self.used_dead_wall.append(positions[0])
+            draw_tile = self.wall[positions[0]]
+        else:
+            draw_tile = self.wall[self.head]
+            self.head += 1
         player.hands.append(draw_tile)
         player.latest_tile = draw_tile
         player.sort()
+        self.emit('draw', player, [draw_tile], [1] if rinsyan else [])
 
     def add_kandora(self, ura=False):
         """
         カンドラをめくる
+
+        Parameters
+        ----------
+        ura : bool
+            裏ドラ表示牌をめくるかどうか
+
+        Raises
+        ------
+        RuntimeError
+            めくれる表示牌が残っていない
         """
-        tile = self.tiles.pop(random.randrange(5))
+        positions = [i for i in (self.URADORA_POSITIONS if ura else self.DORA_POSITIONS) if i not in self.used_dead_wall]
+        if len(positions) == 0: raise RuntimeError('No dora showing tiles left')
+        self.used_dead_wall.append(positions[0])
+        tile = self.wall[positions[0]]
         if ura:
             self.uradora_showing_tiles.append(tile)
         else:
             self.dora_showing_tiles.append(tile)
         self.dora_tiles.append(tile.next())
+        self.emit('dora', None, [tile], [1] if ura else [])
 
     def tiles_left(self):
         """
         Returns
         -------
         count : int
-            残りの牌の枚数
+            残りの牌の枚数(tilesの枚数から王牌の14枚を除いた数)
         """
-        return(len(self.tiles)-14)
+        return(self.DEAD_WALL - self.head - len(self.used_dead_wall))
 
     def calculate_score(self):
         """
         点数を分配します
         """
         if self.win_player is None and not self.is_ryukyoku: raise RuntimeError('Round NOT finished')
+        before = [i.points for i in self.players]
         if self.is_ryukyoku:
             tenpai_count = len([i for i in self.players if i.is_tenpai()])
-            if tenpai_count in [0,4]: return()
-            t_score = int(3000 / tenpai_count)
-            nt_score = int(3000 / (4-tenpai_count))
-            for i in self.players:
-                if i.is_tenpai():
-                    i.points += t_score
-                else:
-                    i.points -= nt_score
+            if tenpai_count not in [0,4]:
+                t_score = int(3000 / tenpai_count)
+                nt_score = int(3000 / (4-tenpai_count))
+                for i in self.players:
+                    if i.is_tenpai():
+                        i.points += t_score
+                    else:
+                        i.points -= nt_score
         else:
-            score = self.win_player.payed_score()
+            ron, oya_payment, ko_payment, total = self.win_player.payout()
             if self.win_player.is_tumo:
-                self.win_player.points += self.win_player.score()
+                self.win_player.points += total
                 for i in self.players:
                     if i == self.win_player: continue
-                    elif i.oya: i.points -= score[1]
-                    else: i.points -= score[2]
+                    elif i.oya: i.points -= oya_payment
+                    else: i.points -= ko_payment
             elif self.win_player.is_ron:
-                self.win_player.points += self.win_player.score()
-                self.furikomi_player.points -= score[0]
+                self.win_player.points += total
+                self.furikomi_player.points -= ron
+        self.emit('score', None, [], [self.players[i].points - before[i] for i in range(4)])
 
-    def next_round(self):
+    def next_round(self, in_place=False):
         """
         次の局に進みます
 
+        Parameters
+        ----------
+        in_place : bool
+            Trueなら新しい卓を作らず、この卓とプレイヤーのオブジェクトをそのまま次の局の状態に戻して使う
+
+        Returns
+        -------
+        table : MahjongTable
+            次の局の卓。in_placeがTrueなら自身
+
         Notes
         -----
-        self.tablesおよびself.playersが更新されるので再取得してください
+        in_placeがFalseの場合、self.tablesおよびself.playersが更新されるので再取得してください。
+        Trueの場合は牌山、手牌、河などのリストも中身を入れ替えて使い回すので、前の局のリストを取っておく場合はコピーしてください
         """
         NEXT_WIND = {'ton':'nan', 'nan':'sha', 'sha':'pei', 'pei':'ton'}
-        if self.is_ryukyoku:
-            self.win_player = mahjongpy.MahjongPlayer(hands=[42]*13,oya=False)
-        if self.win_player is None: raise RuntimeError('self.win_player is not setted')
-        if self.win_player.oya:
+        if not self.is_ryukyoku and self.win_player is None: raise RuntimeError('self.win_player is not setted')
+        if not self.is_ryukyoku and self.win_player.oya:
             self.honba += 1
         else:
             self.kyoku += 1
@@ -193,14 +292,92 @@ class MahjongTable:
                 self.kyoku = 1
             self.oya_player += 1
             if self.oya_player == 5: self.oya_player = 1
+        if in_place:
+            self._reset_round()
+            return(self)
         players_points = []
         for i in self.players:
             players_points.append(i.points)
-        return(MahjongTable(kyoku=self.kyoku, wind=self.wind, honba=self.honba, oya_player=self.oya_player, ri_bou=self.ri_bou, use_akadora=self.use_akadora, kuitan=self.kuitan, kandora_sokumekuri=self.kandora_sokumekuri, players_points=players_points))
+        return(MahjongTable(kyoku=self.kyoku, wind=self.wind, honba=self.honba, oya_player=self.oya_player, ri_bou=self.ri_bou, use_akadora=self.use_akadora, kuitan=self.kuitan, kandora_sokumekuri=self.kandora_sokumekuri, players_points=players_points, rng=self.rng))
+
+    def _reset_round(self):
+        self.wall[:] = mahjongpy.MahjongTile.tiles_set(self.use_akadora)
+        self.rng.shuffle(self.wall)
+        self.head = 0
+        self.used_dead_wall.clear()
+        self.events.clear()
+        self.emit('start', None, [], [list(self.WIND_NAME_JP).index(self.wind), self.kyoku, self.honba, self.ri_bou,
+                                      self.oya_player-1] + [i.points for i in self.players])
+        self.dora_showing_tiles.clear()
+        self.uradora_showing_tiles.clear()
+        self.dora_tiles.clear()
+        self.add_kandora()
+        hands = self.deal_tiles(self.oya_player)
+        p_is_oya, p_wind = self._seats()
+        for i in range(4):
+            self.players[i].reset(hands[i], p_is_oya[i], p_wind[i])
+            self.emit('deal', self.players[i], self.players[i].hands)
+        self.round_name_jp = self.WIND_NAME_JP[self.wind] + str(self.kyoku) + '局'
+        self.info = self.round_name_jp + str(self.honba) + '本場'
+        self.is_furoed = False
+        self.win_player = None
+        self.furikomi_player = None
+        self.is_ryukyoku = False
+
+    def snapshot(self):
+        """
+        卓と4人のプレイヤーの状態を、牌を1枚1バイト(MahjongTile.code)にしたタプルとして保存する
+
+        Returns
+        -------
+        state : tuple
+            restoreに渡すと今の状態に戻せるタプル。場の風、局数、親、牌山とツモの位置、ドラ、本場、リー棒、
+            局の結果、出来事の記録、各プレイヤーの状態(MahjongPlayer.snapshot)を含む
+
+        Notes
+        -----
+        深いコピー(copy.deepcopy)と違い、プレイヤーや牌のオブジェクトは作り直さずに使い回す。
+        next_round(in_place=True)の前の局に戻すこともできる
+        """
+        players = self.players
+        return((self.wind, self.kyoku, self.oya_player, bytes([i.code for i in self.wall]), self.head,
+                tuple(self.used_dead_wall),
+                bytes([i.code for i in self.dora_showing_tiles]), bytes([i.code for i in self.uradora_showing_tiles]),
+                bytes([i.code for i in self.dora_tiles]), self.honba, self.ri_bou, self.is_furoed, self.is_ryukyoku,
+                None if self.win_player is None else players.index(self.win_player),
+                None if self.furikomi_player is None else players.index(self.furikomi_player),
+                tuple(self.events), tuple([i.snapshot() for i in players])))
+
+    def restore(self, state):
+        """
+        snapshotで保存した状態に戻す
+
+        Parameters
+        ----------
+        state : tuple
+            snapshotの返り値
+        """
+        codes = mahjongpy.MahjongTile.CODES
+        (self.wind, self.kyoku, self.oya_player, wall, self.head, used_dead_wall, dora_showing_tiles,
+         uradora_showing_tiles, dora_tiles, self.honba, self.ri_bou, self.is_furoed, self.is_ryukyoku, win_player,
+         furikomi_player, events, players) = state
+        self.wall = [codes[i] for i in wall]
+        self.used_dead_wall = list(used_dead_wall)
+        self.dora_showing_tiles = [codes[i] for i in dora_showing_tiles]
+        self.uradora_showing_tiles = [codes[i] for i in uradora_showing_tiles]
+        self.dora_tiles = [codes[i] for i in dora_tiles]
+        self.win_player = None if win_player is None else self.players[win_player]
+        self.furikomi_player = None if furikomi_player is None else self.players[furikomi_player]
+        self.events[:] = events
+        self.round_name_jp = self.WIND_NAME_JP[self.wind] + str(self.kyoku) + '局'
+        self.info = self.round_name_jp + str(self.honba) + '本場'
+        for i in range(4):
+            self.players[i].restore(players[i])
 
     def ryukyoku(self):
         """
         流局する
         """
         self.is_ryukyoku = True
+        self.emit('ryukyoku')
         self.calculate_score()
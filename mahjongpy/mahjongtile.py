@@ -12,6 +12,18 @@ class MahjongTile:
         赤ドラかどうか
     from_tacha : bool
         他家からの牌かどうか(鳴いた時に他家からの牌を横向きに表示する時の判定に使用)
+    index : int
+        34種の牌の通し番号。萬子1～9:0～8　索子1～9:9～17　筒子1～9:18～26　東南西北白發中:27～33
+    id : int
+        牌のID。通し番号に加え赤ドラの五萬:34　五索:35　五筒:36
+    code : int
+        他家からの牌かどうかも含めた牌の番号(0～75)。IDに、他家からの牌なら37を足したもの。虚無の牌は74(+1)。
+        MahjongTile.CODES[code]で牌に戻せるので、牌のリストを1枚1バイトのbytesにするときに使う
+
+    Notes
+    -----
+    牌は37種(+他家からの牌)それぞれ1つのオブジェクトを共有する(MahjongTile(...)は同じオブジェクトを返す)。
+    共有しているので属性は変更できない。name_jpとdisplayの文字列も種類ごとに読み込み時に1度だけ作られる
     """
 
     TILE_TYPES = ['manzu', 'pinzu', 'souzu', 'ton', 'nan', 'sha', 'pei', 'haku', 'hatu', 'tyun']
@@ -20,21 +32,163 @@ class MahjongTile:
     TILE_READING_JP = {'manzu':'ワン', 'pinzu':'ピン', 'souzu':'ソー', 'ton':'トン', 'nan':'ナン', 'sha':'シャー', 'pei':'ペイ', 'haku':'ハク', 'hatu':'ハツ', 'tyun':'チュン', None:'虚無'}
     TILE_DISPLAY = {'manzu':'萬', 'pinzu':'●', 'souzu':'Ⅰ', 'ton':'東', 'nan':'南', 'sha':'西', 'pei':'北', 'haku':'白', 'hatu':'發', 'tyun':'中', None:'虚無'}
     NEXT_ZIHAI = {'ton':'nan', 'nan':'sha', 'sha':'pei', 'pei':'ton', 'haku':'hatu', 'hatu':'tyun', 'tyun':'haku'}
+    TILE_INDEX = {'manzu':0, 'souzu':9, 'pinzu':18, 'ton':27, 'nan':28, 'sha':29, 'pei':30, 'haku':31, 'hatu':32, 'tyun':33}
+    INDEX_TILE_TYPES = ['manzu']*9 + ['souzu']*9 + ['pinzu']*9 + ['ton', 'nan', 'sha', 'pei', 'haku', 'hatu', 'tyun']
+    YAOCHU_INDICES = [0, 8, 9, 17, 18, 26, 27, 28, 29, 30, 31, 32, 33]
+
+    AKADORA_IDS = {'manzu':34, 'souzu':35, 'pinzu':36}
+    _TILE_SETS = {}  # 赤ドラを入れるかどうか -> 136枚の牌のタプル
+    __slots__ = ('tile_type', 'number', 'akadora', 'from_tacha', 'name_jp', 'display', 'index', 'id', 'code', '_key')
+
+    def __new__(cls, tile_type, number=1, akadora=False, from_tacha=False):
+        try:
+            return(cls._INTERNED[(tile_type, number, akadora, from_tacha)])
+        except KeyError:
+            raise ValueError('unknown tile types') from None
+
+    @classmethod
+    def _make(cls, tile_type, number, akadora, from_tacha):
+        tile = object.__new__(cls)
+        setattr_ = object.__setattr__
+        setattr_(tile, 'tile_type', tile_type)
+        setattr_(tile, 'number', number)
+        setattr_(tile, 'akadora', akadora)
+        setattr_(tile, 'from_tacha', from_tacha)
+        name_jp = cls.NUMBER_READING_JP[number] + cls.TILE_READING_JP[tile_type]
+        display = str(number) + cls.TILE_DISPLAY[tile_type]
+        if akadora:
+            display += '*'
+            name_jp += '*'
+        if number is None: display = cls.TILE_DISPLAY[tile_type]
+        setattr_(tile, 'name_jp', name_jp)
+        setattr_(tile, 'display', display)
+        index = None if tile_type is None else cls.TILE_INDEX[tile_type] + (0 if number is None else number-1)
+        setattr_(tile, 'index', index)
+        setattr_(tile, 'id', cls.AKADORA_IDS[tile_type] if akadora else index)
+        setattr_(tile, 'code', (74 if index is None else tile.id) + (1 if index is None else 37) * from_tacha)
+        setattr_(tile, '_key', -1 if index is None else index*2 + akadora)
+        return(tile)
+
+    @classmethod
+    def _intern_tiles(cls):
+        cls._INTERNED = {}
+        cls.TILES = [None]*37
+        for from_tacha in [False, True]:
+            for index in range(34):
+                tile_type = cls.INDEX_TILE_TYPES[index]
+                if index < 27:
+                    tile = cls._make(tile_type, index%9+1, False, from_tacha)
+                    cls._INTERNED[(tile_type, index%9+1, False, from_tacha)] = tile
+                    if index%9 == 4:
+                        aka = cls._make(tile_type, 5, True, from_tacha)
+                        cls._INTERNED[(tile_type, 5, True, from_tacha)] = aka
+                        if not from_tacha: cls.TILES[aka.id] = aka
+                else:
+                    tile = cls._make(tile_type, None, False, from_tacha)
+                    for i in list(range(1,10))+[None]:
+                        cls._INTERNED[(tile_type, i, False, from_tacha)] = tile
+                if not from_tacha: cls.TILES[index] = tile
+            tile = cls._make(None, 1, False, from_tacha)
+            for i in list(range(1,10))+[None]:
+                cls._INTERNED[(None, i, False, from_tacha)] = tile
+        cls.CODES = [None]*76
+        for i in cls._INTERNED.values():
+            cls.CODES[i.code] = i
+        cls._NEXT = []
+        for i in range(37):
+            index = cls.TILES[i].index
+            if index < 27:
+                cls._NEXT.append(index+1 if index%9 != 8 else index-8)
+            else:
+                cls._NEXT.append(cls.TILE_INDEX[cls.NEXT_ZIHAI[cls.INDEX_TILE_TYPES[index]]])
+
+    def __setattr__(self, name, value):
+        raise AttributeError('MahjongTile is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('MahjongTile is immutable')
+
+    def __reduce__(self):
+        return(MahjongTile, (self.tile_type, self.number, self.akadora, self.from_tacha))
+
+    def __copy__(self):
+        return(self)
+
+    def __deepcopy__(self, memo):
+        return(self)
+
+    @classmethod
+    def from_id(cls, tile_id):
+        """
+        牌のIDから共有の牌オブジェクトを返す
+
+        Parameters
+        ----------
+        tile_id : int
+            牌のID(0～36)
+
+        Returns
+        -------
+        tile : MahjongTile
+            IDに対応する牌
+        """
+        return(cls.TILES[tile_id])
+
+    @classmethod
+    def from_index(cls, index, akadora=False):
+        """
+        34種の牌の通し番号から共有の牌オブジェクトを返す
+
+        Parameters
+        ----------
+        index : int
+            牌の通し番号(0～33)
+        akadora : bool
+            赤ドラかどうか
+
+        Returns
+        -------
+        tile : MahjongTile
+            通し番号に対応する牌
+        """
+        if akadora: return(cls.TILES[cls.AKADORA_IDS[cls.INDEX_TILE_TYPES[index]]])
+        return(cls.TILES[index])
+
+    @staticmethod
+    def tiles_string(tiles, name_jp=False, separator=' '):
+        """
+        複数の牌の表示用の文字列をまとめて1つの文字列にする
 
-    def __init__(self, tile_type, number=1, akadora=False, from_tacha=False):
-        if tile_type not in self.TILE_TYPES+[None]: raise ValueError('unknown tile types')
-        if number not in [i for i in range(1,10)]+[None]: raise ValueError('unknown tile types')
-        self.tile_type = tile_type
-        self.number = number
-        if tile_type in self.TILE_TYPES_ZIHAI: self.number = None
-        self.akadora = akadora
-        self.from_tacha = from_tacha
-        self.name_jp = self.NUMBER_READING_JP[self.number] + self.TILE_READING_JP[self.tile_type]
-        self.display = str(self.number) + self.TILE_DISPLAY[self.tile_type]
-        if self.akadora:
-            self.display += '*'
-            self.name_jp += '*'
-        if self.number is None: self.display = self.TILE_DISPLAY[self.tile_type]
+        Parameters
+        ----------
+        tiles : list
+            MahjongTileのリスト
+        name_jp : bool
+            displayの代わりにname_jpを使うかどうか
+        separator : str
+            牌と牌の間に入れる文字列
+
+        Returns
+        -------
+        string : str
+            各牌のdisplay(またはname_jp)をseparatorでつないだ文字列
+
+        Examples
+        --------
+        >>> mahjongpy.MahjongTile.tiles_string(mahjongpy.MahjongTile.make_hands_set('123', '', '', '11', checkamount=False))
+        '1萬 2萬 3萬 東 東'
+        """
+        if name_jp: return(separator.join([i.name_jp for i in tiles]))
+        return(separator.join([i.display for i in tiles]))
+
+    def as_from_tacha(self):
+        """
+        Returns
+        -------
+        tile : MahjongTile
+            自身と同じ牌で、他家からの牌(from_tacha=True)のもの
+        """
+        return(MahjongTile(self.tile_type, self.number, self.akadora, True))
 
     @classmethod
     def make_tiles_set(cls, use_akadora=True):
@@ -49,8 +203,31 @@ class MahjongTile:
         Returns
         -------
         tiles : list
-            MahjongTile136枚のリスト
+            MahjongTile136枚のリスト(tiles_setをコピーしたもの)
         """
+        return(list(cls.tiles_set(use_akadora)))
+
+    @classmethod
+    def tiles_set(cls, use_akadora=True):
+        """
+        136枚の牌のセットの雛形を返す。ルールごとに最初の1回だけ作り、以降は同じタプルを返す
+
+        Parameters
+        ----------
+        use_akadora : bool
+            赤ドラを入れるかどうか
+
+        Returns
+        -------
+        tiles : tuple
+            MahjongTile136枚のタプル。並びはmake_tiles_setと同じ
+        """
+        use_akadora = bool(use_akadora)
+        if use_akadora not in cls._TILE_SETS: cls._TILE_SETS[use_akadora] = cls._build_tiles_set(use_akadora)
+        return(cls._TILE_SETS[use_akadora])
+
+    @classmethod
+    def _build_tiles_set(cls, use_akadora):
         tiles = []
         for _ in range(4):
             for i in range(1,10):
@@ -71,7 +248,7 @@ class MahjongTile:
             tiles.append(MahjongTile('manzu',5,akadora=True))
             tiles.append(MahjongTile('souzu',5,akadora=True))
             tiles.append(MahjongTile('pinzu',5,akadora=True))
-        return(tiles)
+        return(tuple(tiles))
 
     @classmethod
     def make_hands_set(cls, man='', sou='', pin='', wind='', zihai='', checkamount=True):
@@ -146,22 +323,24 @@ class MahjongTile:
         tile : MahjongTile
             自身の次の牌
         """
-        if self.number is not None:
-            new_number = self.number + 1
-            if new_number == 10: new_number = 1
-            return (MahjongTile(self.tile_type, new_number))
-        else:
-            return(MahjongTile(self.NEXT_ZIHAI[self.tile_type]))
+        if self.id is None: return(self)
+        return(self.TILES[self._NEXT[self.id]])
 
     def __lt__(self, other):
-        TYPE_PRIORITY = {'manzu':1, 'souzu':2, 'pinzu':3, 'ton':4, 'nan':5, 'sha':6, 'pei':7, 'haku':8, 'hatu':9, 'tyun':10}
-        if self.tile_type != other.tile_type:
-            return(TYPE_PRIORITY[self.tile_type] < TYPE_PRIORITY[other.tile_type])
-        else:
-            if self.number is None or other.number is None:
-                return True
-            else:
-                return(self.number < other.number)
+        return(self._key < other._key)
 
     def __eq__(self, other):
-        return(self.tile_type == other.tile_type and self.number == other.number and self.akadora == other.akadora)
+        if self is other: return(True)
+        try:
+            return(self.id == other.id)
+        except AttributeError:
+            return(NotImplemented)
+
+    def __hash__(self):
+        return(hash(self.id))
+
+    def __repr__(self):
+        return('MahjongTile({!r}, {!r}, akadora={!r})'.format(self.tile_type, self.number, self.akadora))
+
+
+MahjongTile._intern_tiles()
@@ -10,9 +10,11 @@ with open(path.join(here, 'README.md'), encoding='utf-8') as f:
 setup(
     name = 'mahjongpy',
     packages = ['mahjongpy'],
+    package_data = {'mahjongpy': ['data/*.bin']},
     version = '0.2.3',
     license = 'MIT',
     install_requires = [],
+    extras_require = {'numpy': ['numpy']},
     author = 'Irisrainbow7',
     author_email = '',
     url = 'https://github.com/Irisrainbow7/mahjongpy',
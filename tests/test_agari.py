@@ -0,0 +1,38 @@
+import unittest
+import array
+import mahjongpy
+
+class TestAgari(unittest.TestCase):
+
+    def counts(self, *args):
+        return(mahjongpy.MahjongHands(mahjongpy.MahjongTile.make_hands_set(*args, checkamount=False)).counts)
+
+    def test_is_agari(self):
+        self.assertTrue(mahjongpy.is_agari(self.counts('22345', '567', '123567')))
+        self.assertTrue(mahjongpy.is_agari(self.counts('11122345678999')))
+        self.assertTrue(mahjongpy.is_agari(self.counts('', '', '', '111222', '33')))
+        self.assertTrue(mahjongpy.is_agari(self.counts('', '55')))
+        self.assertFalse(mahjongpy.is_agari(self.counts('2345', '567', '123567')))
+        self.assertFalse(mahjongpy.is_agari(self.counts('1155', '77', '3399', '22', '33')))
+        self.assertFalse(mahjongpy.is_agari(self.counts('', '', '', '123', '11')))
+
+    def test_key(self):
+        key = mahjongpy.mahjongagari.agari_key
+        self.assertEqual(key(self.counts('123', '456', '789', '111', '22')), key(self.counts('456', '789', '123', '222', '33')))
+        self.assertNotEqual(key(self.counts('123', '', '', '', '22')), key(self.counts('12', '3', '', '', '22')))
+
+    def test_table(self):
+        table = array.array('Q')
+        with open(mahjongpy.mahjongagari.TABLE_PATH, 'rb') as f:
+            table.frombytes(f.read())
+        self.assertEqual(list(table), mahjongpy.mahjongagari.build_table())
+
+    def test_can_ron(self):
+        p = mahjongpy.MahjongPlayer(hands=mahjongpy.MahjongTile.make_hands_set('2345', '567', '123567'))
+        self.assertTrue(p.can_ron(mahjongpy.MahjongTile('manzu', 2)))
+        self.assertTrue(p.can_ron(mahjongpy.MahjongTile('manzu', 5)))
+        self.assertFalse(p.can_ron(mahjongpy.MahjongTile('manzu', 3)))
+        p = mahjongpy.MahjongPlayer(hands=mahjongpy.MahjongTile.make_hands_set('1155', '77', '3399', '22', '3'))
+        self.assertTrue(p.can_ron(mahjongpy.MahjongTile('tyun')))
+        p = mahjongpy.MahjongPlayer(hands=mahjongpy.MahjongTile.make_hands_set('19', '19', '19', '1234', '123'))
+        self.assertTrue(p.can_ron(mahjongpy.MahjongTile('pinzu', 9)))
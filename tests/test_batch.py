@@ -0,0 +1,56 @@
+import random
+import unittest
+import mahjongpy
+from mahjongpy import mahjongbatch
+
+
+class TestBatch(unittest.TestCase):
+
+    def counts(self, *args):
+        return(mahjongpy.MahjongHands(mahjongpy.MahjongTile.make_hands_set(*args, checkamount=False)).counts)
+
+    def random_counts(self, n, seed=0):
+        rng = random.Random(seed)
+        wall = [i for i in range(34) for _ in range(4)]
+        results = []
+        for _ in range(n):
+            counts = [0]*34
+            for i in rng.sample(wall, rng.choice([8, 11, 13, 14])):
+                counts[i] += 1
+            results.append(counts)
+        return(results)
+
+    def test_shanten(self):
+        counts = self.random_counts(500)
+        self.assertEqual([int(i) for i in mahjongbatch.shanten(counts)], [mahjongpy.shanten(i) for i in counts])
+
+    def test_is_hora(self):
+        counts = [self.counts('22345', '567', '123567'), self.counts('2345', '567', '123567', '', '1'),
+                  self.counts('1155', '77', '3399', '22', '33')]
+        self.assertEqual([bool(i) for i in mahjongbatch.is_hora(counts)], [True, False, True])
+
+    def test_evaluate(self):
+        hands = mahjongpy.MahjongTile.make_hands_set('22345', '567', '123567')
+        counts = [self.counts('22345', '567', '123567'), self.counts('2345', '567', '123567', '', '1')]
+        results = mahjongbatch.evaluate(counts, win_tiles=[4, 4])
+        p = mahjongpy.MahjongPlayer(hands=hands, latest_tile=mahjongpy.MahjongTile('manzu', 5), turn=1)
+        p.is_ron = True
+        self.assertEqual([int(i) for i in results['han']], [p.score_han(), 0])
+        self.assertEqual([int(i) for i in results['fu']], [p.score_fu(), 0])
+        self.assertEqual([int(i) for i in results['score']], [p.score(), 0])
+        self.assertEqual([int(i) for i in results['shanten']], [-1, 0])
+
+    def test_evaluate_melded(self):
+        counts = [self.counts('22345', '567', '123'), self.counts('2345', '567', '12')]
+        results = mahjongbatch.evaluate(counts)
+        self.assertEqual([bool(i) for i in results['is_hora']], [True, False])
+        self.assertEqual([int(i) for i in results['han']], [-1, 0])
+        self.assertEqual([int(i) for i in results['score']], [-1, 0])
+
+    @unittest.skipIf(mahjongbatch.np is None, 'numpy is not installed')
+    def test_numpy(self):
+        np = mahjongbatch.np
+        counts = self.random_counts(500, 1)
+        shantens = mahjongbatch.shanten(np.array(counts, dtype=np.uint8))
+        self.assertEqual(shantens.dtype, np.int8)
+        self.assertEqual(shantens.tolist(), [mahjongpy.shanten(i) for i in counts])
@@ -0,0 +1,59 @@
+import unittest
+import mahjongpy
+from mahjongpy import mahjongcache
+
+
+class TestCache(unittest.TestCase):
+
+    def tearDown(self):
+        mahjongcache.set_capacity(mahjongcache.DEFAULT_CAPACITY)
+        mahjongcache.clear()
+
+    def test_lru(self):
+        c = mahjongcache.LRUCache(2)
+        self.assertEqual(c.get('a', [1], lambda: 1), 1)
+        self.assertEqual(c.get('a', [2], lambda: 2), 2)
+        self.assertEqual(c.get('a', [1], lambda: None), 1)
+        self.assertEqual(c.get('a', [3], lambda: 3), 3)
+        self.assertEqual(c.get('a', [2], lambda: 4), 4)
+        self.assertEqual(c.stats(), {'hits': 1, 'misses': 4, 'evictions': 2, 'size': 2, 'capacity': 2})
+        c.resize(1)
+        self.assertEqual(len(c), 1)
+        self.assertEqual(c.evictions, 3)
+        c.resize(0)
+        self.assertEqual(c.get('a', [2], lambda: 5), 5)
+        self.assertEqual(c.misses, 4)
+
+    def test_shared(self):
+        mahjongcache.clear()
+        tiles = mahjongpy.MahjongTile.make_hands_set('22345', '567', '123569')
+        p1 = mahjongpy.MahjongPlayer(hands=tiles)
+        p2 = mahjongpy.MahjongPlayer(hands=tiles)
+        self.assertEqual(p1.shanten(), 0)
+        self.assertEqual(mahjongcache.stats()['misses'], 1)
+        self.assertEqual(p2.shanten(), 0)
+        self.assertEqual(mahjongcache.stats()['hits'], 1)
+        self.assertEqual(p1.hands.ukeire(), p2.hands.ukeire())
+        self.assertEqual(p1.decompositions(), p2.decompositions())
+
+    def test_copies(self):
+        mahjongcache.clear()
+        tiles = mahjongpy.MahjongTile.make_hands_set('22345', '567', '123569')
+        p1 = mahjongpy.MahjongPlayer(hands=tiles)
+        p2 = mahjongpy.MahjongPlayer(hands=tiles)
+        ukeire = p1.hands.ukeire()
+        p1.hands.ukeire().clear()
+        p1.hands.discards().clear()
+        p1.hands.evaluate_discards().clear()
+        self.assertEqual(p2.hands.ukeire(), ukeire)
+        self.assertNotEqual(p2.hands.discards(), {})
+        self.assertNotEqual(p2.hands.evaluate_discards(), {})
+        self.assertEqual(mahjongcache.stats()['hits'], 3)
+
+    def test_disable(self):
+        mahjongcache.set_capacity(0)
+        mahjongcache.clear()
+        p = mahjongpy.MahjongPlayer(hands=mahjongpy.MahjongTile.make_hands_set('22345', '567', '123569'))
+        self.assertEqual(p.shanten(), 0)
+        self.assertEqual(mahjongcache.stats()['size'], 0)
+        self.assertEqual(mahjongcache.stats()['misses'], 0)
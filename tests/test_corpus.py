@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+import unittest
+import mahjongpy
+from mahjongpy import mahjongcorpus, mahjongrecord, mahjongsimulate
+
+
+class TestCorpus(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'games.mjr')
+        self.tables = []
+        with open(self.path, 'wb') as f:
+            writer = mahjongrecord.RecordWriter(f)
+            for seed in [1, 2]:
+                table = mahjongpy.MahjongTable(seed=seed)
+                mahjongsimulate.play_round(table, [mahjongsimulate.Policy()]*4, None)
+                writer.write_round(table)
+                self.tables.append(table)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_index(self):
+        events = self.tables[0].events + self.tables[1].events
+        with mahjongcorpus.MahjongCorpus(self.path) as corpus:
+            self.assertEqual(len(corpus), len(events))
+            self.assertEqual(corpus.round_count(), 2)
+            self.assertEqual(corpus[5], events[5])
+            self.assertEqual(corpus[-1], events[-1])
+            self.assertEqual(corpus.round_of(len(self.tables[0].events)), 1)
+            self.assertEqual(corpus.round_events(1), self.tables[1].events)
+        self.assertTrue(os.path.exists(self.path + '.idx'))
+        with mahjongcorpus.MahjongCorpus(self.path) as corpus:
+            self.assertEqual(corpus[len(events)//2], events[len(events)//2])
+
+    @unittest.skipUnless(os.path.isdir('/proc/self/fd'), 'needs /proc/self/fd')
+    def test_close_on_error(self):
+        path = os.path.join(self.directory, 'broken.mjr')
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        count = len(os.listdir('/proc/self/fd'))
+        errors = []
+        for i in [b'abcdefgh', data[:-1]]:
+            with open(path, 'wb') as f:
+                f.write(i)
+            try:
+                mahjongcorpus.MahjongCorpus(path)
+            except ValueError as e:
+                errors.append(e)  # トレースバックがオブジェクトを参照したままでもファイルは閉じられている
+        self.assertEqual(len(errors), 2)
+        self.assertEqual(len(os.listdir('/proc/self/fd')), count)
+
+    def test_state(self):
+        table = self.tables[1]
+        with mahjongcorpus.MahjongCorpus(self.path) as corpus:
+            start = corpus.round_starts[1]
+            state = corpus.state(start + [i[0] for i in table.events].index('score'))
+            self.assertEqual(state['event'][0], 'score')
+            for i in range(4):
+                if table.players[i] == table.win_player: continue
+                self.assertEqual(sorted(state['hands'][i]), sorted(table.players[i].hands))
+                self.assertEqual(state['discards'][i], table.players[i].discards)
+            self.assertEqual(state['dora_showing_tiles'], table.dora_showing_tiles)
+            self.assertEqual(state['riichi'], [i.is_riichi for i in table.players])
+            self.assertEqual(corpus.state(start)['oya'], 0)
+            self.assertEqual(len(corpus.state(start+6)['hands'][0]), 14)
+            self.assertEqual(corpus.state(start+6)['tiles_left'], 68)
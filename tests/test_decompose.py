@@ -0,0 +1,39 @@
+import unittest
+import mahjongpy
+
+class TestDecompose(unittest.TestCase):
+
+    def counts(self, *args):
+        return(mahjongpy.MahjongHands(mahjongpy.MahjongTile.make_hands_set(*args, checkamount=False)).counts)
+
+    def test_decompose(self):
+        d = mahjongpy.decompose(self.counts('111222333', '789', '', '', '11'))
+        self.assertEqual(len(d), 2)
+        self.assertIn((31, ((0, 0, 0), (1, 1, 1), (2, 2, 2), (15, 16, 17))), d)
+        self.assertIn((31, ((0, 1, 2), (0, 1, 2), (0, 1, 2), (15, 16, 17))), d)
+        self.assertEqual(len(mahjongpy.decompose(self.counts('11122345678999'))), 1)
+        self.assertEqual(mahjongpy.decompose(self.counts('1155', '77', '3399', '22', '33')), [])
+        self.assertEqual(mahjongpy.decompose(self.counts('1346', '36', '578', '14', '112')), [])
+
+    def test_melds(self):
+        self.assertEqual(mahjongpy.decompose(self.counts('123', '', '', '', '11')), [(31, ((0, 1, 2),))])
+        self.assertEqual(mahjongpy.decompose(self.counts('', '55')), [(13, ())])
+        self.assertEqual(mahjongpy.decompose(self.counts('123', '', '', '', '1')), [])
+
+    def test_player(self):
+        h = mahjongpy.MahjongTile.make_hands_set('667778889', '', '777', '', '22')
+        p = mahjongpy.MahjongPlayer(hands=h, latest_tile=mahjongpy.MahjongTile('manzu', 9), turn=5)
+        self.assertEqual(len(p.decompositions()), 1)
+        self.assertIn('ipeikou', p.yakus())
+        self.assertNotIn('sanankou', p.yakus())
+        h = mahjongpy.MahjongTile.make_hands_set('123', '344556789', '22')
+        p = mahjongpy.MahjongPlayer(hands=h, latest_tile=mahjongpy.MahjongTile('souzu', 8), turn=5)
+        p.is_ron = True
+        self.assertNotIn('pinfu', p.yakus())
+        self.assertEqual(p.score_fu(), 40)
+        h = mahjongpy.MahjongTile.make_hands_set('555', '345555', '222', '', '33')
+        p = mahjongpy.MahjongPlayer(hands=h, latest_tile=mahjongpy.MahjongTile('souzu', 3), turn=5)
+        p.is_ron = True
+        self.assertIn('sanankou', p.yakus())
+        self.assertEqual(len(p.ankos()), 3)
+        self.assertEqual(p.zyantou(), [mahjongpy.MahjongTile('tyun')]*2)
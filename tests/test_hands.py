@@ -0,0 +1,54 @@
+import unittest
+import mahjongpy
+
+class TestHands(unittest.TestCase):
+
+
+    def test_counts(self):
+        h = mahjongpy.MahjongHands(mahjongpy.MahjongTile.make_hands_set('11345', '267', '123567'))
+        self.assertEqual(len(h.counts), 34)
+        self.assertEqual(sum(h.counts), 14)
+        self.assertEqual(h.counts[0], 2)
+        self.assertEqual(h.counts[mahjongpy.MahjongTile('souzu', 2).index], 1)
+        self.assertEqual(h.counts[mahjongpy.MahjongTile('pinzu', 7).index], 1)
+        self.assertEqual(h.aka_mask, 0)
+
+    def test_update(self):
+        h = mahjongpy.MahjongHands(mahjongpy.MahjongTile.make_hands_set('11345', '267', '123567'))
+        h.append(mahjongpy.MahjongTile('pinzu', 5, akadora=True))
+        self.assertEqual(h.counts[mahjongpy.MahjongTile('pinzu', 5).index], 2)
+        self.assertEqual(h.aka_mask, 4)
+        h.pop(h.index(mahjongpy.MahjongTile('pinzu', 5, akadora=True)))
+        self.assertEqual(h.counts[mahjongpy.MahjongTile('pinzu', 5).index], 1)
+        self.assertEqual(h.aka_mask, 0)
+        h.pop_index(0)
+        self.assertEqual(h.counts[0], 1)
+        h[0] = mahjongpy.MahjongTile('tyun')
+        self.assertEqual(h.counts[0], 0)
+        self.assertEqual(h.counts[33], 1)
+        del h[-3:]
+        self.assertEqual(sum(h.counts), len(h))
+        self.assertRaises(ValueError, h.pop_index, 0)
+
+    def test_player_hands(self):
+        p = mahjongpy.MahjongPlayer(hands=mahjongpy.MahjongTile.make_hands_set('11345', '267', '123567'))
+        self.assertIsInstance(p.hands, mahjongpy.MahjongHands)
+        p.hands = mahjongpy.MahjongTile.make_hands_set('22456', '333567', '234')
+        self.assertIsInstance(p.hands, mahjongpy.MahjongHands)
+        self.assertEqual(sum(p.hands.counts), 14)
+        p.discard(mahjongpy.MahjongTile('manzu', 2))
+        self.assertEqual(p.hands.counts[1], 1)
+        self.assertEqual(p.count(mahjongpy.MahjongTile('souzu', 3)), 3)
+
+    def test_incremental(self):
+        h = mahjongpy.MahjongHands(mahjongpy.MahjongTile.make_hands_set('22345', '567', '123569'))
+        self.assertEqual(h.shanten(), 0)
+        groups = h.groups()[:]
+        h.pop(h.index(mahjongpy.MahjongTile('pinzu', 9)))
+        self.assertEqual(h.groups()[:2], groups[:2])
+        self.assertNotEqual(h.groups()[2], groups[2])
+        self.assertEqual(h.shanten(), mahjongpy.shanten(h.counts))
+        self.assertEqual(h.ukeire(), [18+3, 18+6])
+        h.append(mahjongpy.MahjongTile('pinzu', 7))
+        self.assertEqual(h.shanten(), -1)
+        self.assertEqual(h.discards(), mahjongpy.mahjongshanten.discards(h.counts))
@@ -0,0 +1,44 @@
+import unittest
+import mahjongpy
+from mahjongpy import mahjonginstrument
+
+
+class TestInstrument(unittest.TestCase):
+
+    def tearDown(self):
+        mahjonginstrument.disable()
+        mahjonginstrument.reset()
+
+    def test_enable(self):
+        yakus = mahjongpy.MahjongPlayer.yakus
+        mahjonginstrument.enable()
+        self.assertTrue(mahjonginstrument.is_enabled())
+        self.assertIsNot(mahjongpy.MahjongPlayer.yakus, yakus)
+        mahjonginstrument.disable()
+        self.assertFalse(mahjonginstrument.is_enabled())
+        self.assertIs(mahjongpy.MahjongPlayer.yakus, yakus)
+
+    def test_snapshot(self):
+        mahjonginstrument.enable()
+        t = mahjongpy.MahjongTable(seed=3)
+        p = t.players[1]
+        p.hands = mahjongpy.MahjongTile.make_hands_set('22345', '567', '123567')
+        p.latest_tile = mahjongpy.MahjongTile('manzu',5)
+        p.turn = 5
+        p.is_tumo = True
+        p.score()
+        p.score()
+        p.shanten()
+        t.draw(t.players[2])
+        s = mahjonginstrument.snapshot()
+        self.assertTrue(s['enabled'])
+        self.assertEqual(s['methods']['MahjongPlayer.score']['calls'], 2)
+        self.assertEqual(s['methods']['MahjongPlayer.yakus']['calls'], 1)
+        self.assertEqual(s['methods']['MahjongTable.draw']['calls'], 1)
+        self.assertGreaterEqual(s['methods']['MahjongPlayer.score']['p99'], 0)
+        self.assertEqual(s['caches']['MahjongPlayer.cache:evaluation'], {'hits': 1, 'misses': 1, 'hit_rate': 0.5})
+        self.assertIn('hits', s['lru'])
+        mahjonginstrument.reset()
+        self.assertEqual(mahjonginstrument.snapshot()['methods'], {})
+        p.score()
+        self.assertEqual(mahjonginstrument.snapshot()['methods']['MahjongPlayer.score']['calls'], 1)
@@ -0,0 +1,44 @@
+import io
+import unittest
+import mahjongpy
+from mahjongpy import mahjongnotation
+
+
+class TestNotation(unittest.TestCase):
+
+    def test_parse(self):
+        tiles, melds = mahjongnotation.parse('22345m123567p567s')
+        expected = mahjongpy.MahjongTile.make_hands_set('22345', '567', '123567')
+        self.assertEqual(sorted(tiles, key=lambda x: x.index), sorted(expected, key=lambda x: x.index))
+        self.assertEqual(melds, [])
+        tiles, melds = mahjongnotation.parse("340m11z[5'55p][78'9s]")
+        self.assertTrue(tiles[2].akadora)
+        self.assertEqual(tiles[3], mahjongpy.MahjongTile('ton'))
+        self.assertEqual(len(melds), 2)
+        self.assertTrue(melds[0][0].from_tacha)
+        self.assertFalse(melds[0][1].from_tacha)
+        self.assertTrue(melds[1][1].from_tacha)
+
+    def test_parse_counts(self):
+        counts = mahjongnotation.parse_counts('22305m123567p567s[111z]')
+        self.assertEqual(counts, mahjongpy.MahjongHands(mahjongpy.MahjongTile.make_hands_set('22355', '567', '123567')).counts)
+
+    def test_invalid(self):
+        for i in ['123', '18z', '0z', '12x', 'm12m', "'1m", '123m[12']:
+            self.assertRaises(ValueError, mahjongnotation.parse, i)
+            self.assertRaises(ValueError, mahjongnotation.parse_counts, i)
+
+    def test_format(self):
+        text = "3405m123p11z[5'55p][78'9s]"
+        self.assertEqual(mahjongnotation.format_tiles(*mahjongnotation.parse(text)), text)
+        tiles = mahjongpy.MahjongTile.make_hands_set('22345', '567', '123567')
+        self.assertEqual(mahjongnotation.format_tiles(tiles), '22345m123567p567s')
+        self.assertEqual(mahjongnotation.format_counts(mahjongpy.MahjongHands(tiles).counts), '22345m123567p567s')
+
+    def test_iter_file(self):
+        f = io.StringIO('# hands\n123m456p789s1122z\n\n11z[555p]\n')
+        hands = list(mahjongnotation.iter_file(f, counts=True))
+        self.assertEqual(len(hands), 2)
+        self.assertEqual(sum(hands[1]), 2)
+        f = io.StringIO('123m\n12x\n')
+        self.assertRaises(ValueError, list, mahjongnotation.iter_file(f))
@@ -79,6 +79,28 @@ class TestPlayer(unittest.TestCase):
         p = mahjongpy.MahjongPlayer(hands=self.HANDS20)
         self.assertTrue(p.is_tenpai())
 
+    def test_waits(self):
+        h = mahjongpy.MahjongTile.make_hands_set('2345', '567', '123567')
+        p = mahjongpy.MahjongPlayer(hands=h, discards=[mahjongpy.MahjongTile('manzu', 5)])
+        self.assertEqual(p.waits(), {mahjongpy.MahjongTile('manzu', 2): 3, mahjongpy.MahjongTile('manzu', 5): 2})
+        p = mahjongpy.MahjongPlayer(hands=self.HANDS20[:13])
+        self.assertEqual(p.waits(), {})
+        self.assertEqual(sum(p.ukeire().values()), sum([p.unseen_counts()[i.index] for i in p.ukeire()]))
+        t = mahjongpy.MahjongTable()
+        p = t.players[1]
+        self.assertEqual(sum(p.visible_counts()), 14)
+        p.discard(p.hands[0])
+        self.assertEqual(sum(p.unseen_counts()), 136-14)
+
+    def test_evaluate_discards(self):
+        p = mahjongpy.MahjongPlayer(hands=mahjongpy.MahjongTile.make_hands_set('22345', '567', '123569'))
+        e = p.evaluate_discards()
+        self.assertEqual(e[0]['tile'], mahjongpy.MahjongTile('pinzu', 9))
+        self.assertEqual(e[0]['shanten'], 0)
+        self.assertEqual(e[0]['waits'], [mahjongpy.MahjongTile('pinzu', 4), mahjongpy.MahjongTile('pinzu', 7)])
+        self.assertEqual(len(e), len(set(p.hands)))
+        self.assertEqual(e, sorted(e, key=lambda x: (x['shanten'], -x['ukeire'])))
+
     def test_furiten(self):
         p = mahjongpy.MahjongPlayer(hands=self.HANDS8, discards=[mahjongpy.MahjongTile('tyun')])
         self.assertTrue(p.is_furiten())
@@ -196,6 +218,12 @@ class TestPlayer(unittest.TestCase):
 
 
 
+    def test_hands_string(self):
+        p = mahjongpy.MahjongPlayer(hands=self.HANDS3, discards=[mahjongpy.MahjongTile('ton')])
+        self.assertEqual(p.hands_string(), ' '.join([i.display for i in p.hands]))
+        self.assertEqual(p.hands_string(True, ','), ','.join([i.name_jp for i in p.hands]))
+        self.assertEqual(p.discards_string(), '東')
+
     def test_displayed_doras(self):
         t = mahjongpy.MahjongTable()
         t.dora_tiles = [mahjongpy.MahjongTile('manzu', 1)]
@@ -203,9 +231,9 @@ class TestPlayer(unittest.TestCase):
         self.assertEqual(p.displayed_doras(), 2)
 
     def test_akadoras(self):
-        p = mahjongpy.MahjongPlayer(hands=self.HANDS1)
-        p.hands[0].akadora = True
-        p.hands[1].akadora = True
+        h = mahjongpy.MahjongTile.make_hands_set('2246', '33367', '234', checkamount=False)
+        h += [mahjongpy.MahjongTile('manzu', 5, akadora=True), mahjongpy.MahjongTile('souzu', 5, akadora=True)]
+        p = mahjongpy.MahjongPlayer(hands=h)
         self.assertEqual(p.akadoras(), 2)
 
     def test_shuntus(self):
@@ -216,6 +244,16 @@ class TestPlayer(unittest.TestCase):
         p = mahjongpy.MahjongPlayer(hands=self.HANDS6)
         self.assertEqual(len(p.ankos()), 3)
 
+    def test_decomposition_without_win(self):
+        p = mahjongpy.MahjongPlayer(hands=self.HANDS3)
+        self.assertEqual(len(p.shuntus()), 4)
+        self.assertEqual(len(p.zyantou()), 2)
+        self.assertEqual(p.cache, {})
+        p = mahjongpy.MahjongPlayer(hands=mahjongpy.MahjongTile.make_hands_set('2234', '567', '123567', '1'))
+        self.assertEqual(len(p.shuntus()), 4)
+        self.assertEqual(p.ankos(), [])
+        self.assertEqual(p.cache, {})
+
     def test_minkos(self):
         p = mahjongpy.MahjongPlayer(hands=self.HANDS1)
         self.assertEqual(len(p.minkos), 9)
@@ -507,6 +545,62 @@ class TestPlayer(unittest.TestCase):
         self.assertEqual(p.score(), 1100)
         self.assertEqual(p.payed_score(), [0,500,300])
 
+    def test_evaluate(self):
+        t = mahjongpy.MahjongTable()
+        p = t.players[1]
+        t.dora_tiles = [mahjongpy.MahjongTile('pinzu',1)]
+        p.hands = mahjongpy.MahjongTile.make_hands_set('22345', '567', '123567')
+        p.latest_tile = mahjongpy.MahjongTile('manzu',5)
+        p.turn = 5
+        p.is_tumo = True
+        e = p.evaluate()
+        self.assertIs(p.evaluate(), e)
+        self.assertEqual(e.yakus, (('menzentumo', 1), ('pinfu', 1)))
+        self.assertEqual((e.han, e.fu, e.doras, e.akadoras, e.yakuman_count, e.limit), (3, 20, 1, 0, 0, None))
+        self.assertEqual(e.payout, (0, 1400, 700, 2800))
+        self.assertEqual((p.score_han(), p.score_fu(), p.score()), (e.han, e.fu, e.payout[3]))
+        self.assertEqual(p.payed_score(), [0, 1400, 700])
+        self.assertRaises(AttributeError, setattr, e, 'han', 4)
+        t.honba = 1
+        self.assertEqual(p.evaluate().payout, (0, 1500, 800, 3100))
+
+    def test_cache(self):
+        t = mahjongpy.MahjongTable()
+        t.dora_tiles = []
+        p = t.players[1]
+        p.hands = mahjongpy.MahjongTile.make_hands_set('22345', '567', '123567')
+        p.latest_tile = mahjongpy.MahjongTile('manzu',5)
+        p.turn = 5
+        p.is_tumo = True
+        self.assertEqual(p.score(), 1600)
+        self.assertEqual(p.cache_key, p.state_key())
+        p.is_riichi = True
+        self.assertEqual(p.yakus(), ['riichi', 'menzentumo', 'pinfu'])
+        self.assertEqual(p.score(), 2800)
+        t.dora_tiles = [mahjongpy.MahjongTile('pinzu',1)]
+        self.assertEqual(p.score(), 5200)
+        t.honba = 2
+        self.assertEqual(p.score(), 5800)
+        p.is_tumo = False
+        p.is_ron = True
+        self.assertEqual(p.yakus(), ['riichi', 'pinfu'])
+        p.clear_cache()
+        self.assertEqual(p.cache, {})
+
+    def test_yakus_copy(self):
+        t = mahjongpy.MahjongTable()
+        t.dora_tiles = []
+        p = t.players[1]
+        p.hands = mahjongpy.MahjongTile.make_hands_set('22345', '567', '123567')
+        p.latest_tile = mahjongpy.MahjongTile('manzu',5)
+        p.turn = 5
+        p.is_tumo = True
+        yakus = p.yakus()
+        yakus.append('x')
+        self.assertEqual(p.yakus(), ['menzentumo', 'pinfu'])
+        self.assertEqual(p.evaluate().yakus, (('menzentumo', 1), ('pinfu', 1)))
+        self.assertEqual(p.score(), 1600)
+
     def test_score6(self):
         t = mahjongpy.MahjongTable(kyoku=3)
         self.assertEqual(t.info, '東3局0本場')
@@ -0,0 +1,49 @@
+import io
+import unittest
+import mahjongpy
+from mahjongpy import mahjongrecord, mahjongsimulate
+
+
+class TestRecord(unittest.TestCase):
+
+    def test_encode(self):
+        events = [('start', None, (), (0, 1, 0, 0, 0, 25000, 25000, 25000, 25000)), ('discard', 2, (34,), ()),
+                  ('score', None, (), (-8000, 8000, 0, 0)), ('pon', 1, (31, 31, 31), (3,))]
+        for i in events:
+            data = mahjongrecord.encode(i)
+            self.assertEqual(mahjongrecord.decode(data), i)
+        self.assertEqual(len(mahjongrecord.encode(events[1])), 6)
+
+    def test_table(self):
+        t = mahjongpy.MahjongTable(seed=3)
+        self.assertEqual([i[0] for i in t.events], ['start', 'dora', 'deal', 'deal', 'deal', 'deal'])
+        self.assertEqual(len(t.events[2][2]), 14)
+        p = t.players[0]
+        p.discard(p.hands[0])
+        t.draw(t.players[1])
+        self.assertEqual(t.events[-2], ('discard', 0, (p.discards[0].id,), ()))
+        self.assertEqual(t.events[-1], ('draw', 1, (t.players[1].latest_tile.id,), ()))
+
+    def test_tumo_without_drawn_tile(self):
+        t = mahjongpy.MahjongTable(seed=3)
+        t.dora_tiles = []
+        p = t.players[0]
+        p.hands = mahjongpy.MahjongHands(mahjongpy.MahjongTile.make_hands_set('22345', '567', '123567'))
+        p.tumo()
+        self.assertEqual(t.events[-2][:3], ('tumo', 0, ()))
+        for i in t.events:
+            self.assertEqual(mahjongrecord.decode(mahjongrecord.encode(i)), i)
+
+    def test_stream(self):
+        f = io.BytesIO()
+        writer = mahjongrecord.RecordWriter(f)
+        game = mahjongsimulate.play_game(4, max_rounds=3, writer=writer)
+        f.seek(0)
+        rounds = list(mahjongrecord.read_rounds(f, chunk_size=7))
+        self.assertEqual(len(rounds), len(game['rounds']))
+        self.assertEqual(sum([len(i) for i in rounds]), writer.count)
+        for events, result in zip(rounds, game['rounds']):
+            self.assertEqual(events[0][0], 'start')
+            self.assertEqual([list(i[3]) for i in events if i[0] == 'score'], [result['deltas']])
+        self.assertRaises(ValueError, list, mahjongrecord.read_events(io.BytesIO(b'abcd')))
+        self.assertRaises(ValueError, list, mahjongrecord.read_events(io.BytesIO(f.getvalue()[:-1])))
@@ -0,0 +1,38 @@
+import unittest
+import mahjongpy
+from mahjongpy import mahjongscore
+
+
+class TestScore(unittest.TestCase):
+
+    def test_ron(self):
+        self.assertEqual(mahjongscore.payout(1, 30, False, False), (1000, 0, 0, 1000))
+        self.assertEqual(mahjongscore.payout(3, 60, False, False), (7700, 0, 0, 7700))
+        self.assertEqual(mahjongscore.payout(4, 40, True, False), (12000, 0, 0, 12000))
+        self.assertEqual(mahjongscore.payout(13, 0, False, False, 2), (32600, 0, 0, 32600))
+
+    def test_tumo(self):
+        self.assertEqual(mahjongscore.payout(1, 30, False, True), (0, 500, 300, 1100))
+        self.assertEqual(mahjongscore.payout(1, 30, False, True, 1), (0, 600, 400, 1400))
+        self.assertEqual(mahjongscore.payout(2, 20, True, True), (0, 0, 700, 2100))
+        self.assertEqual(mahjongscore.payout(6, 30, True, True, 1), (0, 0, 6100, 18300))
+
+    def test_mangan_ignores_fu(self):
+        self.assertEqual(mahjongscore.payout(5, 30, False, True), mahjongscore.payout(5, 110, False, True))
+        self.assertEqual(mahjongscore.payout(5, 0, False, True), (0, 4000, 2000, 8000))
+
+    def test_not_in_table(self):
+        self.assertRaises(ValueError, mahjongscore.payout, 0, 30, False, False)
+        self.assertRaises(ValueError, mahjongscore.payout, 2, 35, False, False)
+        self.assertRaises(ValueError, mahjongscore.payout, 40, 30, False, False)
+        self.assertEqual(mahjongscore.payout(1, 30, False, False, 20), (7000, 0, 0, 7000))
+
+    def test_player(self):
+        tiles = mahjongpy.MahjongTile.make_hands_set('22345', '567', '123567')
+        table = mahjongpy.MahjongTable()
+        table.honba = 1
+        p = mahjongpy.MahjongPlayer(hands=tiles, table=table, turn=1, is_tumo=True)
+        payout = p.payout()
+        self.assertEqual(payout[3], p.score())
+        self.assertEqual([0, payout[1], payout[2]], p.payed_score())
+        self.assertEqual(payout[1] + payout[2]*2, p.score())
@@ -0,0 +1,69 @@
+import random
+import unittest
+import mahjongpy
+from mahjongpy import mahjongsearch
+
+
+class TestSearch(unittest.TestCase):
+
+    def test_view(self):
+        t = mahjongpy.MahjongTable(seed=11)
+        p = t.players[0]
+        counts, seat, oya, sizes, unseen, tiles_left, melds, honba = mahjongsearch.view(p)
+        self.assertEqual(list(counts), p.hands.counts)
+        self.assertEqual((seat, oya, sizes, tiles_left), (0, 0, (14, 13, 13, 13), 68))
+        self.assertEqual(melds, (((), (), (), ()),)*4)
+        self.assertEqual(honba, 0)
+        self.assertEqual(sum(unseen), 136 - 14 - 1)
+
+    def test_rollout(self):
+        t = mahjongpy.MahjongTable(seed=11)
+        state = mahjongsearch.view(t.players[0])
+        discard = t.players[0].hands[0].index
+        value = mahjongsearch.rollout(state, discard, random.Random(3))
+        self.assertEqual(value, mahjongsearch.rollout(state, discard, random.Random(3)))
+
+    def test_evaluate_discards(self):
+        t = mahjongpy.MahjongTable(seed=11)
+        p = t.players[0]
+        e = mahjongsearch.evaluate_discards(p, rollouts=3, seed=1)
+        self.assertEqual(sorted([i['tile'].index for i in e]), sorted(set([i.index for i in p.hands])))
+        self.assertEqual(e, sorted(e, key=lambda x: -x['value']))
+        self.assertEqual(e[0]['rollouts'], 3)
+        self.assertEqual(e, mahjongsearch.evaluate_discards(p, rollouts=3, seed=1))
+        self.assertRaises(ValueError, mahjongsearch.evaluate_discards, p, rollouts=None)
+
+    def test_evaluate_discards_with_meld(self):
+        t = mahjongpy.MahjongTable(seed=11)
+        p1, p2 = t.players[1], t.players[2]
+        position = [i for i in range(t.head, t.DEAD_WALL) if p2.hands.counts[t.wall[i].index] >= 2][0]
+        t.wall[position], t.wall[t.head] = t.wall[t.head], t.wall[position]
+        t.draw(p1)
+        tile = p1.latest_tile
+        p1.discard(tile)
+        p2.pon(tile)
+        p2.discard(p2.hands[0])
+        state = mahjongsearch.view(t.players[0])
+        self.assertEqual(state[3][2], 10)
+        self.assertEqual(len(state[6][2][0]), 1)
+        for i in range(3):
+            e = mahjongsearch.evaluate_discards(t.players[0], rollouts=10, seed=i)
+            self.assertEqual(e[0]['rollouts'], 10)
+
+    def test_score_with_meld(self):
+        counts = mahjongpy.MahjongHands(mahjongpy.MahjongTile.make_hands_set('22345', '567', '567', checkamount=False)).counts
+        pon = (mahjongpy.MahjongTile('souzu', 8).id,)*3
+        melds = ((pon,), (), (), (pon,))
+        self.assertEqual(mahjongsearch._payout(counts, 4, False, False, melds, 0, {}), (1000, 0, 0, 1000))
+
+    def test_tumo_payout(self):
+        counts = mahjongpy.MahjongHands(mahjongpy.MahjongTile.make_hands_set('22345', '567', '123567')).counts
+        none = ((), (), (), ())
+        self.assertEqual(mahjongsearch._payout(counts, 4, False, True, none, 1, {}),
+                         mahjongpy.mahjongscore.payout(2, 20, False, True, 1))
+        own = [0]*27 + [3, 3, 3, 3, 2, 0, 0]
+        state = (tuple(own), 0, 0, (14, 13, 0, 0), tuple(counts), 1, (none,)*4, 1)
+        pool = [i for i in range(34) for _ in range(counts[i])]
+        random.Random(0).shuffle(pool)
+        payout = mahjongsearch._payout(counts, pool[13], False, True, none, 1, {})
+        self.assertEqual(mahjongsearch.rollout(state, 27, random.Random(0)), -payout[1])
@@ -0,0 +1,54 @@
+import unittest
+import mahjongpy
+
+class TestShanten(unittest.TestCase):
+
+    def counts(self, *args):
+        return(mahjongpy.MahjongHands(mahjongpy.MahjongTile.make_hands_set(*args, checkamount=False)).counts)
+
+    def test_normal(self):
+        self.assertEqual(mahjongpy.shanten(self.counts('22345', '567', '123567')), -1)
+        self.assertEqual(mahjongpy.shanten(self.counts('2345', '567', '123567')), 0)
+        self.assertEqual(mahjongpy.shanten(self.counts('11345', '267', '123567')), 0)
+        self.assertEqual(mahjongpy.shanten(self.counts('11345', '269', '123569')), 2)
+        self.assertEqual(mahjongpy.shanten(self.counts('1112345678999')), 0)
+        self.assertEqual(mahjongpy.shanten(self.counts('1357', '1357', '1357', '1')), 4)
+
+    def test_melds(self):
+        self.assertEqual(mahjongpy.shanten(self.counts('123', '45', '', '', '11')), 0)
+        self.assertEqual(mahjongpy.shanten(self.counts('123', '456', '', '', '11')), -1)
+        self.assertEqual(mahjongpy.shanten(self.counts('', '', '', '', '1')), 0)
+
+    def test_chitoitu(self):
+        self.assertEqual(mahjongpy.shanten(self.counts('1155', '77', '3399', '22', '3')), 0)
+        self.assertEqual(mahjongpy.shanten(self.counts('1155', '77', '3399', '22', '33')), -1)
+        self.assertEqual(mahjongpy.mahjongshanten.shanten_chitoitu(self.counts('1111', '77', '3399', '22', '3')), 2)
+
+    def test_kokushimusou(self):
+        self.assertEqual(mahjongpy.shanten(self.counts('19', '19', '19', '1234', '123')), 0)
+        self.assertEqual(mahjongpy.shanten(self.counts('19', '19', '19', '1234', '1233')), -1)
+        self.assertEqual(mahjongpy.shanten(self.counts('123', '19', '19', '1234', '123')), 1)
+
+    def test_player(self):
+        p = mahjongpy.MahjongPlayer(hands=mahjongpy.MahjongTile.make_hands_set('1155', '77', '3399', '22', '3'))
+        self.assertEqual(p.shanten(), 0)
+        self.assertTrue(p.is_tenpai())
+
+    def test_ukeire(self):
+        self.assertEqual(mahjongpy.mahjongshanten.ukeire(self.counts('2345', '567', '123567')), [1, 4])
+        self.assertEqual(mahjongpy.mahjongshanten.ukeire(self.counts('1112345678999')), list(range(9)))
+        self.assertEqual(mahjongpy.mahjongshanten.ukeire(self.counts('1155', '77', '3399', '22', '3')), [33])
+
+    def test_discards(self):
+        d = mahjongpy.mahjongshanten.discards(self.counts('22345', '567', '123569'))
+        self.assertEqual(d[0+1], 1)
+        self.assertEqual(d[18+8], 0)
+        self.assertEqual(len(d), 13)
+
+    def test_evaluate_discards(self):
+        counts = self.counts('22345', '567', '123569')
+        e = mahjongpy.mahjongshanten.evaluate_discards(counts)
+        self.assertEqual(e.keys(), mahjongpy.mahjongshanten.discards(counts).keys())
+        self.assertEqual(e[18+8], (0, [18+3, 18+6]))
+        counts[18+8] -= 1
+        self.assertEqual(e[18+8][1], mahjongpy.mahjongshanten.ukeire(counts))
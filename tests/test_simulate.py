@@ -0,0 +1,47 @@
+import random
+import unittest
+import mahjongpy
+from mahjongpy import mahjongsimulate
+
+
+class TestSimulate(unittest.TestCase):
+
+    def test_play_game(self):
+        r = mahjongsimulate.play_game(1)
+        self.assertEqual(r, mahjongsimulate.play_game(1))
+        self.assertEqual(r['seed'], 1)
+        self.assertEqual(len(r['points']), 4)
+        for i in r['rounds']:
+            self.assertEqual(len(i['deltas']), 4)
+            if i['winner'] is not None: self.assertGreater(i['deltas'][i['winner']], 0)
+
+    def test_policy_rng(self):
+        self.assertNotEqual(mahjongsimulate._policy_rng(1).random(), random.Random(1).random())
+        self.assertEqual(mahjongsimulate._policy_rng(1).random(), mahjongsimulate._policy_rng(1).random())
+
+    def test_policies(self):
+        policies = [mahjongsimulate.RandomPolicy()]*4
+        r = mahjongsimulate.play_game(2, policies, max_rounds=3)
+        self.assertEqual(len(r['rounds']), 3)
+
+    def test_simulate(self):
+        stats = mahjongsimulate.simulate(2, seed=5, max_workers=1, max_rounds=4)
+        self.assertEqual(stats['games'], 2)
+        self.assertEqual(stats['rounds'], len(stats['results'][0]['rounds']) + len(stats['results'][1]['rounds']))
+        self.assertAlmostEqual(sum(stats['win_rate']) + stats['ryukyoku_rate'], 1)
+        parallel = mahjongsimulate.simulate(2, seed=5, max_workers=2, chunksize=1, max_rounds=4)
+        self.assertEqual(parallel['results'], stats['results'])
+
+    def test_win_state(self):
+        t = mahjongpy.MahjongTable(seed=1)
+        t.dora_tiles = []
+        p = t.players[1]
+        p.hands = mahjongpy.MahjongHands(mahjongpy.MahjongTile.make_hands_set('123789', '22567', '456'))
+        p.latest_tile = mahjongpy.MahjongTile('souzu', 6)
+        p.turn = 5
+        self.assertTrue(mahjongsimulate._has_yakus(p, p.latest_tile, True))
+        self.assertFalse(mahjongsimulate._has_yakus(p, p.latest_tile, False))
+        self.assertFalse(p.is_tumo)
+        p.hands.remove(mahjongpy.MahjongTile('souzu', 6))
+        self.assertFalse(mahjongsimulate._can_ron(p, mahjongpy.MahjongTile('souzu', 6)))
+        self.assertEqual(len(p.hands), 13)
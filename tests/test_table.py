@@ -32,5 +32,105 @@ class TestTable(unittest.TestCase):
         self.assertEqual(len(t.players[1].hands), 13)
         self.assertEqual(len(t.players[2].hands), 13)
         self.assertEqual(len(t.players[3].hands), 13)
+        t = mahjongpy.MahjongTable(oya_player=2)
+        self.assertEqual(len(t.players[0].hands), 13)
+        self.assertEqual(len(t.players[1].hands), 14)
 
+    def test_seed(self):
+        t1 = mahjongpy.MahjongTable(seed=42)
+        t2 = mahjongpy.MahjongTable(seed=42)
+        self.assertEqual(t1.wall, t2.wall)
+        self.assertEqual([i.hands for i in t1.players], [i.hands for i in t2.players])
+        self.assertEqual(t1.dora_showing_tiles, t2.dora_showing_tiles)
+        t3 = mahjongpy.MahjongTable(tiles=t1.wall)
+        self.assertEqual(t3.players[0].hands, t1.players[0].hands)
+        self.assertEqual(t1.rng.random(), t2.rng.random())
 
+    def test_wall(self):
+        t = mahjongpy.MahjongTable(seed=1)
+        p = t.players[0]
+        tile = t.wall[t.head]
+        p.discard(p.hands[0])
+        t.draw(p)
+        self.assertEqual(p.latest_tile, tile)
+        self.assertEqual(t.tiles_left(), 67)
+        self.assertEqual(len(t.tiles), 81)
+        t.draw(p, rinsyan=True)
+        self.assertEqual(p.latest_tile, t.wall[135])
+        t.add_kandora()
+        self.assertEqual(t.dora_showing_tiles, [t.wall[130], t.wall[128]])
+        self.assertEqual(t.tiles_left(), 65)
+        while t.tiles_left() > 0:
+            t.draw(p)
+        self.assertEqual(len(t.tiles), 14)
+        self.assertRaises(RuntimeError, t.draw, p)
+        t.tiles.pop()
+        self.assertEqual(len(t.tiles), 14)
+        self.assertRaises(AttributeError, setattr, t, 'tiles', [])
+
+    def test_riichi_tiles_left(self):
+        t = mahjongpy.MahjongTable(seed=1)
+        p = t.players[0]
+        p.hands = mahjongpy.MahjongHands(mahjongpy.MahjongTile.make_hands_set('22345', '567', '12356'))
+        t.head = t.DEAD_WALL - len(t.used_dead_wall) - 3
+        self.assertEqual(t.tiles_left(), 3)
+        self.assertRaises(RuntimeError, p.riichi)
+        t.head -= 1
+        p.riichi()
+        self.assertTrue(p.is_riichi)
+
+    def test_snapshot(self):
+        t = mahjongpy.MahjongTable(seed=5)
+        state = t.snapshot()
+        p = t.players[0]
+        hands = p.hands[:]
+        p.riichi() if p.shanten() <= 0 else None
+        p.discard(p.hands[0])
+        t.draw(t.players[1])
+        t.add_kandora()
+        t.restore(state)
+        self.assertEqual(t.snapshot(), state)
+        self.assertEqual(p.hands, hands)
+        self.assertEqual(p.hands.counts, mahjongpy.MahjongHands(hands).counts)
+        self.assertEqual(p.discards, [])
+        self.assertEqual(t.tiles_left(), 68)
+        self.assertEqual(len(t.dora_showing_tiles), 1)
+        self.assertEqual(len(t.events), 6)
+        self.assertFalse(p.is_riichi)
+
+    def test_next_round_in_place(self):
+        t1 = mahjongpy.MahjongTable(seed=9)
+        t2 = mahjongpy.MahjongTable(seed=9)
+        players = t2.players[:]
+        hands = t2.players[0].hands
+        for t in [t1, t2]:
+            p = t.players[0]
+            p.discard(p.hands[0])
+            t.draw(t.players[1])
+            t.is_ryukyoku = True
+        t1 = t1.next_round()
+        self.assertIs(t2.next_round(in_place=True), t2)
+        self.assertEqual(t2.players, players)
+        self.assertIs(t2.players[0].hands, hands)
+        self.assertEqual(t1.snapshot(), t2.snapshot())
+        self.assertEqual(t1.events, t2.events)
+        self.assertEqual(t2.info, '東2局0本場')
+        self.assertTrue(t2.players[1].oya)
+        self.assertEqual(t2.players[0].discards, [])
+        self.assertEqual(t2.tiles_left(), 68)
+        self.assertFalse(t2.is_ryukyoku)
+
+    def test_snapshot_next_round(self):
+        t = mahjongpy.MahjongTable(seed=9)
+        state = t.snapshot()
+        events = t.events[:]
+        t.is_ryukyoku = True
+        t.next_round(in_place=True)
+        self.assertEqual(t.info, '東2局0本場')
+        t.restore(state)
+        self.assertEqual(t.snapshot(), state)
+        self.assertEqual((t.wind, t.kyoku, t.oya_player), ('ton', 1, 1))
+        self.assertEqual(t.info, '東1局0本場')
+        self.assertTrue(t.players[0].oya)
+        self.assertFalse(t.players[1].oya)
+        self.assertEqual(t.events, events)
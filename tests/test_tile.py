@@ -92,3 +92,48 @@ class TestTile(unittest.TestCase):
         self.assertEqual(len([i for i in t if i.number==8]), 1)
         self.assertEqual(len([i for i in t if i.number==9]), 1)
         self.assertEqual(len([i for i in t if i.number==None]), 2)
+
+    def test_interned(self):
+        t1 = mahjongpy.MahjongTile('pinzu', 5)
+        t2 = mahjongpy.MahjongTile('pinzu', 5, akadora=True)
+        self.assertIs(t1, mahjongpy.MahjongTile('pinzu', 5))
+        self.assertIs(t2, mahjongpy.MahjongTile.from_id(t2.id))
+        self.assertIs(mahjongpy.MahjongTile('ton'), mahjongpy.MahjongTile.from_index(27))
+        self.assertEqual(len(set(mahjongpy.MahjongTile.TILES)), 37)
+        self.assertEqual(t2.id, 36)
+        self.assertFalse(t1 == t2)
+        self.assertTrue(t1 < t2)
+        self.assertEqual(len({t1, t2, mahjongpy.MahjongTile('pinzu', 5)}), 2)
+        self.assertRaises(AttributeError, setattr, t1, 'akadora', True)
+        self.assertRaises(ValueError, mahjongpy.MahjongTile, 'pinzu', 10)
+
+    def test_from_tacha(self):
+        t = mahjongpy.MahjongTile('souzu', 3)
+        t2 = t.as_from_tacha()
+        self.assertTrue(t2.from_tacha)
+        self.assertFalse(t.from_tacha)
+        self.assertTrue(t == t2)
+        self.assertEqual(hash(t), hash(t2))
+
+    def test_code(self):
+        t = mahjongpy.MahjongTile('pinzu', 5, akadora=True)
+        self.assertIs(mahjongpy.MahjongTile.CODES[t.code], t)
+        self.assertIs(mahjongpy.MahjongTile.CODES[t.as_from_tacha().code], t.as_from_tacha())
+        self.assertEqual(len(set([i.code for i in mahjongpy.MahjongTile.CODES])), 76)
+
+    def test_tiles_set(self):
+        template = mahjongpy.MahjongTile.tiles_set()
+        self.assertIs(mahjongpy.MahjongTile.tiles_set(), template)
+        self.assertEqual(len(template), 136)
+        self.assertEqual(len([i for i in template if i.akadora]), 3)
+        self.assertEqual(len([i for i in mahjongpy.MahjongTile.tiles_set(False) if i.akadora]), 0)
+        tiles = mahjongpy.MahjongTile.make_tiles_set()
+        self.assertEqual(tiles, list(template))
+        tiles.pop()
+        self.assertEqual(len(mahjongpy.MahjongTile.tiles_set()), 136)
+
+    def test_tiles_string(self):
+        tiles = [mahjongpy.MahjongTile('manzu', 1), mahjongpy.MahjongTile('pinzu', 5, akadora=True), mahjongpy.MahjongTile('tyun')]
+        self.assertEqual(mahjongpy.MahjongTile.tiles_string(tiles), '1萬 5●* 中')
+        self.assertEqual(mahjongpy.MahjongTile.tiles_string(tiles, name_jp=True, separator=''), 'イーワンウーピン*チュン')
+        self.assertEqual(mahjongpy.MahjongTile.tiles_string([]), '')